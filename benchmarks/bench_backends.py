@@ -0,0 +1,106 @@
+"""
+Compare LLM inference backends on CPU: load time, tokens/sec and memory.
+
+    python -m benchmarks.bench_backends --model meta-llama/Llama-2-7b-chat-hf \
+        --backends transformers int8 llamacpp --gguf models/llama-2-7b-chat.Q4_K_M.gguf --threads 8
+
+Each backend runs in a fresh process so its peak RSS is measured in isolation.
+Sampling is disabled so every backend generates comparable text.
+"""
+from typing import Any, Dict, Optional
+import argparse
+import multiprocessing
+import os
+import time
+
+from benchmarks.common import run_metadata, summarize, write_results
+from benchmarks.synthetic import SyntheticCorpus
+
+def run_backend(backend: str, model_name: str, gguf: Optional[str], threads: int,
+                prompts: int, max_new_tokens: int, seed: int, prefix_cache: bool = True) -> Dict[str, Any]:
+    """Load one backend and analyze job descriptions with it (runs in a child process)"""
+    from config.config import Config
+    from models.llama_model import LlamaModel
+    from utils.cache import TieredCache
+    from utils.metrics import peak_rss_bytes
+
+    if gguf:
+        Config.LLM_GGUF_PATH = gguf
+    Config.LLM_THREADS = threads
+    Config.LLM_PREFIX_CACHE = prefix_cache
+    corpus = SyntheticCorpus(seed=seed)
+    baseline_rss = peak_rss_bytes() or 0
+
+    model = LlamaModel(model_name, backend=backend)
+    # No analysis cache, so every prompt is generated
+    model.cache = TieredCache(None, memory_entries=0)
+    model.generation_params = {"max_new_tokens": max_new_tokens, "do_sample": False}
+    started = time.perf_counter()
+    model.warm_up()
+    load_seconds = time.perf_counter() - started
+    loaded_rss = peak_rss_bytes() or 0
+
+    samples = []
+    for i in range(prompts):
+        started = time.perf_counter()
+        # One prompt per call, as an interactive request would
+        model.analyze_job_requirements_batch([corpus.job_description(i)])
+        samples.append(time.perf_counter() - started)
+
+    stats = model.backend.stats
+    result = summarize(samples)
+    result.update({
+        "model": model.loaded_model_name,
+        "load_seconds": load_seconds,
+        "tokens_per_sec": stats["generated_tokens"] / stats["generate_seconds"] if stats["generate_seconds"] else 0.0,
+        "generated_tokens": stats["generated_tokens"],
+        "prompt_tokens": stats["prompt_tokens"],
+        # Includes importing the backend library, not just the weights
+        "load_rss_mb": (loaded_rss - baseline_rss) / 2 ** 20,
+        "peak_rss_mb": (peak_rss_bytes() or 0) / 2 ** 20
+    })
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare LLM inference backends")
+    parser.add_argument("--model", default=None, help="Model name or path (default: Config.MODEL_NAME)")
+    parser.add_argument("--backends", nargs="+", default=["transformers", "int8"],
+                        help="Backends to compare: transformers, int8, llamacpp")
+    parser.add_argument("--gguf", help="GGUF file for the llamacpp backend")
+    parser.add_argument("--threads", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--prompts", type=int, default=5, help="Job descriptions analyzed per backend")
+    parser.add_argument("--max-new-tokens", type=int, default=128)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--compare-prefix-cache", action="store_true",
+                        help="Also run each backend with the prompt-prefix KV cache disabled")
+    parser.add_argument("--output", default="bench_backends.json")
+    args = parser.parse_args()
+
+    from config.config import Config
+    model_name = args.model or Config.MODEL_NAME
+
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    runs = [(backend, True) for backend in args.backends]
+    if args.compare_prefix_cache:
+        runs += [(backend, False) for backend in args.backends]
+    for backend, prefix_cache in runs:
+        name = f"backend.{backend}" if prefix_cache else f"backend.{backend}.no_prefix_cache"
+        with context.Pool(1) as pool:
+            try:
+                results[name] = pool.apply(run_backend, (
+                    backend, model_name, args.gguf, args.threads,
+                    args.prompts, args.max_new_tokens, args.seed, prefix_cache
+                ))
+            except Exception as e:
+                print(f"Backend {backend} failed: {e}")
+                results[name] = {"error": str(e)}
+
+    write_results({
+        "meta": run_metadata(model=model_name, backends=args.backends, threads=args.threads,
+                             prompts=args.prompts, max_new_tokens=args.max_new_tokens, seed=args.seed),
+        "results": results
+    }, args.output)
+
+if __name__ == "__main__":
+    main()
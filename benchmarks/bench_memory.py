@@ -0,0 +1,103 @@
+"""
+Memory per candidate of parsed resumes held as dicts, slotted records and a columnar store.
+
+    python -m benchmarks.bench_memory --candidates 10000 --output bench_memory.json
+
+Resumes are parsed from synthetic text inside each measurement, so every
+string a representation keeps is counted (tracemalloc, Python heap only).
+The memory-mapped store is also reported by its size on disk, since its
+pages live in the OS page cache rather than the Python heap.
+"""
+from typing import Any, Callable, Dict
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.common import run_metadata, time_call, write_results
+from benchmarks.synthetic import SyntheticCorpus
+
+from parsers.resume_parser import ResumeParser
+from storage.columnar import ColumnarStore
+from utils.cache import TieredCache
+
+def measure(build: Callable[[], Any], count: int) -> Dict[str, Any]:
+    """Heap bytes retained by what build() returns, per candidate"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    retained = build()
+    seconds = time.perf_counter() - started
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del retained
+    return {"bytes_per_candidate": current / count, "total_mb": current / 2 ** 20, "build_seconds": seconds}
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the memory footprint of parsed resume representations")
+    parser.add_argument("--candidates", type=int, default=10000)
+    parser.add_argument("--filler", type=int, default=1, help="Summary paragraphs per synthetic resume")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="bench_memory.json")
+    args = parser.parse_args()
+
+    corpus = SyntheticCorpus(seed=args.seed)
+    resume_parser = ResumeParser(cache=TieredCache(None, memory_entries=0))
+    count = args.candidates
+
+    def parsed(i: int):
+        return resume_parser._extract_information(corpus.resume_text(i, filler_paragraphs=args.filler))
+
+    def without_raw_text(record):
+        data = record.to_dict()
+        data["raw_text"] = ""
+        return type(record).from_dict(data)
+
+    def columnar(keep_raw_text: bool) -> ColumnarStore:
+        store = ColumnarStore(keep_raw_text=keep_raw_text)
+        for i in range(count):
+            store.add(f"c{i}", parsed(i))
+        return store
+
+    results = {
+        # The dict shape ResumeParser returned before records
+        "memory.dict": measure(lambda: [parsed(i).to_dict() for i in range(count)], count),
+        "memory.dict_no_raw_text": measure(
+            lambda: [{key: value for key, value in parsed(i).to_dict().items() if key != "raw_text"}
+                     for i in range(count)], count),
+        "memory.record": measure(lambda: [parsed(i) for i in range(count)], count),
+        "memory.record_no_raw_text": measure(lambda: [without_raw_text(parsed(i)) for i in range(count)], count),
+        "memory.columnar": measure(lambda: columnar(False), count),
+        "memory.columnar_raw_text": measure(lambda: columnar(True), count)
+    }
+
+    store = columnar(False)
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        store.save(directory)
+        save_seconds = time.perf_counter() - started
+        disk_bytes = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        loaded = {}
+        results["memory.columnar_mmap"] = measure(lambda: loaded.setdefault("store", ColumnarStore.load(directory)),
+                                                  count)
+        results["memory.columnar_mmap"].update({
+            "disk_bytes_per_candidate": disk_bytes / count,
+            "save_seconds": save_seconds
+        })
+        # Reading a row decodes its strings from the mapped pool
+        mapped = loaded["store"]
+        results["memory.columnar_mmap_row_access"] = time_call(lambda: mapped[count // 2], 1000)
+        # Close the memory maps before the directory is removed
+        mapped = None
+        loaded.clear()
+
+    write_results({
+        "meta": run_metadata(candidates=count, filler=args.filler, seed=args.seed),
+        "results": results
+    }, args.output)
+
+if __name__ == "__main__":
+    main()
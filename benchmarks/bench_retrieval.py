@@ -0,0 +1,90 @@
+"""
+Recall and latency of two-stage ANN retrieval versus exact ranking of the whole pool.
+
+    python -m benchmarks.bench_retrieval --candidates 100000 --nprobe 0 16 64 --shortlist 100 500
+
+Recall@k is the share of the returned top-k whose exact score reaches the
+exact k-th best score, so candidates tied with the k-th best count as hits.
+An nprobe of 0 measures the default (half the clusters).
+"""
+from typing import Any, Dict, List
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.common import run_metadata, summarize, write_results
+from benchmarks.synthetic import SyntheticCorpus
+
+from indexing.ann import AnnRetriever
+from matching.matcher import ResumeMatcher
+
+def recall_at_k(approximate: List[Dict[str, Any]], exact_scores: np.ndarray, top_k: int) -> float:
+    threshold = np.sort(exact_scores)[-top_k]
+    hits = sum(1 for candidate in approximate if exact_scores[candidate["index"]] >= threshold - 1e-9)
+    return hits / top_k
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark two-stage ANN retrieval against exact ranking")
+    parser.add_argument("--candidates", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[0, 16, 64])
+    parser.add_argument("--shortlist", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--dimensions", type=int, default=None, help="LSA dimensions (default: Config.ANN_DIMENSIONS)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="bench_retrieval.json")
+    args = parser.parse_args()
+
+    corpus = SyntheticCorpus(seed=args.seed)
+    resumes = corpus.resumes(args.candidates)
+    jobs = [corpus.job_requirements(i) for i in range(args.queries)]
+    matcher = ResumeMatcher()
+    results = {}
+
+    # Exact baseline: every candidate scored, vectors precomputed as for the index
+    started = time.perf_counter()
+    vectors = matcher.vectorize_resumes(resumes)
+    vectorize_seconds = time.perf_counter() - started
+    exact_scores = []
+    samples = []
+    for job in jobs:
+        started = time.perf_counter()
+        ranked = matcher.rank_vectors(dict(job), vectors, top_k=len(resumes))
+        samples.append(time.perf_counter() - started)
+        scores = np.zeros(len(resumes))
+        scores[[candidate["index"] for candidate in ranked]] = [candidate["overall_match"] for candidate in ranked]
+        exact_scores.append(scores)
+    results["retrieval.exact"] = summarize(samples)
+    results["retrieval.exact"]["vectorize_seconds"] = vectorize_seconds
+
+    started = time.perf_counter()
+    # min_candidates=0: measure the ANN path even for pools it would rank exactly
+    retriever = AnnRetriever(matcher, dimensions=args.dimensions, min_candidates=0, seed=args.seed).build(resumes)
+    build_seconds = time.perf_counter() - started
+
+    for nprobe in args.nprobe:
+        for shortlist in args.shortlist:
+            samples = []
+            recalls = []
+            for job, scores in zip(jobs, exact_scores):
+                started = time.perf_counter()
+                approximate = retriever.query(dict(job), top_k=args.top_k, nprobe=nprobe, shortlist=shortlist)
+                samples.append(time.perf_counter() - started)
+                recalls.append(recall_at_k(approximate, scores, args.top_k))
+            name = f"retrieval.ann.nprobe{nprobe}.shortlist{shortlist}"
+            results[name] = summarize(samples)
+            results[name][f"recall_at_{args.top_k}"] = float(np.mean(recalls))
+            results[name]["build_seconds"] = build_seconds
+
+    write_results({
+        "meta": run_metadata(candidates=args.candidates, queries=args.queries, top_k=args.top_k,
+                             nprobe=args.nprobe, shortlist=args.shortlist,
+                             dimensions=len(retriever.components) if retriever.components is not None else 0,
+                             lists=len(retriever.centroids) if retriever.centroids is not None else 0,
+                             seed=args.seed),
+        "results": results
+    }, args.output)
+
+if __name__ == "__main__":
+    main()
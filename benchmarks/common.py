@@ -0,0 +1,81 @@
+"""
+Shared helpers for the benchmark scripts: path setup, timing and JSON output.
+"""
+from typing import Any, Callable, Dict, List
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Same path setup as the Streamlit app: src/ for packages, repo root for config
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root / "src"))
+sys.path.append(str(project_root))
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Latency percentiles in milliseconds"""
+    values = np.asarray(samples) * 1000
+    return {
+        "runs": len(samples),
+        "mean_ms": float(values.mean()),
+        "p50_ms": float(np.percentile(values, 50)),
+        "p95_ms": float(np.percentile(values, 95)),
+        "p99_ms": float(np.percentile(values, 99)),
+        "min_ms": float(values.min())
+    }
+
+def time_call(fn: Callable[[], Any], repeat: int = 50, warmup: int = 2) -> Dict[str, float]:
+    """Time repeated calls of fn"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+def time_each(fn: Callable[[Any], Any], items: List[Any]) -> Dict[str, float]:
+    """Time fn once per item; adds throughput in items/sec"""
+    samples = []
+    for item in items:
+        started = time.perf_counter()
+        fn(item)
+        samples.append(time.perf_counter() - started)
+    stats = summarize(samples)
+    stats["items_per_sec"] = len(samples) / sum(samples) if sum(samples) else 0.0
+    return stats
+
+def run_metadata(**settings: Any) -> Dict[str, Any]:
+    """Identify the commit and machine so results can be compared across runs"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=project_root,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "settings": settings
+    }
+
+def write_results(results: Dict[str, Any], output: str):
+    """Write results as JSON and print a short summary"""
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    for name, stats in results["results"].items():
+        summary = ", ".join(
+            f"{key}={value:.3f}" if isinstance(value, float) else f"{key}={value}"
+            for key, value in stats.items()
+        )
+        print(f"{name}: {summary}")
+    print(f"Results written to {output}")
@@ -0,0 +1,42 @@
+"""
+Superseded implementations kept as baselines for the benchmark suite.
+"""
+from typing import Any, Dict, List
+import re
+
+SKILLS_PATTERN = re.compile(r'(?i)(?:skills|technical skills|expertise):\s*(.*?)(?=\n\n|\Z)')
+EXPERIENCE_PATTERN = re.compile(r'(?i)(?:experience|work history):\s*(.*?)(?=\n\n|\Z)')
+EDUCATION_PATTERN = re.compile(r'(?i)(?:education|academic background):\s*(.*?)(?=\n\n|\Z)')
+
+def regex_extract_information(text: str) -> Dict[str, Any]:
+    """ResumeParser extraction before the segmenter: one regex scan per section"""
+    result = {"skills": [], "experience": [], "education": []}
+    match = SKILLS_PATTERN.search(text)
+    if match:
+        result["skills"] = [skill.strip() for skill in match.group(1).split(',')]
+    for key, pattern in (("experience", EXPERIENCE_PATTERN), ("education", EDUCATION_PATTERN)):
+        match = pattern.search(text)
+        if match:
+            result[key] = [{"text": line.strip()} for line in match.group(1).split('\n') if line.strip()]
+    return result
+
+def find_extract_list(text: str, section: str) -> List[str]:
+    """LlamaModel._extract_list before the segmenter: one find scan per section"""
+    start = text.find(section)
+    if start == -1:
+        return []
+    start = text.find("\n", start) + 1
+    end = text.find("\n\n", start)
+    if end == -1:
+        end = len(text)
+    return [item.strip() for item in text[start:end].strip().split("\n") if item.strip()]
+
+def find_parse_job_analysis(text: str) -> Dict[str, Any]:
+    sections = {section: find_extract_list(text, section) for section in
+                ("Required Skills", "Required Experience", "Required Education", "Nice-to-have Skills")}
+    return {
+        "required_skills": sections["Required Skills"],
+        "required_experience": {"description": "\n".join(sections["Required Experience"])},
+        "required_education": {"description": "\n".join(sections["Required Education"])},
+        "nice_to_have_skills": sections["Nice-to-have Skills"]
+    }
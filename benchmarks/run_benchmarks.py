@@ -0,0 +1,184 @@
+"""
+Reproducible benchmark suite for parsing, LLM output parsing and matching.
+
+    python -m benchmarks.run_benchmarks --scales 10 1000 10000 --output bench.json
+
+Runs fully offline: the LLM is replaced by FakeLlamaModel.
+"""
+from typing import Any, Dict
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks import legacy
+from benchmarks.common import project_root, run_metadata, time_call, time_each, write_results
+from benchmarks.fake_llm import FakeLlamaModel
+from benchmarks.synthetic import SyntheticCorpus
+
+from indexing.candidate_index import CandidateIndex
+from matching.matcher import ResumeMatcher
+from parsers.resume_parser import ResumeParser
+from parsers.segmenter import resume_segmenter
+from pipeline.orchestrator import PipelineOrchestrator
+from utils.cache import TieredCache
+
+def bench_matcher_micro(corpus: SyntheticCorpus, repeat: int) -> Dict[str, Any]:
+    matcher = ResumeMatcher()
+    resume = corpus.resume(0)
+    job = corpus.job_requirements(0)
+    return {
+        "matcher.skills_match": time_call(
+            lambda: matcher._calculate_skills_match(resume["skills"], job["required_skills"]), repeat),
+        "matcher.experience_match": time_call(
+            lambda: matcher._calculate_experience_match(resume["experience"], job["required_experience"]), repeat),
+        "matcher.education_match": time_call(
+            lambda: matcher._calculate_education_match(resume["education"], job["required_education"]), repeat),
+        "matcher.calculate_match_score": time_call(
+            lambda: matcher.calculate_match_score(resume, dict(job)), repeat),
+        "skills.extract_resume_text": time_call(
+            lambda: matcher.taxonomy.extract(corpus.resume_text(0, jobs=10, filler_paragraphs=20)), repeat)
+    }
+
+def compare_with_legacy(results: Dict[str, Any], name: str, legacy_name: str):
+    """Add the legacy/current mean latency ratio to a result; below 1.0 means the current code is slower"""
+    results[name]["speedup_vs_legacy"] = results[legacy_name]["mean_ms"] / results[name]["mean_ms"]
+
+def bench_parser_micro(corpus: SyntheticCorpus, repeat: int) -> Dict[str, Any]:
+    # No cache, so every call does the real work
+    parser = ResumeParser(cache=TieredCache(None, memory_entries=0))
+    short_text = corpus.resume_text(0)
+    long_text = corpus.resume_text(1, jobs=30, filler_paragraphs=200)
+    results = {
+        # The segmenter alone is one stage of extraction, not comparable with the legacy path
+        "parser.segment": time_call(lambda: resume_segmenter.segment(short_text), repeat),
+        "parser.segment_long": time_call(lambda: resume_segmenter.segment(long_text), repeat),
+        # End to end, current and legacy extraction of the same text
+        "parser.extract_information": time_call(lambda: parser._extract_information(short_text), repeat),
+        "parser.legacy_extract_information": time_call(
+            lambda: legacy.regex_extract_information(short_text), repeat),
+        "parser.extract_information_long": time_call(lambda: parser._extract_information(long_text), repeat),
+        "parser.legacy_extract_information_long": time_call(
+            lambda: legacy.regex_extract_information(long_text), repeat)
+    }
+    compare_with_legacy(results, "parser.extract_information", "parser.legacy_extract_information")
+    compare_with_legacy(results, "parser.extract_information_long", "parser.legacy_extract_information_long")
+    sample_pdf = project_root / "temp" / "Resume.pdf"
+    if sample_pdf.exists():
+        data = sample_pdf.read_bytes()
+        results["parser.parse_pdf"] = time_call(lambda: parser.parse_bytes(data), max(repeat // 5, 3))
+    return results
+
+def bench_llm_parsing(corpus: SyntheticCorpus, repeat: int) -> Dict[str, Any]:
+    model = FakeLlamaModel()
+    job_output = model._complete(model.JOB_PROMPT.format(text=corpus.job_description(0)), model.JOB_SECTIONS)
+    resume_output = model._complete(model.RESUME_PROMPT.format(text=corpus.resume_text(0)), model.RESUME_SECTIONS)
+    results = {
+        "llm.parse_job_analysis": time_call(lambda: model._parse_job_analysis(job_output), repeat),
+        "llm.legacy_find_parse_job_analysis": time_call(
+            lambda: legacy.find_parse_job_analysis(job_output), repeat),
+        "llm.parse_resume_analysis": time_call(lambda: model._parse_resume_analysis(resume_output), repeat),
+        "llm.analyze_job_requirements_fake": time_each(
+            model.analyze_job_requirements, [corpus.job_description(i) for i in range(repeat)])
+    }
+    compare_with_legacy(results, "llm.parse_job_analysis", "llm.legacy_find_parse_job_analysis")
+    return results
+
+def bench_scale(corpus: SyntheticCorpus, scale: int, repeat: int, pairwise_limit: int) -> Dict[str, Any]:
+    matcher = ResumeMatcher()
+    resumes = corpus.resumes(scale)
+    jobs = [corpus.job_requirements(i) for i in range(max(repeat // 5, 3))]
+    results = {}
+
+    # Pairwise scoring vectorizes the job once per resume, so only a sample is timed
+    sample = resumes[:pairwise_limit]
+    results[f"e2e.pairwise_score.n{scale}"] = time_each(
+        lambda resume: matcher.calculate_match_score(resume, dict(jobs[0])), sample)
+
+    results[f"e2e.rank_candidates.n{scale}"] = time_each(
+        lambda job: matcher.rank_candidates(dict(job), resumes, top_k=10), jobs)
+    results[f"e2e.rank_candidates.n{scale}"]["candidates_per_sec"] = (
+        scale * results[f"e2e.rank_candidates.n{scale}"]["items_per_sec"])
+
+    with tempfile.TemporaryDirectory() as index_dir:
+        index = CandidateIndex(os.path.join(index_dir, "index"))
+        started = time.perf_counter()
+        for i, resume in enumerate(resumes):
+            index.add(f"c{i}", resume)
+        index.flush()
+        build_seconds = time.perf_counter() - started
+        results[f"e2e.index_query.n{scale}"] = time_each(lambda job: index.query(job, top_k=10), jobs)
+        results[f"e2e.index_query.n{scale}"]["build_seconds"] = build_seconds
+
+    # Job analysis (fake LLM) followed by ranking, as the app does per request
+    model = FakeLlamaModel()
+    descriptions = [corpus.job_description(i) for i in range(len(jobs))]
+    results[f"e2e.analyze_and_rank.n{scale}"] = time_each(
+        lambda description: matcher.rank_candidates(
+            model.analyze_job_requirements(description), resumes, top_k=10),
+        descriptions)
+    return results
+
+def bench_pipeline(corpus: SyntheticCorpus, repeat: int, llm_latency: float, batch: int) -> Dict[str, Any]:
+    """Sequential parse -> analyze -> match versus the concurrent orchestrator"""
+    sample_pdf = project_root / "temp" / "Resume.pdf"
+    if not sample_pdf.exists():
+        return {}
+    data = sample_pdf.read_bytes()
+    # No caches, so every run parses and generates
+    parser = ResumeParser(cache=TieredCache(None, memory_entries=0))
+    model = FakeLlamaModel(latency=llm_latency)
+    matcher = ResumeMatcher()
+    orchestrator = PipelineOrchestrator(parser, model, matcher)
+    descriptions = [corpus.job_description(i) for i in range(max(repeat // 10, 3))]
+
+    def sequential(description: str, count: int):
+        job = model.analyze_job_requirements(description)
+        for _ in range(count):
+            matcher.calculate_match_score(parser.parse_bytes(data), job)
+
+    def concurrent(description: str, count: int):
+        for _ in orchestrator.run(description, [(f"r{i}.pdf", data, None) for i in range(count)]):
+            pass
+
+    return {
+        "pipeline.sequential": time_each(lambda description: sequential(description, 1), descriptions),
+        "pipeline.concurrent": time_each(lambda description: concurrent(description, 1), descriptions),
+        f"pipeline.sequential_batch{batch}": time_each(
+            lambda description: sequential(description, batch), descriptions),
+        f"pipeline.concurrent_batch{batch}": time_each(
+            lambda description: concurrent(description, batch), descriptions)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the matcher/parser benchmark suite")
+    parser.add_argument("--scales", type=int, nargs="+", default=[10, 1000, 10000],
+                        help="Candidate pool sizes for end-to-end benchmarks")
+    parser.add_argument("--repeat", type=int, default=50, help="Repetitions per micro-benchmark")
+    parser.add_argument("--pairwise-limit", type=int, default=200,
+                        help="Max candidates timed with pairwise calculate_match_score")
+    parser.add_argument("--llm-latency", type=float, default=0.2,
+                        help="Simulated seconds per fake LLM generation in the pipeline benchmark")
+    parser.add_argument("--batch", type=int, default=10, help="Resumes per job in the batch pipeline benchmark")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="bench_results.json")
+    args = parser.parse_args()
+
+    corpus = SyntheticCorpus(seed=args.seed)
+    results = {}
+    results.update(bench_matcher_micro(corpus, args.repeat))
+    results.update(bench_parser_micro(corpus, args.repeat))
+    results.update(bench_llm_parsing(corpus, args.repeat))
+    results.update(bench_pipeline(corpus, args.repeat, args.llm_latency, args.batch))
+    for scale in args.scales:
+        results.update(bench_scale(corpus, scale, args.repeat, args.pairwise_limit))
+
+    write_results({
+        "meta": run_metadata(scales=args.scales, repeat=args.repeat, seed=args.seed,
+                             pairwise_limit=args.pairwise_limit, llm_latency=args.llm_latency,
+                             batch=args.batch),
+        "results": results
+    }, args.output)
+
+if __name__ == "__main__":
+    main()
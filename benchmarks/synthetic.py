@@ -0,0 +1,118 @@
+"""
+Deterministic synthetic resumes and job descriptions for benchmarks.
+"""
+from typing import Any, Dict, List
+import random
+
+SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "Go", "Rust", "C++", "SQL", "PostgreSQL",
+    "MySQL", "MongoDB", "Redis", "Kafka", "Spark", "Hadoop", "Airflow", "Docker", "Kubernetes",
+    "Terraform", "AWS", "GCP", "Azure", "Linux", "Git", "React", "Angular", "Vue", "Node.js",
+    "Django", "Flask", "FastAPI", "Spring", "pandas", "NumPy", "scikit-learn", "PyTorch",
+    "TensorFlow", "NLP", "Computer Vision", "Machine Learning", "Statistics", "Tableau",
+    "Power BI", "Excel", "Agile", "Scrum", "Communication", "Leadership", "Mentoring",
+    "Project Management"
+]
+
+ROLES = [
+    "Software Engineer", "Data Scientist", "Data Engineer", "Backend Developer",
+    "Frontend Developer", "DevOps Engineer", "ML Engineer", "Product Analyst",
+    "Site Reliability Engineer", "Engineering Manager"
+]
+
+COMPANIES = [
+    "Acme Corp", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries",
+    "Wayne Enterprises", "Cyberdyne", "Soylent", "Vandelay Industries"
+]
+
+DEGREES = [
+    "BSc Computer Science", "MSc Computer Science", "BEng Software Engineering",
+    "MSc Data Science", "BSc Mathematics", "PhD Machine Learning", "BA Economics",
+    "MBA Technology Management"
+]
+
+SCHOOLS = [
+    "State University", "Institute of Technology", "City College",
+    "Polytechnic University", "National University"
+]
+
+FILLER = (
+    "Collaborated with cross-functional teams to deliver features on schedule. "
+    "Improved reliability and performance of production systems. "
+    "Wrote documentation and reviewed code for teammates. "
+)
+
+class SyntheticCorpus:
+    """Generates resume texts in the parser's section format, parsed resumes and job requirements"""
+
+    def __init__(self, seed: int = 42):
+        self.seed = seed
+
+    def resume_text(self, index: int, jobs: int = 3, filler_paragraphs: int = 1) -> str:
+        """Resume text with Skills/Experience/Education sections"""
+        rng = random.Random(self.seed * 1_000_003 + index)
+        skills = rng.sample(SKILLS, rng.randint(5, 15))
+        experience = [
+            f"{rng.choice(ROLES)} at {rng.choice(COMPANIES)} ({rng.randint(1, 8)} years) "
+            f"using {', '.join(rng.sample(skills, min(3, len(skills))))}"
+            for _ in range(jobs)
+        ]
+        education = [
+            f"{rng.choice(DEGREES)}, {rng.choice(SCHOOLS)}, {rng.randint(1995, 2022)}"
+            for _ in range(rng.randint(1, 2))
+        ]
+        summary = FILLER * filler_paragraphs
+        return (
+            f"Candidate {index}\n"
+            f"Summary: {summary}\n\n"
+            f"Skills: {', '.join(skills)}\n\n"
+            f"Experience:\n" + "\n".join(experience) + "\n\n"
+            "Education:\n" + "\n".join(education) + "\n"
+        )
+
+    def resume(self, index: int) -> Dict[str, Any]:
+        """Parsed resume in the ResumeParser output shape"""
+        rng = random.Random(self.seed * 1_000_003 + index)
+        skills = rng.sample(SKILLS, rng.randint(5, 15))
+        return {
+            "skills": skills,
+            "experience": [
+                {"text": f"{rng.choice(ROLES)} at {rng.choice(COMPANIES)} ({rng.randint(1, 8)} years)"}
+                for _ in range(rng.randint(1, 4))
+            ],
+            "education": [
+                {"text": f"{rng.choice(DEGREES)}, {rng.choice(SCHOOLS)}"}
+                for _ in range(rng.randint(1, 2))
+            ],
+            "raw_text": ""
+        }
+
+    def resumes(self, count: int) -> List[Dict[str, Any]]:
+        return [self.resume(i) for i in range(count)]
+
+    def job_description(self, index: int) -> str:
+        """Free-text job description"""
+        rng = random.Random(self.seed * 7_000_001 + index)
+        required = rng.sample(SKILLS, 6)
+        nice = rng.sample([skill for skill in SKILLS if skill not in required], 3)
+        return (
+            f"We are hiring a {rng.choice(ROLES)} to join {rng.choice(COMPANIES)}.\n\n"
+            f"Requirements: {', '.join(required)}.\n"
+            f"At least {rng.randint(2, 8)} years of professional experience.\n"
+            f"Degree: {rng.choice(DEGREES)} or equivalent.\n\n"
+            f"Nice to have: {', '.join(nice)}.\n"
+        )
+
+    def job_requirements(self, index: int) -> Dict[str, Any]:
+        """Job requirements in the LlamaModel analysis shape"""
+        rng = random.Random(self.seed * 7_000_001 + index)
+        required = rng.sample(SKILLS, 6)
+        nice = rng.sample([skill for skill in SKILLS if skill not in required], 3)
+        return {
+            "required_skills": required,
+            "required_experience": {
+                "description": f"{rng.randint(2, 8)} years as {rng.choice(ROLES)}"
+            },
+            "required_education": {"description": rng.choice(DEGREES)},
+            "nice_to_have_skills": nice
+        }
@@ -7,12 +7,45 @@ class Config:
     # Model Configuration
     MODEL_NAME = "meta-llama/Llama-2-7b-chat-hf"
     MODEL_CACHE_DIR = os.getenv("MODEL_CACHE_DIR", "models")
+    PRELOAD_MODEL = os.getenv("PRELOAD_MODEL", "false").lower() == "true"  # Warm up at app start
+    
+    # Inference Backend Configuration
+    LLM_BACKEND = os.getenv("LLM_BACKEND", "transformers")  # transformers, int8 or llamacpp
+    LLM_THREADS = int(os.getenv("LLM_THREADS", "0"))  # CPU threads for inference; 0 = library default
+    LLM_CPU_DTYPE = os.getenv("LLM_CPU_DTYPE", "float32")  # transformers on CPU: float32 or bfloat16
+    LLM_GGUF_PATH = os.getenv("LLM_GGUF_PATH")  # Quantized GGUF model file for llamacpp
+    LLM_CONTEXT_LENGTH = int(os.getenv("LLM_CONTEXT_LENGTH", "4096"))  # Context window: prompt plus generated tokens
+    LLM_PREFIX_CACHE = os.getenv("LLM_PREFIX_CACHE", "true").lower() == "true"  # Reuse template-prefix KV cache
+    LLM_PREFIX_CACHE_ENTRIES = 4  # transformers: cached prefixes (one per prompt template)
+    LLM_PREFIX_CACHE_BYTES = 512 * 1024 * 1024  # llama.cpp RAM cache of prompt-prefix KV states
+    
+    # LLM Input Budget Configuration
+    LLM_MIN_NEW_TOKENS = int(os.getenv("LLM_MIN_NEW_TOKENS", "128"))  # Generation budget of a tiny input
+    LLM_NEW_TOKENS_PER_INPUT_TOKEN = float(os.getenv("LLM_NEW_TOKENS_PER_INPUT_TOKEN", "0.5"))  # Added per input token
+    LLM_MAX_CHUNKS = int(os.getenv("LLM_MAX_CHUNKS", "8"))  # Chunks analyzed per oversized document
+    
+    # LLM Analysis Cache Configuration
+    LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(MODEL_CACHE_DIR, "analysis_cache.sqlite3"))
+    LLM_CACHE_MEMORY_ENTRIES = 256  # In-memory LRU tier
+    LLM_CACHE_MAX_ENTRIES = 10000  # SQLite tier
+    LLM_CACHE_MAX_BYTES = 100 * 1024 * 1024  # 100MB
+    LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))  # Seconds
+    
+    # LLM Batching Configuration
+    LLM_BATCH_SIZE = int(os.getenv("LLM_BATCH_SIZE", "8"))  # Max prompts per generate call
+    LLM_BATCH_WAIT = float(os.getenv("LLM_BATCH_WAIT", "0.05"))  # Seconds to collect a batch
     
     # File Upload Configuration
     MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
     ALLOWED_EXTENSIONS = [".pdf", ".docx"]
     TEMP_DIR = "temp"
     
+    # Parsed Resume Cache Configuration
+    PARSE_CACHE_PATH = os.getenv("PARSE_CACHE_PATH", os.path.join(TEMP_DIR, "parse_cache.sqlite3"))
+    PARSE_CACHE_MEMORY_ENTRIES = 128  # In-memory LRU tier
+    PARSE_CACHE_MAX_ENTRIES = 5000  # SQLite tier
+    PARSE_CACHE_MAX_BYTES = 200 * 1024 * 1024  # 200MB
+    
     # Matching Algorithm Configuration
     MATCHING_WEIGHTS = {
         "skills_match": 0.5,
@@ -20,9 +53,48 @@ class Config:
         "education_match": 0.2
     }
     
+    # Matching Vectorizer Configuration
+    VECTORIZER_PATH = os.getenv("VECTORIZER_PATH", os.path.join(MODEL_CACHE_DIR, "vectorizer.joblib"))
+    VECTORIZER_N_FEATURES = 2 ** 18  # Hashing vectorizer, used when no fitted one exists
+    VECTORIZER_MAX_FEATURES = 50000  # Vocabulary cap of the fitted TF-IDF vectorizer
+    
+    # Skill Matching Configuration
+    SKILL_TAXONOMY_PATH = os.getenv("SKILL_TAXONOMY_PATH")  # JSON {"Skill": ["alias", ...]} extending the built-in taxonomy
+    SKILL_MATCH_WEIGHTS = {
+        "required": 1.0,
+        "nice_to_have": 0.25
+    }
+    
+    # Candidate Index Configuration
+    INDEX_DIR = os.getenv("INDEX_DIR", "index")
+    INDEX_FLUSH_THRESHOLD = 1000  # Buffered candidates before writing a segment
+    INDEX_MAX_SEGMENTS = 8  # Compact when more segments than this exist
+    INDEX_MAX_DELETED_RATIO = 0.2  # Compact when this share of rows is deleted
+    
+    # Approximate Retrieval Configuration (two-stage ranking of large pools)
+    ANN_DIMENSIONS = int(os.getenv("ANN_DIMENSIONS", "128"))  # LSA embedding size
+    ANN_LISTS = int(os.getenv("ANN_LISTS", "0"))  # IVF clusters; 0 = about sqrt(candidates)
+    ANN_NPROBE = int(os.getenv("ANN_NPROBE", "0"))  # Clusters searched per query (sets recall); 0 = half of them
+    ANN_SHORTLIST = int(os.getenv("ANN_SHORTLIST", "100"))  # Candidates re-scored exactly per query
+    ANN_MIN_CANDIDATES = int(os.getenv("ANN_MIN_CANDIDATES", "5000"))  # Smaller pools are ranked exactly
+    ANN_PATH = os.getenv("ANN_PATH", os.path.join(MODEL_CACHE_DIR, "ann_index.joblib"))
+    
+    # Pipeline Configuration
+    PIPELINE_WORKERS = int(os.getenv("PIPELINE_WORKERS", "4"))  # Threads for the job analysis plus resume parsing
+    
+    # Instrumentation Configuration
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))  # Serve /metrics on this port; 0 disables
+    METRICS_DUMP_PATH = os.getenv("METRICS_DUMP_PATH")  # Write Prometheus text here after each request
+    PROFILE_DIR = os.getenv("PROFILE_DIR")  # cProfile each request into this directory
+    
     # API Configuration
     API_HOST = os.getenv("API_HOST", "0.0.0.0")
     API_PORT = int(os.getenv("API_PORT", "8501"))
+    API_WORKERS = int(os.getenv("API_WORKERS", str(os.cpu_count() or 2)))  # Processes for parsing/matching
+    API_MAX_CONCURRENT_LLM = int(os.getenv("API_MAX_CONCURRENT_LLM", "8"))  # In-flight LLM analyses
+    API_MAX_QUEUE = int(os.getenv("API_MAX_QUEUE", "64"))  # Waiting requests per limiter before 429
+    API_REQUEST_TIMEOUT = float(os.getenv("API_REQUEST_TIMEOUT", "120"))  # Seconds before 504
+    API_RETRY_AFTER = 5  # Seconds suggested to clients on 429
     
     # Logging Configuration
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -34,6 +106,7 @@ class Config:
         # Ensure required directories exist
         os.makedirs(Config.MODEL_CACHE_DIR, exist_ok=True)
         os.makedirs(Config.TEMP_DIR, exist_ok=True)
+        os.makedirs(Config.INDEX_DIR, exist_ok=True)
         
         # Validate file size limit
         if Config.MAX_FILE_SIZE <= 0:
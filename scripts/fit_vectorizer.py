@@ -0,0 +1,55 @@
+"""
+Fit the matching vectorizer once on a corpus of parsed resumes and save it.
+
+    python scripts/ingest_resumes.py resumes.zip -o parsed.jsonl
+    python scripts/fit_vectorizer.py parsed.jsonl --jobs jobs.jsonl
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Same path setup as the Streamlit app: src/ for packages, repo root for config
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root / "src"))
+sys.path.append(str(project_root))
+
+from config.config import Config
+from matching.matcher import requirement_section_texts, resume_section_texts
+from matching.vectorizer import CorpusVectorizer
+
+def read_jsonl(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit the corpus-wide matching vectorizer")
+    parser.add_argument("resumes", help="JSONL of parsed resumes (ingest_resumes.py output or plain resume objects)")
+    parser.add_argument("--jobs", help="Optional JSONL of job requirements to include in the corpus")
+    parser.add_argument("-o", "--output", default=Config.VECTORIZER_PATH, help="Where to save the vectorizer")
+    parser.add_argument("--kind", choices=CorpusVectorizer.KINDS, default="tfidf")
+    parser.add_argument("--max-features", type=int, default=Config.VECTORIZER_MAX_FEATURES,
+                        help="Vocabulary size cap for tfidf")
+    parser.add_argument("--min-df", type=int, default=2, help="Ignore terms in fewer documents than this")
+    args = parser.parse_args()
+
+    texts = []
+    for record in read_jsonl(args.resumes):
+        if "ok" in record:
+            if not record["ok"]:
+                continue
+            record = record["resume"]
+        texts.extend(resume_section_texts(record).values())
+    if args.jobs:
+        for record in read_jsonl(args.jobs):
+            texts.extend(requirement_section_texts(record).values())
+
+    vectorizer = CorpusVectorizer(args.kind, max_features=args.max_features, min_df=args.min_df).fit(texts)
+    vectorizer.save(args.output)
+    print(f"Fitted {args.kind} vectorizer on {len(texts)} sections "
+          f"({vectorizer.vocabulary_size()} features) -> {args.output}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Bulk resume ingestion: parse a directory or archive of resumes in parallel.
+
+    python scripts/ingest_resumes.py resumes.zip -o parsed.jsonl --workers 8
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Same path setup as the Streamlit app: src/ for packages, repo root for config
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root / "src"))
+sys.path.append(str(project_root))
+
+from parsers.bulk import BulkIngestor
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse resumes in bulk into JSONL")
+    parser.add_argument("path", help="Directory, .zip/.tar archive or single resume file")
+    parser.add_argument("-o", "--output", help="JSONL output file (default: stdout)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=60, help="Per-file timeout in seconds")
+    parser.add_argument("--index", help="Also add parsed resumes to the candidate index at this path")
+    args = parser.parse_args()
+
+    ingestor = BulkIngestor(workers=args.workers, timeout=args.timeout)
+    index = None
+    if args.index:
+        from indexing.candidate_index import CandidateIndex
+        index = CandidateIndex(args.index)
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for result in ingestor.run(args.path):
+            if result["ok"]:
+                # Parsed resumes are records; write them as plain JSON objects
+                result = dict(result, resume=dict(result["resume"]))
+            output.write(json.dumps(result) + "\n")
+            if not result["ok"]:
+                print(f"Failed: {result['source']}: {result['error']}", file=sys.stderr)
+            elif index is not None:
+                index.add(result["source"], result["resume"])
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if index is not None:
+            index.flush()
+
+    stats = ingestor.stats
+    print(
+        f"Parsed {stats['parsed']} of {stats['files']} files ({stats['failed']} failed) "
+        f"in {stats['seconds']:.1f}s - {stats['files_per_sec']:.1f} files/sec",
+        file=sys.stderr
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+"""
+API package for AI Recruiter Agency
+"""
@@ -0,0 +1,327 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from concurrent.futures import Future, ProcessPoolExecutor
+import asyncio
+import multiprocessing
+import os
+import sys
+from pathlib import Path
+
+from aiohttp import web
+
+# Add the src directory and the repository root to the Python path
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+sys.path.append(str(project_root))
+sys.path.append(str(project_root.parent))
+
+from config.config import Config
+from matching.matcher import ResumeMatcher
+from models.registry import get_llama_model, preload
+from parsers.resume_parser import ResumeParser
+from utils.metrics import metrics
+
+# Per-process workers for CPU-bound parsing and matching
+_parser = None
+_matcher = None
+
+def _parse(data: bytes, content_type: str) -> Dict[str, Any]:
+    global _parser
+    if _parser is None:
+        _parser = ResumeParser()
+    return _parser.parse_bytes(data, content_type)
+
+def _match(resume_data: Dict[str, Any], job_requirements: Dict[str, Any]) -> Dict[str, float]:
+    global _matcher
+    if _matcher is None:
+        _matcher = ResumeMatcher()
+    return _matcher.calculate_match_score(resume_data, job_requirements)
+
+def _rank(job_requirements: Dict[str, Any], resumes: list, top_k: int) -> list:
+    global _matcher
+    if _matcher is None:
+        _matcher = ResumeMatcher()
+    return _matcher.rank_candidates(job_requirements, resumes, top_k)
+
+def _traced(fn: Callable, *args: Any) -> Tuple[Any, List[Tuple[str, float]], int, Optional[Dict[str, Any]]]:
+    """Run fn in a worker; also return the spans it recorded and this worker's parse cache stats
+
+    Worker processes have their own metrics, which /metrics in the parent
+    never sees, so the parent records what the worker returns.
+    """
+    with metrics.trace() as spans:
+        result = fn(*args)
+    cache_stats = _parser.cache.stats() if _parser is not None else None
+    return result, spans, os.getpid(), cache_stats
+
+# Fields of job requirements and the JSON types they may have
+JOB_REQUIREMENT_FIELDS = {
+    "required_skills": list,
+    "nice_to_have_skills": list,
+    "required_experience": dict,
+    "required_education": dict
+}
+
+def validate_job_requirements(job_requirements: Any) -> Dict[str, Any]:
+    """Check caller-supplied job requirements; raises ValueError describing the first problem"""
+    if not isinstance(job_requirements, dict):
+        raise ValueError("'job_requirements' must be an object")
+    for field, expected in JOB_REQUIREMENT_FIELDS.items():
+        value = job_requirements.get(field)
+        if value is None:
+            continue
+        if not isinstance(value, expected):
+            kind = "a list of strings" if expected is list else 'an object such as {"description": "..."}'
+            raise ValueError(f"'job_requirements.{field}' must be {kind}")
+        if expected is list and not all(isinstance(item, str) for item in value):
+            raise ValueError(f"'job_requirements.{field}' must be a list of strings")
+        if expected is dict and not isinstance(value.get("description", ""), str):
+            raise ValueError(f"'job_requirements.{field}.description' must be a string")
+    return job_requirements
+
+# Fields of a parsed resume the matcher reads and the JSON types they may have
+RESUME_FIELDS = {
+    "skills": list,
+    "canonical_skills": list,
+    "experience": list,
+    "education": list,
+    "raw_text": str
+}
+
+def _section_item(item: Any) -> bool:
+    """Experience/education items are strings or {"text": "..."} objects"""
+    return isinstance(item, str) or (isinstance(item, dict) and isinstance(item.get("text", ""), str))
+
+def validate_resume(resume: Any, name: str = "resume") -> Dict[str, Any]:
+    """Check a caller-supplied parsed resume; raises ValueError describing the first problem"""
+    if not isinstance(resume, dict):
+        raise ValueError(f"'{name}' must be a parsed resume object")
+    for field, expected in RESUME_FIELDS.items():
+        value = resume.get(field)
+        if value is None:
+            continue
+        if expected is str:
+            if not isinstance(value, str):
+                raise ValueError(f"'{name}.{field}' must be a string")
+        elif field in ("skills", "canonical_skills"):
+            if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                raise ValueError(f"'{name}.{field}' must be a list of strings")
+        elif not isinstance(value, list) or not all(_section_item(item) for item in value):
+            raise ValueError(f"'{name}.{field}' must be a list of strings or {{\"text\": \"...\"}} objects")
+    return resume
+
+class Overloaded(Exception):
+    """Raised when a limiter's wait queue is full"""
+
+class Limiter:
+    """Bounded concurrency with a bounded wait queue
+
+    At most ``max_concurrent`` tasks run at once and at most ``max_queue``
+    wait for a slot; anything beyond that is rejected immediately so bursts
+    turn into 429s instead of unbounded queues and memory growth.
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int):
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._waiting = 0
+
+    async def acquire(self):
+        if self._semaphore.locked() and self._waiting >= self.max_queue:
+            raise Overloaded()
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+    def release(self):
+        self._semaphore.release()
+
+    async def run(self, future_factory: Callable[[], Future], timeout: float) -> Any:
+        """Start work in a slot and wait for it with a timeout
+
+        The slot is held until the work actually finishes, even if the caller
+        timed out, so abandoned work still counts against the limit.
+        """
+        # One deadline covers waiting for a slot and running
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        await asyncio.wait_for(self.acquire(), timeout)
+        try:
+            future = asyncio.wrap_future(future_factory())
+        except BaseException:
+            self.release()
+            raise
+        future.add_done_callback(lambda _: self.release())
+        return await asyncio.wait_for(asyncio.shield(future), max(deadline - loop.time(), 0))
+
+class ScoringService:
+    """Headless HTTP API for parsing, job analysis and matching"""
+
+    def __init__(self):
+        self.timeout = Config.API_REQUEST_TIMEOUT
+        self.llama_model = get_llama_model()
+        self.executor = ProcessPoolExecutor(
+            max_workers=Config.API_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        self.llm_limiter = None
+        self.cpu_limiter = None
+        # Latest parse cache stats of each worker process, by PID
+        self._worker_cache_stats = {}
+        metrics.register_gauge("cache_hit_rate", self._parse_cache_hit_rate, {"cache": "parse"})
+
+    def create_app(self) -> web.Application:
+        app = web.Application(client_max_size=Config.MAX_FILE_SIZE, middlewares=[self._middleware])
+        app.router.add_get("/health", self.health)
+        app.router.add_get("/metrics", self.metrics)
+        app.router.add_post("/parse", self.parse)
+        app.router.add_post("/analyze-job", self.analyze_job)
+        app.router.add_post("/match", self.match)
+        app.router.add_post("/rank", self.rank)
+        app.on_startup.append(self._on_startup)
+        app.on_cleanup.append(self._on_cleanup)
+        return app
+
+    async def health(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok", "model_loaded": self.llama_model.is_loaded})
+
+    async def metrics(self, request: web.Request) -> web.Response:
+        return web.Response(text=metrics.render_prometheus(), content_type="text/plain")
+
+    async def parse(self, request: web.Request) -> web.Response:
+        """Raw PDF/DOCX body -> parsed resume"""
+        data = await request.read()
+        if not data:
+            raise web.HTTPBadRequest(text="Empty request body")
+        resume_data = await self._run_cpu(_parse, data, request.content_type)
+        # Records convert to plain dicts for JSON
+        return web.json_response(dict(resume_data))
+
+    async def analyze_job(self, request: web.Request) -> web.Response:
+        """{"job_description": str} -> job requirements"""
+        body = await self._json(request)
+        return web.json_response(dict(await self._job_requirements(body)))
+
+    async def match(self, request: web.Request) -> web.Response:
+        """{"resume": {...}, "job_requirements": {...} or "job_description": str} -> scores"""
+        body = await self._json(request)
+        try:
+            resume_data = validate_resume(body.get("resume"))
+        except ValueError as e:
+            raise web.HTTPBadRequest(text=str(e))
+        job_requirements = await self._job_requirements(body)
+        scores = await self._run_cpu(_match, resume_data, job_requirements)
+        return web.json_response({"scores": scores, "job_requirements": dict(job_requirements)})
+
+    async def rank(self, request: web.Request) -> web.Response:
+        """{"resumes": [...], "job_requirements"/"job_description", "top_k": int} -> ranked candidates"""
+        body = await self._json(request)
+        resumes = body.get("resumes")
+        if not isinstance(resumes, list):
+            raise web.HTTPBadRequest(text="'resumes' must be a list of parsed resumes")
+        try:
+            for i, resume in enumerate(resumes):
+                validate_resume(resume, f"resumes[{i}]")
+        except ValueError as e:
+            raise web.HTTPBadRequest(text=str(e))
+        top_k = body.get("top_k", 10)
+        if not isinstance(top_k, int):
+            raise web.HTTPBadRequest(text="'top_k' must be an integer")
+        job_requirements = await self._job_requirements(body)
+        ranked = await self._run_cpu(_rank, job_requirements, resumes, top_k)
+        return web.json_response({"candidates": ranked, "job_requirements": dict(job_requirements)})
+
+    async def _job_requirements(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Use given job requirements or analyze the job description through the LLM limiter"""
+        if body.get("job_requirements") is not None:
+            try:
+                return validate_job_requirements(body["job_requirements"])
+            except ValueError as e:
+                raise web.HTTPBadRequest(text=str(e))
+        job_description = body.get("job_description")
+        if not isinstance(job_description, str) or not job_description.strip():
+            raise web.HTTPBadRequest(text="Provide 'job_requirements' or a non-empty 'job_description'")
+        # Concurrent requests are micro-batched into shared generate calls
+        return await self._limited(
+            self.llm_limiter, lambda: self.llama_model.submit_job_requirements(job_description)
+        )
+
+    async def _run_cpu(self, fn: Callable, *args: Any) -> Any:
+        def submit() -> Future:
+            future = self.executor.submit(_traced, fn, *args)
+            # Recorded on completion, so work that outlives a timed-out request still counts
+            future.add_done_callback(self._record_worker_metrics)
+            return future
+        result, _, _, _ = await self._limited(self.cpu_limiter, submit)
+        return result
+
+    def _record_worker_metrics(self, future: Future):
+        """Record the spans and parse cache stats a worker returned in this process's metrics"""
+        if future.cancelled() or future.exception() is not None:
+            return
+        _, spans, pid, cache_stats = future.result()
+        for stage, seconds in spans:
+            metrics.observe(stage, seconds)
+        if cache_stats is not None:
+            self._worker_cache_stats[pid] = cache_stats
+
+    def _parse_cache_hit_rate(self) -> Optional[float]:
+        """Parse cache hit rate across all worker processes"""
+        stats = list(self._worker_cache_stats.values())
+        lookups = sum(entry["hits"] + entry["misses"] for entry in stats)
+        return sum(entry["hits"] for entry in stats) / lookups if lookups else None
+
+    async def _limited(self, limiter: Limiter, future_factory: Callable[[], Future]) -> Any:
+        try:
+            return await limiter.run(future_factory, self.timeout)
+        except Overloaded:
+            raise web.HTTPTooManyRequests(
+                text="Server is at capacity, retry later",
+                headers={"Retry-After": str(Config.API_RETRY_AFTER)}
+            )
+        except asyncio.TimeoutError:
+            raise web.HTTPGatewayTimeout(text=f"Request took longer than {self.timeout}s")
+        except ValueError as e:
+            raise web.HTTPBadRequest(text=str(e))
+
+    async def _json(self, request: web.Request) -> Dict[str, Any]:
+        try:
+            body = await request.json()
+        except ValueError:
+            raise web.HTTPBadRequest(text="Request body must be JSON")
+        if not isinstance(body, dict):
+            raise web.HTTPBadRequest(text="Request body must be a JSON object")
+        return body
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        route = request.match_info.route.resource.canonical if request.match_info.route.resource else "unknown"
+        status = 500
+        try:
+            with metrics.span(f"api{route.replace('/', '.')}"):
+                response = await handler(request)
+            status = response.status
+            return response
+        except web.HTTPException as e:
+            status = e.status
+            raise
+        finally:
+            metrics.increment("api_responses_total", labels={"route": route, "status": str(status)})
+
+    async def _on_startup(self, app: web.Application):
+        # Limiters belong to the running event loop
+        self.llm_limiter = Limiter(Config.API_MAX_CONCURRENT_LLM, Config.API_MAX_QUEUE)
+        self.cpu_limiter = Limiter(Config.API_WORKERS, Config.API_MAX_QUEUE)
+        if Config.PRELOAD_MODEL:
+            preload(background=True)
+
+    async def _on_cleanup(self, app: web.Application):
+        self.llama_model.close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+def main():
+    web.run_app(ScoringService().create_app(), host=Config.API_HOST, port=Config.API_PORT)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+"""
+Indexing package for AI Recruiter Agency
+"""
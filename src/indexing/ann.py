@@ -0,0 +1,183 @@
+from typing import Dict, Any, List, Optional, Sequence
+import math
+import os
+import joblib
+import numpy as np
+from scipy import sparse
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import TruncatedSVD
+
+from config.config import Config
+from matching.matcher import SECTIONS, ResumeMatcher, requirement_section_texts
+from utils.metrics import metrics
+
+FORMAT_VERSION = 2
+
+class AnnRetriever:
+    """Two-stage ranking: an approximate shortlist, then exact scoring of the shortlist only
+
+    Stage one embeds candidates with LSA: their skill-ID, experience and
+    education vectors, each scaled by the square root of its match weight,
+    are concatenated and reduced with a truncated SVD. A job embedded the
+    same way then has an inner product with a candidate that approximates
+    the weighted overall match. Embeddings are grouped into k-means clusters
+    (an IVF index); a query scores the ``nprobe`` nearest clusters and keeps
+    the best ``shortlist`` candidates. Stage two re-scores them with
+    ResumeMatcher.rank_vectors on the section vectors kept from build(), so
+    returned scores are exact.
+
+    Recall is bounded by the clusters searched: a true top candidate in a
+    cluster that is not probed is never seen, so ``nprobe`` (by default half
+    the clusters) sets recall and ``shortlist`` only needs to be a few times
+    ``top_k``. With ``nprobe`` equal to the number of clusters stage one is
+    exhaustive. Pools smaller than ``min_candidates`` are ranked exactly,
+    which is about as fast there.
+    """
+
+    def __init__(self, matcher: Optional[ResumeMatcher] = None, dimensions: Optional[int] = None,
+                 n_lists: Optional[int] = None, nprobe: Optional[int] = None, shortlist: Optional[int] = None,
+                 min_candidates: Optional[int] = None, seed: int = 0):
+        self.matcher = matcher or ResumeMatcher()
+        self.dimensions = dimensions or Config.ANN_DIMENSIONS
+        self.n_lists = n_lists or Config.ANN_LISTS
+        self.nprobe = nprobe or Config.ANN_NPROBE
+        self.shortlist_size = shortlist or Config.ANN_SHORTLIST
+        self.min_candidates = Config.ANN_MIN_CANDIDATES if min_candidates is None else min_candidates
+        self.seed = seed
+        self.resumes = None
+        # Section vectors of the pool, as ResumeMatcher.vectorize_resumes builds them, for exact re-scoring
+        self.vectors = None
+        self.skill_width = 0
+        # Sparse columns used by the pool, and the LSA projection of those columns
+        self.columns = None
+        self.components = None
+        self.embeddings = None
+        self.centroids = None
+        # Candidate rows grouped by cluster: order[offsets[c]:offsets[c + 1]] belong to cluster c
+        self.order = None
+        self.offsets = None
+
+    def __len__(self) -> int:
+        return 0 if self.resumes is None else len(self.resumes)
+
+    @metrics.timed("ann.build")
+    def build(self, resumes: Sequence[Dict[str, Any]]) -> "AnnRetriever":
+        """Embed and cluster a candidate pool (a list of parsed resumes or a ColumnarStore)"""
+        self.resumes = resumes
+        if not len(resumes):
+            return self
+        vectors = self.vectors = self.matcher.vectorize_resumes(resumes)
+        self.skill_width = vectors["skills_match"].shape[1]
+        matrix = self._weighted(vectors)
+        # Hashed text vectors are very wide; columns no candidate uses cannot affect a score
+        self.columns = np.unique(matrix.indices)
+        matrix = matrix[:, self.columns]
+
+        # TruncatedSVD needs fewer components than rows and columns
+        dimensions = min(self.dimensions, matrix.shape[0] - 1, matrix.shape[1] - 1)
+        if dimensions < 1:
+            self.components = None
+            return self
+        svd = TruncatedSVD(n_components=dimensions, random_state=self.seed)
+        self.embeddings = svd.fit_transform(matrix).astype(np.float32)
+        self.components = svd.components_.astype(np.float32)
+
+        n_lists = self.n_lists or int(math.sqrt(len(resumes)))
+        n_lists = max(1, min(n_lists, len(resumes)))
+        # Spherical k-means: cluster directions, since queries rank by inner product
+        norms = np.linalg.norm(self.embeddings, axis=1, keepdims=True)
+        kmeans = MiniBatchKMeans(n_clusters=n_lists, random_state=self.seed, n_init=3,
+                                 batch_size=max(1024, n_lists * 4))
+        labels = kmeans.fit_predict(self.embeddings / np.maximum(norms, 1e-12))
+        self.centroids = kmeans.cluster_centers_.astype(np.float32)
+        self.order = np.argsort(labels, kind="stable").astype(np.int64)
+        self.offsets = np.zeros(n_lists + 1, dtype=np.int64)
+        np.cumsum(np.bincount(labels, minlength=n_lists), out=self.offsets[1:])
+        return self
+
+    @metrics.timed("ann.query")
+    def query(self, job_requirements: Dict[str, Any], top_k: int = 10, nprobe: Optional[int] = None,
+              shortlist: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Top-k candidates in the rank_candidates format; "index" refers to the built pool"""
+        if not len(self) or top_k <= 0:
+            return []
+        if self.components is None or len(self) < self.min_candidates:
+            return self.matcher.rank_vectors(job_requirements, self.vectors, top_k)
+        rows = self.shortlist(job_requirements, max(shortlist or self.shortlist_size, top_k), nprobe)
+        with metrics.span("ann.rerank"):
+            vectors = {category: matrix[rows] for category, matrix in self.vectors.items()}
+            ranked = self.matcher.rank_vectors(job_requirements, vectors, top_k)
+        for candidate in ranked:
+            candidate["index"] = int(rows[candidate["index"]])
+        return ranked
+
+    def shortlist(self, job_requirements: Dict[str, Any], size: int, nprobe: Optional[int] = None) -> np.ndarray:
+        """Pool rows of the approximately best candidates, best first"""
+        if self.components is None:
+            # Too few candidates to index: every candidate goes to exact scoring
+            return np.arange(len(self))
+        query = self.embed_query(job_requirements)
+        with metrics.span("ann.search"):
+            nprobe = min(nprobe or self.nprobe or (len(self.centroids) + 1) // 2, len(self.centroids))
+            lists = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+            rows = np.concatenate([self.order[self.offsets[c]:self.offsets[c + 1]] for c in lists])
+            scores = self.embeddings[rows] @ query
+            if len(rows) > size:
+                top = np.argpartition(-scores, size - 1)[:size]
+                rows, scores = rows[top], scores[top]
+            return rows[np.argsort(-scores, kind="stable")]
+
+    def embed_query(self, job_requirements: Dict[str, Any]) -> np.ndarray:
+        """LSA embedding of job requirements, in the space of the candidate embeddings"""
+        texts = requirement_section_texts(job_requirements)
+        skill_weights = self.matcher.skill_weights(job_requirements, self.skill_width)
+        vectors = {
+            "skills_match": sparse.csr_matrix(
+                skill_weights.reshape(1, -1) if skill_weights is not None else (1, self.skill_width),
+                dtype=np.float32
+            )
+        }
+        for category, text in texts.items():
+            if category != "skills_match":
+                # Empty requirements score every candidate alike, so they add nothing
+                vectors[category] = self.matcher.vectorizer.transform([text])
+        vector = self._weighted(vectors)
+        # Project only the nonzero entries that fall in columns the pool uses
+        positions = np.searchsorted(self.columns, vector.indices)
+        known = positions < len(self.columns)
+        known[known] = self.columns[positions[known]] == vector.indices[known]
+        return self.components[:, positions[known]] @ vector.data[known].astype(np.float32)
+
+    def save(self, path: Optional[str] = None):
+        """Write the index (not the candidate pool) to disk"""
+        path = path or Config.ANN_PATH
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        state = {key: value for key, value in self.__dict__.items() if key not in ("matcher", "resumes")}
+        tmp_path = path + ".tmp"
+        joblib.dump({"version": FORMAT_VERSION, "state": state}, tmp_path)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def load(resumes: Sequence[Dict[str, Any]], path: Optional[str] = None,
+             matcher: Optional[ResumeMatcher] = None) -> "AnnRetriever":
+        """Load an index saved by save() for the same candidate pool, in the same order"""
+        path = path or Config.ANN_PATH
+        data = joblib.load(path)
+        if data.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported ANN index format in {path}")
+        retriever = AnnRetriever(matcher)
+        retriever.__dict__.update(data["state"])
+        if retriever.embeddings is not None and len(retriever.embeddings) != len(resumes):
+            raise ValueError("The candidate pool does not match the saved index")
+        retriever.resumes = resumes
+        return retriever
+
+    @staticmethod
+    def _weighted(vectors: Dict[str, sparse.spmatrix]) -> sparse.csr_matrix:
+        """Section vectors side by side, scaled so the inner product is the weighted sum of section scores"""
+        weights = Config.MATCHING_WEIGHTS
+        return sparse.hstack(
+            [vectors[category] * math.sqrt(weights[category]) for category in SECTIONS], format="csr"
+        )
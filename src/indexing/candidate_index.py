@@ -0,0 +1,371 @@
+from typing import Dict, Any, List, Optional
+import json
+import os
+import shutil
+import threading
+import numpy as np
+from scipy import sparse
+
+from config.config import Config
+from matching.matcher import SECTIONS, ResumeMatcher, requirement_section_texts
+
+MANIFEST_FILE = "manifest.json"
+FORMAT_VERSION = 2
+SEGMENT_PREFIX = "seg-"
+
+class _Segment:
+    """Immutable, memory-mapped block of indexed candidates"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+        with open(os.path.join(path, "ids.json"), "r", encoding="utf-8") as f:
+            self.ids = json.load(f)
+        self.offsets = np.load(os.path.join(path, "offsets.npy"), mmap_mode="r")
+        # One handle for every record read; seek + readline must not interleave
+        self._records = open(os.path.join(path, "records.jsonl"), "rb")
+        self._records_lock = threading.Lock()
+
+        # Per-section inverted postings: sorted feature ids -> (rows, weights)
+        self.postings = {}
+        for category in SECTIONS:
+            self.postings[category] = tuple(
+                np.load(os.path.join(path, f"{category}.{part}.npy"), mmap_mode="r")
+                for part in ("terms", "indptr", "rows", "weights")
+            )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def similarities(self, category: str, query: sparse.csr_matrix) -> np.ndarray:
+        """Dot product of every row in the segment with a normalized query vector"""
+        terms, indptr, rows, weights = self.postings[category]
+        if not len(terms):
+            return np.zeros(len(self.ids))
+
+        # Only the postings of the query's features are touched
+        positions = np.minimum(np.searchsorted(terms, query.indices), len(terms) - 1)
+        hits = terms[positions] == query.indices
+        slices = [
+            (rows[indptr[p]:indptr[p + 1]], weights[indptr[p]:indptr[p + 1]] * w)
+            for p, w in zip(positions[hits], query.data[hits])
+        ]
+        if not slices:
+            return np.zeros(len(self.ids))
+        return np.bincount(
+            np.concatenate([hit_rows for hit_rows, _ in slices]),
+            weights=np.concatenate([hit_weights for _, hit_weights in slices]),
+            minlength=len(self.ids)
+        )
+
+    def record(self, row: int) -> Dict[str, Any]:
+        """Read the stored sections of one row"""
+        with self._records_lock:
+            self._records.seek(int(self.offsets[row]))
+            line = self._records.readline()
+        return json.loads(line)
+
+    def close(self):
+        self._records.close()
+
+    @staticmethod
+    def write(path: str, ids: List[str], records: List[Dict[str, Any]],
+              vectors: Dict[str, sparse.csr_matrix]):
+        """Write a new segment directory
+
+        Files go to a temporary directory that is renamed into place, so a
+        crash never leaves a partial segment under the final name.
+        """
+        final_path = path
+        path = final_path + ".tmp"
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+        with open(os.path.join(path, "ids.json"), "w", encoding="utf-8") as f:
+            json.dump(ids, f)
+
+        offsets = []
+        with open(os.path.join(path, "records.jsonl"), "wb") as f:
+            for record in records:
+                offsets.append(f.tell())
+                f.write(json.dumps(record).encode("utf-8") + b"\n")
+        np.save(os.path.join(path, "offsets.npy"), np.asarray(offsets, dtype=np.int64))
+
+        for category, matrix in vectors.items():
+            # Column-major layout turns the matrix into postings lists per feature
+            csc = sparse.csc_matrix(matrix)
+            csc.sum_duplicates()
+            terms = np.flatnonzero(np.diff(csc.indptr))
+            indptr = np.concatenate(([0], np.cumsum(np.diff(csc.indptr)[terms])))
+            parts = {
+                "terms": terms.astype(np.int32),
+                "indptr": indptr.astype(np.int64),
+                "rows": csc.indices.astype(np.int32),
+                "weights": csc.data.astype(np.float32)
+            }
+            for part, array in parts.items():
+                np.save(os.path.join(path, f"{category}.{part}.npy"), array)
+        os.replace(path, final_path)
+
+class CandidateIndex:
+    """Persistent candidate index with incremental insert/delete and compaction
+
+    Candidates are stored in immutable segments of the same section vectors
+    ResumeMatcher scores (corpus-vectorized experience and education, binary
+    skill IDs), kept as inverted postings and loaded via memory mapping, so
+    query() ranks exactly like rank_candidates. New candidates are buffered
+    in memory until flushed into a new segment; deletions are recorded as
+    tombstones until the next compaction.
+    """
+
+    def __init__(self, path: Optional[str] = None, matcher: Optional[ResumeMatcher] = None):
+        self.path = path or Config.INDEX_DIR
+        self.matcher = matcher or ResumeMatcher()
+        self.flush_threshold = Config.INDEX_FLUSH_THRESHOLD
+        self.max_segments = Config.INDEX_MAX_SEGMENTS
+        self.max_deleted_ratio = Config.INDEX_MAX_DELETED_RATIO
+        self._lock = threading.RLock()
+
+        # Stored vectors are only valid for the vectorizer and skill IDs that produced them
+        self.fingerprints = {
+            "vectorizer": self.matcher.vectorizer.fingerprint(),
+            "taxonomy": self.matcher.taxonomy.fingerprint()
+        }
+
+        os.makedirs(self.path, exist_ok=True)
+        manifest = self._read_manifest()
+        if manifest:
+            if manifest["fingerprints"] != self.fingerprints:
+                raise ValueError("The index was built with a different vectorizer or skill taxonomy; rebuild it")
+            self._next_segment = manifest["next_segment"]
+            self._deleted = {name: set(rows) for name, rows in manifest["deleted"].items()}
+            self._segments = [_Segment(os.path.join(self.path, name)) for name in manifest["segments"]]
+        else:
+            self._next_segment = 0
+            self._deleted = {}
+            self._segments = []
+        self._remove_orphans()
+
+        # candidate id -> (segment name, row) for every live stored candidate
+        self._locations = {}
+        for segment in self._segments:
+            deleted = self._deleted.get(segment.name, set())
+            for row, candidate_id in enumerate(segment.ids):
+                if row not in deleted:
+                    self._locations[candidate_id] = (segment.name, row)
+
+        # Unflushed candidates: id -> stored sections
+        self._buffer = {}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._locations) + len(self._buffer)
+
+    def __contains__(self, candidate_id: str) -> bool:
+        with self._lock:
+            return candidate_id in self._buffer or candidate_id in self._locations
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+    def add(self, candidate_id: str, resume_data: Dict[str, Any]):
+        """Insert or replace a candidate from parsed resume data"""
+        record = {key: value for key, value in resume_data.items() if key != "raw_text"}
+        if not record.get("canonical_skills"):
+            # raw_text is not stored, so keep the skills the matcher would find in it
+            record["canonical_skills"] = self.matcher.taxonomy.canonical_names(resume_data.get("raw_text") or "")
+        with self._lock:
+            self._delete_stored(candidate_id)
+            self._buffer[candidate_id] = record
+            if len(self._buffer) >= self.flush_threshold:
+                self.flush()
+
+    def remove(self, candidate_id: str) -> bool:
+        """Delete a candidate; returns False if it was not indexed"""
+        with self._lock:
+            removed = self._buffer.pop(candidate_id, None) is not None
+            removed = self._delete_stored(candidate_id) or removed
+            if removed:
+                self._write_manifest()
+                self._maybe_compact()
+            return removed
+
+    def get(self, candidate_id: str) -> Optional[Dict[str, Any]]:
+        """Return the stored sections of a candidate"""
+        with self._lock:
+            if candidate_id in self._buffer:
+                return self._buffer[candidate_id]
+            location = self._locations.get(candidate_id)
+            if location is None:
+                return None
+            return self._segment(location[0]).record(location[1])
+
+    def flush(self):
+        """Write buffered candidates to a new segment"""
+        with self._lock:
+            if not self._buffer:
+                return
+            ids = list(self._buffer)
+            records = [self._buffer[candidate_id] for candidate_id in ids]
+            segment = self._write_segment(ids, records)
+            for row, candidate_id in enumerate(ids):
+                self._locations[candidate_id] = (segment.name, row)
+            self._buffer = {}
+            self._write_manifest()
+            self._maybe_compact()
+
+    def compact(self):
+        """Merge all segments into one, dropping deleted rows"""
+        with self._lock:
+            self.flush()
+            if len(self._segments) <= 1 and not any(self._deleted.values()):
+                return
+
+            ids, records = [], []
+            for segment in self._segments:
+                deleted = self._deleted.get(segment.name, set())
+                for row, candidate_id in enumerate(segment.ids):
+                    if row not in deleted:
+                        ids.append(candidate_id)
+                        records.append(segment.record(row))
+
+            old_segments = self._segments
+            self._segments = []
+            self._deleted = {}
+            self._locations = {}
+            if ids:
+                segment = self._write_segment(ids, records)
+                for row, candidate_id in enumerate(ids):
+                    self._locations[candidate_id] = (segment.name, row)
+            self._write_manifest()
+
+            for segment in old_segments:
+                segment.close()
+                shutil.rmtree(segment.path, ignore_errors=True)
+
+    def query(self, job_requirements: Dict[str, Any], top_k: int = 10) -> List[Dict[str, Any]]:
+        """Rank indexed candidates against job requirements, scored as ResumeMatcher.rank_candidates does"""
+        queries = self._queries(job_requirements)
+        weights = Config.MATCHING_WEIGHTS
+
+        with self._lock:
+            candidates = []
+            for ids, section_scores, live in self._score_blocks(queries):
+                overall = sum(section_scores[category] * weights[category] for category in SECTIONS)
+                overall = np.where(live, overall, -np.inf)
+                k = min(top_k, int(live.sum()))
+                if k <= 0:
+                    continue
+                top = np.argpartition(-overall, k - 1)[:k]
+                for i in top:
+                    candidates.append({
+                        "candidate_id": ids[i],
+                        **{category: float(section_scores[category][i]) for category in SECTIONS},
+                        "overall_match": float(overall[i])
+                    })
+
+        candidates.sort(key=lambda candidate: candidate["overall_match"], reverse=True)
+        return candidates[:top_k]
+
+    def _queries(self, job_requirements: Dict[str, Any]) -> Dict[str, Optional[sparse.csr_matrix]]:
+        """Per-section query row whose dot product with a stored row is that section's score
+
+        None means every candidate scores 1.0 (nothing is required).
+        """
+        job_requirements = self.matcher._ensure_required_keys(dict(job_requirements))
+        skill_weights = self.matcher.skill_weights(job_requirements, len(self.matcher.taxonomy))
+        queries = {
+            "skills_match": sparse.csr_matrix(skill_weights.reshape(1, -1)) if skill_weights is not None else None
+        }
+        for category, text in requirement_section_texts(job_requirements).items():
+            if category != "skills_match":
+                queries[category] = self.matcher.vectorizer.transform([text]) if text else None
+        return queries
+
+    def _score_blocks(self, queries: Dict[str, Optional[sparse.csr_matrix]]):
+        """Yield (ids, per-section scores, live mask) for each segment and the buffer"""
+        for segment in self._segments:
+            live = np.ones(len(segment), dtype=bool)
+            deleted = self._deleted.get(segment.name)
+            if deleted:
+                live[list(deleted)] = False
+            section_scores = {
+                category: segment.similarities(category, query) if query is not None else np.ones(len(segment))
+                for category, query in queries.items()
+            }
+            yield segment.ids, section_scores, live
+
+        if self._buffer:
+            ids = list(self._buffer)
+            vectors = self._vectorize([self._buffer[candidate_id] for candidate_id in ids])
+            section_scores = {
+                category: (vectors[category] @ query.T).toarray().ravel() if query is not None else np.ones(len(ids))
+                for category, query in queries.items()
+            }
+            yield ids, section_scores, np.ones(len(ids), dtype=bool)
+
+    def _vectorize(self, records: List[Dict[str, Any]]) -> Dict[str, sparse.csr_matrix]:
+        """Section vectors of a batch of records, as the matcher builds them"""
+        return self.matcher.vectorize_resumes(records)
+
+    def _write_segment(self, ids: List[str], records: List[Dict[str, Any]]) -> _Segment:
+        name = f"{SEGMENT_PREFIX}{self._next_segment:06d}"
+        self._next_segment += 1
+        path = os.path.join(self.path, name)
+        _Segment.write(path, ids, records, self._vectorize(records))
+        segment = _Segment(path)
+        self._segments.append(segment)
+        return segment
+
+    def _segment(self, name: str) -> _Segment:
+        return next(segment for segment in self._segments if segment.name == name)
+
+    def _delete_stored(self, candidate_id: str) -> bool:
+        """Tombstone a flushed candidate"""
+        location = self._locations.pop(candidate_id, None)
+        if location is None:
+            return False
+        self._deleted.setdefault(location[0], set()).add(location[1])
+        return True
+
+    def _remove_orphans(self):
+        """Delete segment directories the manifest does not list, left by a crash mid-write"""
+        listed = {segment.name for segment in self._segments}
+        for name in os.listdir(self.path):
+            if name.startswith(SEGMENT_PREFIX) and name not in listed:
+                shutil.rmtree(os.path.join(self.path, name), ignore_errors=True)
+
+    def _maybe_compact(self):
+        """Compact when segments pile up or too many rows are tombstoned"""
+        stored = sum(len(segment) for segment in self._segments)
+        deleted = sum(len(rows) for rows in self._deleted.values())
+        if len(self._segments) > self.max_segments or (
+                stored and deleted / stored > self.max_deleted_ratio):
+            self.compact()
+
+    def _read_manifest(self) -> Optional[Dict[str, Any]]:
+        manifest_path = os.path.join(self.path, MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            return None
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported index format version: {manifest.get('version')}")
+        return manifest
+
+    def _write_manifest(self):
+        """Atomically replace the manifest"""
+        manifest = {
+            "version": FORMAT_VERSION,
+            "fingerprints": self.fingerprints,
+            "next_segment": self._next_segment,
+            "segments": [segment.name for segment in self._segments],
+            "deleted": {name: sorted(rows) for name, rows in self._deleted.items() if rows}
+        }
+        manifest_path = os.path.join(self.path, MANIFEST_FILE)
+        tmp_path = manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, manifest_path)
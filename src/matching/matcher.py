@@ -1,11 +1,52 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Union
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.feature_extraction.text import TfidfVectorizer
+from scipy import sparse
+
+from config.config import Config
+from matching.skills import get_taxonomy, skill_match
+from matching.vectorizer import CorpusVectorizer, get_vectorizer
+from utils.metrics import metrics
+
+# Resume section and job requirement feeding each score category
+SECTIONS = {
+    "skills_match": ("skills", "required_skills"),
+    "experience_match": ("experience", "required_experience"),
+    "education_match": ("education", "required_education")
+}
+
+def section_text(value: Union[List[Any], Dict[str, str], str, None]) -> str:
+    """Flatten a parsed section (list of strings/``{"text": ...}`` items or a description dict) to text"""
+    if not value:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return value.get("description", "")
+    return " ".join(
+        item.get("text", "") if isinstance(item, dict) else str(item)
+        for item in value
+    )
+
+def resume_section_texts(resume_data: Dict[str, Any]) -> Dict[str, str]:
+    """Return the resume text compared in each score category"""
+    return {
+        category: section_text(resume_data.get(resume_key))
+        for category, (resume_key, _) in SECTIONS.items()
+    }
+
+def requirement_section_texts(job_requirements: Dict[str, Any]) -> Dict[str, str]:
+    """Return the job requirement text compared in each score category"""
+    return {
+        category: section_text(job_requirements.get(job_key))
+        for category, (_, job_key) in SECTIONS.items()
+    }
 
 class ResumeMatcher:
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer(stop_words='english')
+    def __init__(self, vectorizer: Optional[CorpusVectorizer] = None):
+        # Fitted once on the corpus (or stateless hashing) and shared by every matcher; matching only transforms
+        self.vectorizer = vectorizer or get_vectorizer()
+        # Skills are compared as sets of canonical skill IDs, not as text
+        self.taxonomy = get_taxonomy()
         
     def calculate_match_score(self, resume_data: Dict[str, Any], job_requirements: Dict[str, Any]) -> Dict[str, float]:
         """Calculate match scores between resume and job requirements"""
@@ -14,8 +55,9 @@ class ResumeMatcher:
         
         scores = {
             "skills_match": self._calculate_skills_match(
-                resume_data.get("skills", []),
-                job_requirements.get("required_skills", [])
+                self.taxonomy.resume_ids(resume_data),
+                job_requirements.get("required_skills", []),
+                job_requirements.get("nice_to_have_skills", [])
             ),
             "experience_match": self._calculate_experience_match(
                 resume_data.get("experience", []),
@@ -28,11 +70,7 @@ class ResumeMatcher:
         }
         
         # Calculate overall score with weights
-        weights = {
-            "skills_match": 0.5,
-            "experience_match": 0.3,
-            "education_match": 0.2
-        }
+        weights = Config.MATCHING_WEIGHTS
         
         scores["overall_match"] = sum(
             scores[category] * weights[category]
@@ -41,6 +79,104 @@ class ResumeMatcher:
         
         return scores
         
+    @metrics.timed("matcher.rank_candidates")
+    def rank_candidates(self, job_requirements: Dict[str, Any], resumes: List[Dict[str, Any]],
+                        top_k: int = 10) -> List[Dict[str, Any]]:
+        """Score one job against many resumes in a single vectorized pass and return the top-k"""
+        if not resumes or top_k <= 0:
+            return []
+            
+        return self.rank_vectors(job_requirements, self.vectorize_resumes(resumes), top_k)
+        
+    def vectorize_resumes(self, resumes: List[Dict[str, Any]]) -> Dict[str, sparse.csr_matrix]:
+        """Normalized section vectors of many resumes, reusable across jobs"""
+        resume_texts = [resume_section_texts(resume) for resume in resumes]
+        vectors = {
+            category: self.vectorizer.transform([texts[category] for texts in resume_texts])
+            for category in SECTIONS if category != "skills_match"
+        }
+        
+        # One binary row of skill IDs per resume
+        skill_ids = [self.taxonomy.resume_ids(resume) for resume in resumes]
+        indptr = np.cumsum([0] + [len(ids) for ids in skill_ids])
+        indices = np.concatenate(skill_ids) if skill_ids else np.zeros(0, dtype=np.int32)
+        vectors["skills_match"] = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), indices, indptr),
+            shape=(len(resumes), len(self.taxonomy))
+        )
+        return vectors
+        
+    def rank_vectors(self, job_requirements: Dict[str, Any], resume_vectors: Dict[str, sparse.csr_matrix],
+                     top_k: int = 10) -> List[Dict[str, Any]]:
+        """Rank precomputed resume vectors (see vectorize_resumes) against one job"""
+        count = next(iter(resume_vectors.values())).shape[0]
+        if not count or top_k <= 0:
+            return []
+            
+        job_requirements = self._ensure_required_keys(job_requirements)
+        requirement_texts = requirement_section_texts(job_requirements)
+        
+        # One sparse matrix-vector product per section
+        scores = {"skills_match": self._skill_scores(resume_vectors["skills_match"], job_requirements)}
+        for category, required_text in requirement_texts.items():
+            if category == "skills_match":
+                continue
+            if not required_text:
+                scores[category] = np.ones(count)
+                continue
+            job_vector = self.vectorizer.transform([required_text])
+            scores[category] = np.asarray(
+                (resume_vectors[category] @ job_vector.T).toarray(), dtype=np.float64
+            ).ravel()
+            
+        weights = Config.MATCHING_WEIGHTS
+        overall = sum(scores[category] * weights[category] for category in scores)
+        
+        # Partial selection of the top-k, then sort only those
+        k = min(top_k, count)
+        top = np.argpartition(-overall, k - 1)[:k]
+        top = top[np.argsort(-overall[top], kind="stable")]
+        
+        return [
+            {
+                "index": int(i),
+                **{category: float(scores[category][i]) for category in scores},
+                "overall_match": float(overall[i])
+            }
+            for i in top
+        ]
+        
+    def _skill_scores(self, skill_matrix: sparse.csr_matrix, job_requirements: Dict[str, Any]) -> np.ndarray:
+        """skill_match for every row of a binary resume x skill-ID matrix at once"""
+        skill_weights = self.skill_weights(job_requirements, skill_matrix.shape[1])
+        if skill_weights is None:
+            return np.ones(skill_matrix.shape[0])
+        return np.asarray(skill_matrix @ skill_weights).ravel()
+        
+    def skill_weights(self, job_requirements: Dict[str, Any], width: int) -> Optional[np.ndarray]:
+        """Per-skill-ID weights whose dot product with a binary skill row is its skill_match
+
+        None when the job requires no skills (every resume scores 1.0).
+        """
+        required_ids = self.taxonomy.ids(job_requirements.get("required_skills") or [])
+        if not len(required_ids):
+            return None
+        nice_ids = np.setdiff1d(self.taxonomy.ids(job_requirements.get("nice_to_have_skills") or []),
+                                required_ids, assume_unique=True)
+        
+        weights = Config.SKILL_MATCH_WEIGHTS
+        total = weights["required"] * len(required_ids) + weights["nice_to_have"] * len(nice_ids)
+        skill_weights = np.zeros(width)
+        # Skills first seen in this job cannot be on any resume row
+        skill_weights[required_ids[required_ids < width]] = weights["required"] / total
+        skill_weights[nice_ids[nice_ids < width]] = weights["nice_to_have"] / total
+        return skill_weights
+        
+    def _similarity(self, text: str, required_text: str) -> float:
+        """Cosine similarity of two texts as a dot product of normalized vectors"""
+        vectors = self.vectorizer.transform([text, required_text])
+        return float(vectors[0].multiply(vectors[1]).sum())
+        
     def _ensure_required_keys(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Ensure all required keys exist in the dictionary"""
         required_keys = {
@@ -56,54 +192,45 @@ class ResumeMatcher:
                 
         return data
         
-    def _calculate_skills_match(self, resume_skills: List[str], required_skills: List[str]) -> float:
+    @metrics.timed("matcher.skills_match")
+    def _calculate_skills_match(self, resume_skills: Union[List[str], np.ndarray], required_skills: List[str],
+                                nice_to_have_skills: Optional[List[str]] = None) -> float:
         """Calculate skills match percentage"""
         if not required_skills:
             return 1.0
             
-        resume_skills_text = " ".join(resume_skills)
-        required_skills_text = " ".join(required_skills)
-        
-        # Vectorize skills
-        vectors = self.vectorizer.fit_transform([resume_skills_text, required_skills_text])
-        
-        # Calculate cosine similarity
-        similarity = cosine_similarity(vectors[0:1], vectors[1:2])[0][0]
-        
-        return float(similarity)
+        # Aliases ("JS", "sklearn") resolve to the same canonical skill ID
+        required_ids = self.taxonomy.ids(required_skills)
+        if not len(required_ids):
+            return 1.0
+        if not isinstance(resume_skills, np.ndarray):
+            resume_skills = self.taxonomy.ids(resume_skills)
+        return skill_match(resume_skills, required_ids, self.taxonomy.ids(nice_to_have_skills or []))
         
-    def _calculate_experience_match(self, resume_experience: List[str], 
+    @metrics.timed("matcher.experience_match")
+    def _calculate_experience_match(self, resume_experience: List[Any], 
                                   required_experience: Dict[str, str]) -> float:
         """Calculate experience match percentage"""
         if not required_experience.get("description"):
             return 1.0
             
         # Extract experience text
-        experience_text = " ".join(resume_experience)
+        experience_text = section_text(resume_experience)
         required_experience_text = required_experience.get("description", "")
         
-        # Vectorize experience
-        vectors = self.vectorizer.fit_transform([experience_text, required_experience_text])
-        
-        # Calculate cosine similarity
-        similarity = cosine_similarity(vectors[0:1], vectors[1:2])[0][0]
-        
-        return float(similarity)
+        # Cosine similarity of the normalized vectors
+        return self._similarity(experience_text, required_experience_text)
         
-    def _calculate_education_match(self, resume_education: List[str], 
+    @metrics.timed("matcher.education_match")
+    def _calculate_education_match(self, resume_education: List[Any], 
                                  required_education: Dict[str, str]) -> float:
         """Calculate education match percentage"""
         if not required_education.get("description"):
             return 1.0
             
         # Extract education text
-        education_text = " ".join(resume_education)
+        education_text = section_text(resume_education)
         required_education_text = required_education.get("description", "")
         
-        # Vectorize education
-        vectors = self.vectorizer.fit_transform([education_text, required_education_text])
-        
-        # Calculate cosine similarity
-        similarity = cosine_similarity(vectors[0:1], vectors[1:2])[0][0]
-        
-        return float(similarity) 
\ No newline at end of file
+        # Cosine similarity of the normalized vectors
+        return self._similarity(education_text, required_education_text) 
\ No newline at end of file
@@ -0,0 +1,255 @@
+from typing import Dict, Any, Iterable, List, Optional
+import json
+import re
+import threading
+import zlib
+import numpy as np
+
+from config.config import Config
+from utils.cache import make_key
+
+# Canonical skill name -> aliases (matched case-insensitively)
+DEFAULT_TAXONOMY = {
+    "Python": ["python3", "py"],
+    "Java": ["jdk", "java se", "java ee"],
+    "JavaScript": ["js", "ecmascript", "es6", "vanilla js"],
+    "TypeScript": ["ts"],
+    "Go": ["golang"],
+    "Rust": ["rustlang"],
+    "C": ["ansi c"],
+    "C++": ["cpp", "c plus plus"],
+    "C#": ["csharp", "c sharp"],
+    ".NET": ["dotnet", "dot net", "asp.net", ".net core"],
+    "Ruby": ["ruby on rails", "rails", "ror"],
+    "PHP": ["laravel"],
+    "Scala": [],
+    "Kotlin": [],
+    "Swift": [],
+    "R": ["r language", "rstats"],
+    "MATLAB": [],
+    "Bash": ["shell scripting", "shell", "sh"],
+    "SQL": ["t-sql", "pl/sql", "structured query language"],
+    "PostgreSQL": ["postgres", "psql", "postgre"],
+    "MySQL": ["mariadb"],
+    "MongoDB": ["mongo"],
+    "Redis": [],
+    "Elasticsearch": ["elastic search", "elk"],
+    "Cassandra": [],
+    "Kafka": ["apache kafka"],
+    "Spark": ["apache spark", "pyspark"],
+    "Hadoop": ["hdfs", "mapreduce"],
+    "Airflow": ["apache airflow"],
+    "Snowflake": [],
+    "Docker": ["containers", "containerization"],
+    "Kubernetes": ["k8s", "kube"],
+    "Terraform": [],
+    "Ansible": [],
+    "Jenkins": [],
+    "CI/CD": ["ci cd", "continuous integration", "continuous delivery", "continuous deployment"],
+    "AWS": ["amazon web services", "ec2", "s3", "aws lambda"],
+    "GCP": ["google cloud", "google cloud platform"],
+    "Azure": ["microsoft azure"],
+    "Linux": ["unix", "ubuntu", "debian", "centos"],
+    "Git": ["github", "gitlab", "version control"],
+    "React": ["react.js", "reactjs", "react js"],
+    "Angular": ["angularjs", "angular.js"],
+    "Vue": ["vue.js", "vuejs"],
+    "Node.js": ["node", "nodejs", "node js"],
+    "HTML": ["html5"],
+    "CSS": ["css3", "sass", "scss"],
+    "Django": [],
+    "Flask": [],
+    "FastAPI": ["fast api"],
+    "Spring": ["spring boot", "springboot"],
+    "GraphQL": [],
+    "REST": ["rest api", "restful", "rest apis", "restful apis"],
+    "Microservices": ["microservice", "micro services"],
+    "pandas": [],
+    "NumPy": ["numpy"],
+    "scikit-learn": ["sklearn", "scikit learn", "scikit"],
+    "PyTorch": ["torch"],
+    "TensorFlow": ["tf", "keras"],
+    "NLP": ["natural language processing"],
+    "Computer Vision": ["cv", "image recognition"],
+    "Machine Learning": ["ml"],
+    "Deep Learning": ["dl", "neural networks"],
+    "Statistics": ["statistical analysis", "statistical modeling"],
+    "Data Analysis": ["data analytics"],
+    "Tableau": [],
+    "Power BI": ["powerbi"],
+    "Excel": ["microsoft excel", "ms excel"],
+    "Agile": ["agile methodologies"],
+    "Scrum": [],
+    "Communication": ["communication skills"],
+    "Leadership": ["team leadership"],
+    "Mentoring": ["mentorship", "coaching"],
+    "Project Management": ["project manager", "pmp"]
+}
+
+# Aliases that are ordinary words or letters in running text; they only
+# count when a skill list names them explicitly, never when scanning text
+TEXT_SCAN_EXCLUDED = {
+    "go", "c", "r", "rust", "swift", "spring", "shell", "sh", "node", "containers",
+    "rest", "ts", "tf", "cv", "ml", "dl", "py", "excel", "communication", "leadership",
+    "mentoring", "coaching", "statistics", "agile", "kube", "elk", "scikit"
+}
+
+def normalize_skill(skill: str) -> str:
+    """Lowercase, collapse whitespace and trim surrounding punctuation"""
+    skill = re.sub(r"\s+", " ", skill.lower()).strip()
+    return skill.strip(" ,;:()[]-*•").rstrip(".")
+
+# Whole words only: "Java" must not match inside "JavaScript", nor "C" inside "C++"
+_WORD_START = r"(?<![^\W_])(?<![+#])"
+_WORD_END = r"(?![^\W_])(?![+#])"
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Regex alternation of words, factored by common prefix so matching does not try each word in turn"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node: Dict[str, Dict]) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # A word ending here makes the rest optional; the regex engine tries the longer match first
+        return f"(?:{pattern})?" if "" in node else pattern
+
+    return emit(trie)
+
+class SkillTaxonomy:
+    """Canonical skills with integer IDs and one compiled regex over their aliases
+
+    IDs ``0 .. canonical_count - 1`` are the canonical skills. A skill that is
+    not in the taxonomy gets an ID hashed from its normalized name into the
+    next ``UNKNOWN_SKILL_BUCKETS`` IDs, so it still matches the same skill
+    elsewhere (in any process) without the shared taxonomy growing with
+    every skill string users send.
+    """
+
+    UNKNOWN_SKILL_BUCKETS = 2 ** 16
+
+    def __init__(self, taxonomy: Optional[Dict[str, List[str]]] = None):
+        taxonomy = taxonomy if taxonomy is not None else DEFAULT_TAXONOMY
+        self.names = list(taxonomy)
+        self._ids = {}
+        for skill_id, (name, aliases) in enumerate(taxonomy.items()):
+            for alias in [name] + list(aliases):
+                self._ids.setdefault(normalize_skill(alias), skill_id)
+        self.canonical_count = len(self.names)
+        scannable = [alias for alias in self._ids if alias not in TEXT_SCAN_EXCLUDED]
+        self._pattern = re.compile(_WORD_START + "(?:" + _trie_pattern(scannable) + ")" + _WORD_END,
+                                   re.IGNORECASE)
+        # The regex reports the longest alias at a position; aliases nested in it
+        # ("js" in "node.js") are whole words too, so each match counts them as well
+        self._match_ids = {
+            alias: sorted({self._ids[alias]} | {
+                self._ids[inner] for inner in scannable
+                if inner != alias and re.search(_WORD_START + re.escape(inner) + _WORD_END, alias)
+            })
+            for alias in scannable
+        }
+
+    def __len__(self) -> int:
+        """Width of the skill ID space, unknown-skill buckets included"""
+        return self.canonical_count + self.UNKNOWN_SKILL_BUCKETS
+
+    def fingerprint(self) -> str:
+        """Hash of the skill ID assignment, e.g. to detect stale stored skill IDs"""
+        return make_key(sorted(self._ids.items()), self.UNKNOWN_SKILL_BUCKETS)
+
+    def extract(self, text: str) -> np.ndarray:
+        """Sorted unique IDs of the taxonomy skills mentioned in text, in one regex pass"""
+        found = set()
+        for match in self._pattern.finditer(text):
+            found.update(self._match_ids.get(match.group().lower(), ()))
+        return np.array(sorted(found), dtype=np.int32)
+
+    def skill_id(self, skill: str, unknown: bool = True) -> Optional[int]:
+        """ID of one skill name; unknown skills get a hashed ID when unknown is set"""
+        key = normalize_skill(skill)
+        if not key:
+            return None
+        skill_id = self._ids.get(key)
+        if skill_id is None and unknown:
+            bucket = zlib.crc32(key.encode("utf-8")) % self.UNKNOWN_SKILL_BUCKETS
+            skill_id = self.canonical_count + bucket
+        return skill_id
+
+    def ids(self, skills: Iterable[str], unknown: bool = True) -> np.ndarray:
+        """Sorted unique IDs of a skill list
+
+        Each item is looked up as a whole first; otherwise the taxonomy skills
+        it mentions are used (e.g. "Python and Django"), and only if there are
+        none is it treated as one unknown skill.
+        """
+        found = set()
+        for skill in skills:
+            if not isinstance(skill, str):
+                continue
+            skill_id = self.skill_id(skill, unknown=False)
+            if skill_id is not None:
+                found.add(skill_id)
+                continue
+            mentioned = self.extract(skill)
+            if len(mentioned):
+                found.update(mentioned.tolist())
+                continue
+            skill_id = self.skill_id(skill, unknown=unknown)
+            if skill_id is not None:
+                found.add(skill_id)
+        return np.array(sorted(found), dtype=np.int32)
+
+    def canonical_names(self, text: str) -> List[str]:
+        """Canonical names of the taxonomy skills mentioned in text"""
+        return [self.names[skill_id] for skill_id in self.extract(text)]
+
+    def resume_ids(self, resume_data: Dict[str, Any]) -> np.ndarray:
+        """Skill IDs of a parsed resume: its skills list plus skills found in the full text
+
+        A non-empty canonical_skills (the parser's scan of the text) is used
+        instead of scanning raw_text again. An empty or missing one, as in
+        records built from older dicts, falls back to the scan.
+        """
+        skills = list(resume_data.get("skills") or [])
+        canonical_skills = resume_data.get("canonical_skills")
+        if canonical_skills:
+            return self.ids(skills + list(canonical_skills))
+        return np.union1d(self.ids(skills), self.extract(resume_data.get("raw_text") or ""))
+
+def skill_match(resume_ids: np.ndarray, required_ids: np.ndarray, nice_ids: np.ndarray) -> float:
+    """Weighted share of the required and nice-to-have skills the resume covers"""
+    weights = Config.SKILL_MATCH_WEIGHTS
+    nice_ids = np.setdiff1d(nice_ids, required_ids, assume_unique=True)
+    total = weights["required"] * len(required_ids) + weights["nice_to_have"] * len(nice_ids)
+    if not total:
+        return 1.0
+    hits = (
+        weights["required"] * len(np.intersect1d(resume_ids, required_ids, assume_unique=True)) +
+        weights["nice_to_have"] * len(np.intersect1d(resume_ids, nice_ids, assume_unique=True))
+    )
+    return float(hits / total)
+
+_taxonomy = None
+_taxonomy_lock = threading.Lock()
+
+def get_taxonomy() -> SkillTaxonomy:
+    """Process-wide taxonomy, extended from Config.SKILL_TAXONOMY_PATH when set"""
+    global _taxonomy
+    with _taxonomy_lock:
+        if _taxonomy is None:
+            taxonomy = dict(DEFAULT_TAXONOMY)
+            if Config.SKILL_TAXONOMY_PATH:
+                try:
+                    with open(Config.SKILL_TAXONOMY_PATH, "r", encoding="utf-8") as f:
+                        for name, aliases in json.load(f).items():
+                            taxonomy[name] = list(taxonomy.get(name, [])) + list(aliases)
+                except (OSError, ValueError) as e:
+                    print(f"Error loading skill taxonomy: {str(e)}")
+            _taxonomy = SkillTaxonomy(taxonomy)
+        return _taxonomy
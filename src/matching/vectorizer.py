@@ -0,0 +1,116 @@
+from typing import Iterable, List, Optional
+import os
+import threading
+import numpy as np
+import joblib
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+
+from config.config import Config
+from utils.cache import make_key
+
+FORMAT_VERSION = 1
+
+class CorpusVectorizer:
+    """Text vectorizer fitted once on the resume/job corpus and reused for every match
+
+    ``kind="tfidf"`` learns a compact vocabulary and IDF weights from the
+    corpus; ``kind="hashing"`` needs no fitting and no vocabulary. Both return
+    L2-normalized float32 rows, so cosine similarity is a dot product.
+    """
+
+    KINDS = ("tfidf", "hashing")
+
+    def __init__(self, kind: str = "hashing", n_features: Optional[int] = None,
+                 max_features: Optional[int] = None, min_df: int = 2):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown vectorizer kind: {kind}")
+        self.kind = kind
+        if kind == "hashing":
+            self.vectorizer = HashingVectorizer(
+                n_features=n_features or Config.VECTORIZER_N_FEATURES,
+                alternate_sign=False,
+                norm="l2",
+                stop_words="english",
+                dtype=np.float32
+            )
+        else:
+            self.vectorizer = TfidfVectorizer(
+                stop_words="english",
+                max_features=max_features or Config.VECTORIZER_MAX_FEATURES,
+                min_df=min_df,
+                sublinear_tf=True,
+                dtype=np.float32
+            )
+        self.fitted = kind == "hashing"
+
+    def fit(self, texts: Iterable[str]) -> "CorpusVectorizer":
+        """Learn the vocabulary and IDF weights (no-op for hashing)"""
+        if self.kind == "tfidf":
+            documents = [text for text in texts if text]
+            # Small corpora cannot satisfy min_df
+            if len(documents) < 10:
+                self.vectorizer.set_params(min_df=1)
+            self.vectorizer.fit(documents)
+            # Only needed for introspection and large when pickled
+            self.vectorizer.stop_words_ = None
+            self.fitted = True
+        return self
+
+    def transform(self, texts: List[str]) -> sparse.csr_matrix:
+        """L2-normalized sparse rows; empty texts become zero rows"""
+        if not self.fitted:
+            raise ValueError("Vectorizer must be fitted before transform")
+        return sparse.csr_matrix(self.vectorizer.transform(texts), dtype=np.float32)
+
+    def vocabulary_size(self) -> int:
+        if self.kind == "hashing":
+            return self.vectorizer.n_features
+        return len(self.vectorizer.vocabulary_) if self.fitted else 0
+
+    def fingerprint(self) -> str:
+        """Hash of everything that determines transform output, e.g. to detect stale stored vectors"""
+        if self.kind == "hashing":
+            return make_key(self.kind, self.vectorizer.n_features)
+        if not self.fitted:
+            return make_key(self.kind, None)
+        return make_key(self.kind, sorted(self.vectorizer.vocabulary_.items()),
+                        self.vectorizer.idf_.tolist())
+
+    def save(self, path: str):
+        """Write the fitted vectorizer to disk"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = path + ".tmp"
+        joblib.dump({"version": FORMAT_VERSION, "vectorizer": self}, tmp_path, compress=3)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def load(path: str) -> "CorpusVectorizer":
+        data = joblib.load(path)
+        if data.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported vectorizer format in {path}")
+        return data["vectorizer"]
+
+    @staticmethod
+    def load_default() -> "CorpusVectorizer":
+        """The fitted vectorizer at Config.VECTORIZER_PATH, or a stateless hashing one"""
+        path = Config.VECTORIZER_PATH
+        if path and os.path.exists(path):
+            try:
+                return CorpusVectorizer.load(path)
+            except Exception as e:
+                print(f"Error loading vectorizer from {path}: {str(e)}")
+        return CorpusVectorizer("hashing")
+
+_vectorizer = None
+_vectorizer_lock = threading.Lock()
+
+def get_vectorizer() -> CorpusVectorizer:
+    """Process-wide vectorizer (see CorpusVectorizer.load_default), loaded from disk once"""
+    global _vectorizer
+    with _vectorizer_lock:
+        if _vectorizer is None:
+            _vectorizer = CorpusVectorizer.load_default()
+        return _vectorizer
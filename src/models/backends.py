@@ -0,0 +1,446 @@
+from typing import Dict, Any, Iterator, List, Optional
+from collections import OrderedDict
+import contextvars
+import copy
+import os
+import threading
+import time
+
+from config.config import Config
+from parsers.segmenter import sections_complete
+from utils.metrics import metrics
+
+class InferenceBackend:
+    """Loads a model and generates completions for LlamaModel
+
+    LlamaModel owns the prompts, caching, batching and output parsing; a
+    backend only turns prompts into completion text. Heavy libraries are
+    imported in load() so that choosing one backend never imports another.
+    """
+
+    name = "base"
+
+    def __init__(self, model_name: str, threads: Optional[int] = None):
+        self.model_name = model_name
+        # True when a substitute model was loaded instead of the requested one
+        self.fallback = False
+        self.threads = threads if threads is not None else Config.LLM_THREADS
+        self.load_timings = {}
+        # Totals across calls, for benchmarks and reports
+        self.stats = {"prompt_tokens": 0, "generated_tokens": 0, "generate_seconds": 0.0}
+
+    @property
+    def is_loaded(self) -> bool:
+        raise NotImplementedError
+
+    def load(self):
+        raise NotImplementedError
+
+    @property
+    def context_length(self) -> int:
+        """Tokens the model can attend to: prompt plus generated text"""
+        return Config.LLM_CONTEXT_LENGTH
+
+    def count_tokens(self, text: str) -> int:
+        """Prompt tokens of text; a rough characters-based estimate without a tokenizer"""
+        return len(text) // 4 + 1
+
+    def warm_up(self):
+        """Run a tiny generation so the first request does not pay one-off setup costs"""
+        raise NotImplementedError
+
+    def generate(self, prompts: List[str], sections: List[str], params: Dict[str, Any],
+                 prefix: Optional[str] = None) -> List[str]:
+        """Completions (without the prompt) for a batch of prompts
+
+        prefix is the static text every prompt starts with (the template's
+        instructions); backends may keep its KV cache to skip re-encoding it.
+        """
+        raise NotImplementedError
+
+    def stream(self, prompt: str, sections: List[str], params: Dict[str, Any],
+               prefix: Optional[str] = None) -> Iterator[str]:
+        """Yield the completion of one prompt as it is generated"""
+        raise NotImplementedError
+
+    def _record_generation(self, prompt_tokens: int, new_tokens: int, seconds: float):
+        """Record generate time, token counts and decode throughput"""
+        self.stats["prompt_tokens"] += prompt_tokens
+        self.stats["generated_tokens"] += new_tokens
+        self.stats["generate_seconds"] += seconds
+        metrics.observe("llm.generate", seconds)
+        metrics.increment("llm_prompt_tokens_total", prompt_tokens)
+        metrics.increment("llm_generated_tokens_total", new_tokens)
+        if seconds > 0:
+            metrics.set_gauge("llm_tokens_per_second", new_tokens / seconds)
+
+class TransformersBackend(InferenceBackend):
+    """Hugging Face transformers model: float16 on GPU, LLM_CPU_DTYPE on CPU"""
+
+    name = "transformers"
+
+    def __init__(self, model_name: str, threads: Optional[int] = None):
+        super().__init__(model_name, threads)
+        self.model = None
+        self.tokenizer = None
+        self.device = None
+        # Prefix text -> (token ids, past key values), most recently used last
+        self._prefix_cache = OrderedDict()
+        self._prefix_lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.model is not None and self.tokenizer is not None
+
+    def load(self):
+        """Load the model and tokenizer"""
+        # Heavy imports are deferred until a model is actually needed
+        started = time.perf_counter()
+        import torch
+        from transformers import AutoTokenizer
+        self.load_timings["imports"] = time.perf_counter() - started
+        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        if self.threads:
+            torch.set_num_threads(self.threads)
+
+        try:
+            # Load tokenizer first
+            started = time.perf_counter()
+            self.tokenizer = AutoTokenizer.from_pretrained(
+                self.model_name,
+                trust_remote_code=True
+            )
+
+            # Configure tokenizer
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+            self.tokenizer.padding_side = "left"
+            self.load_timings["tokenizer"] = time.perf_counter() - started
+
+            # Load model
+            started = time.perf_counter()
+            self.model = self._load_model(self.model_name)
+
+            # Configure model
+            self.model.config.pad_token_id = self.tokenizer.pad_token_id
+            self.load_timings["model"] = time.perf_counter() - started
+
+        except Exception as e:
+            print(f"Error loading model: {e}")
+            # Fallback to a simpler model for testing
+            started = time.perf_counter()
+            self.model_name = "gpt2"
+            self.fallback = True
+            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+            self.tokenizer.padding_side = "left"
+            self.model = self._load_model(self.model_name)
+            self.model.config.pad_token_id = self.tokenizer.pad_token_id
+            self.load_timings["fallback_model"] = time.perf_counter() - started
+        # Cached prefixes belong to the previous weights
+        self.clear_prefix_cache()
+
+    @property
+    def context_length(self) -> int:
+        # gpt2 (the fallback) has a much shorter context than Llama
+        config = self.model.config
+        positions = getattr(config, "max_position_embeddings", None) or getattr(config, "n_positions", None)
+        return min(Config.LLM_CONTEXT_LENGTH, positions or Config.LLM_CONTEXT_LENGTH)
+
+    def count_tokens(self, text: str) -> int:
+        return len(self.tokenizer(text, add_special_tokens=False)["input_ids"])
+
+    def _load_model(self, model_name: str):
+        import torch
+        from transformers import AutoModelForCausalLM
+
+        if self.device == "cuda":
+            return AutoModelForCausalLM.from_pretrained(
+                model_name,
+                torch_dtype=torch.float16,
+                device_map="auto",
+                trust_remote_code=True
+            )
+        # float16 matmuls are slow or unsupported on most CPUs
+        model = AutoModelForCausalLM.from_pretrained(
+            model_name,
+            torch_dtype=getattr(torch, Config.LLM_CPU_DTYPE),
+            low_cpu_mem_usage=True,
+            trust_remote_code=True
+        )
+        return model.eval()
+
+    def warm_up(self):
+        inputs = self.tokenizer("Warm up", return_tensors="pt").to(self.device)
+        self.model.generate(**inputs, max_new_tokens=1, pad_token_id=self.tokenizer.pad_token_id)
+
+    def generate(self, prompts: List[str], sections: List[str], params: Dict[str, Any],
+                 prefix: Optional[str] = None) -> List[str]:
+        """Generate completions for a batch of prompts in one left-padded generate call"""
+        with metrics.span("llm.tokenize"):
+            inputs = self._tokenize(prompts)
+        started = time.perf_counter()
+        outputs = self.model.generate(
+            **inputs, **self._generate_kwargs(inputs, sections, params), **self._prefill(inputs, prefix)
+        )
+        self._record_outputs(inputs, outputs, time.perf_counter() - started)
+
+        # Decode only the completions; with left padding every prompt ends at the same column
+        prompt_length = inputs["input_ids"].shape[1]
+        with metrics.span("llm.decode"):
+            return self.tokenizer.batch_decode(outputs[:, prompt_length:], skip_special_tokens=True)
+
+    def stream(self, prompt: str, sections: List[str], params: Dict[str, Any],
+               prefix: Optional[str] = None) -> Iterator[str]:
+        from transformers import TextIteratorStreamer
+
+        with metrics.span("llm.tokenize"):
+            inputs = self._tokenize([prompt])
+        streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True)
+        errors = []
+
+        def generate():
+            try:
+                started = time.perf_counter()
+                outputs = self.model.generate(
+                    **inputs, **self._generate_kwargs(inputs, sections, params),
+                    **self._prefill(inputs, prefix), streamer=streamer
+                )
+                self._record_outputs(inputs, outputs, time.perf_counter() - started)
+            except Exception as e:
+                errors.append(e)
+                streamer.end()
+
+        # Run in a copy of this context so the generate span joins the caller's trace
+        thread = threading.Thread(
+            target=contextvars.copy_context().run, args=(generate,), name="llm-stream", daemon=True
+        )
+        thread.start()
+        for chunk in streamer:
+            yield chunk
+        thread.join()
+        if errors:
+            raise errors[0]
+
+    def clear_prefix_cache(self):
+        """Drop every cached prefix, e.g. after the model or the prompt templates change"""
+        with self._prefix_lock:
+            self._prefix_cache.clear()
+
+    def _prefill(self, inputs, prefix: Optional[str]) -> Dict[str, Any]:
+        """past_key_values covering all but the last prompt token, reusing the cached prefix
+
+        Only the prompt text after the prefix is run through the model here;
+        generate() then starts from the last prompt token. Batches are left
+        padded, so prompts do not share token positions and are not prefilled.
+        """
+        if not prefix or not Config.LLM_PREFIX_CACHE or inputs["input_ids"].shape[0] != 1:
+            return {}
+        import torch
+
+        input_ids = inputs["input_ids"]
+        prefix_ids, prefix_past = self._cached_prefix(prefix)
+        # Tokens can merge across the prefix boundary, so reuse the common part only
+        limit = min(len(prefix_ids), input_ids.shape[1] - 1)
+        mismatch = (input_ids[0, :limit] != prefix_ids[:limit]).nonzero()
+        reused = int(mismatch[0]) if len(mismatch) else limit
+        if reused == 0:
+            return {}
+
+        with metrics.span("llm.prefill"):
+            past = self._crop(copy.deepcopy(prefix_past), reused)
+            suffix = input_ids[:, reused:-1]
+            if suffix.shape[1]:
+                with torch.no_grad():
+                    past = self.model(
+                        input_ids=suffix,
+                        attention_mask=inputs["attention_mask"][:, :-1],
+                        past_key_values=past,
+                        use_cache=True
+                    ).past_key_values
+        metrics.increment("llm_prefix_cache_reused_tokens_total", reused)
+        return {"past_key_values": past}
+
+    def _cached_prefix(self, prefix: str):
+        """Token ids and past key values of a prompt prefix, computed once per prefix"""
+        with self._prefix_lock:
+            entry = self._prefix_cache.get(prefix)
+            if entry is not None:
+                self._prefix_cache.move_to_end(prefix)
+                metrics.increment("llm_prefix_cache_hits_total")
+                return entry
+
+            import torch
+            metrics.increment("llm_prefix_cache_misses_total")
+            prefix_ids = self.tokenizer(prefix, return_tensors="pt")["input_ids"].to(self.device)
+            with torch.no_grad():
+                past = self.model(input_ids=prefix_ids, use_cache=True).past_key_values
+            entry = self._prefix_cache[prefix] = (prefix_ids[0], past)
+            while len(self._prefix_cache) > Config.LLM_PREFIX_CACHE_ENTRIES:
+                self._prefix_cache.popitem(last=False)
+            return entry
+
+    @staticmethod
+    def _crop(past, length: int):
+        """Keep the first length positions of a KV cache (DynamicCache or legacy tuples)"""
+        if hasattr(past, "crop"):
+            past.crop(length)
+            return past
+        return tuple(tuple(tensor[:, :, :length] for tensor in layer) for layer in past)
+
+    def _tokenize(self, prompts: List[str]):
+        # Tokenize with proper padding
+        return self.tokenizer(
+            prompts,
+            return_tensors="pt",
+            padding=True,
+            truncation=True,
+            max_length=Config.LLM_CONTEXT_LENGTH
+        ).to(self.device)
+
+    def _generate_kwargs(self, inputs, sections: List[str], params: Dict[str, Any]) -> Dict[str, Any]:
+        """Generation parameters, stopping once every expected section is complete"""
+        from transformers import StoppingCriteriaList
+        from models.generation import SectionStoppingCriteria
+
+        prompt_length = inputs["input_ids"].shape[1]
+        return {
+            **params,
+            "pad_token_id": self.tokenizer.pad_token_id,
+            "stopping_criteria": StoppingCriteriaList([
+                SectionStoppingCriteria(self.tokenizer, sections, prompt_length)
+            ])
+        }
+
+    def _record_outputs(self, inputs, outputs, seconds: float):
+        new_tokens = (outputs.shape[1] - inputs["input_ids"].shape[1]) * outputs.shape[0]
+        self._record_generation(int(inputs["attention_mask"].sum()), int(new_tokens), seconds)
+
+class Int8Backend(TransformersBackend):
+    """Transformers model with int8 dynamically quantized Linear layers, for CPU inference
+
+    Weights of every Linear layer are stored as int8 (about 4x smaller than
+    float32) and activations are quantized on the fly, which speeds up the
+    matmuls that dominate decoding on CPUs with VNNI/AVX2.
+    """
+
+    name = "int8"
+
+    def _load_model(self, model_name: str):
+        import torch
+        from transformers import AutoModelForCausalLM
+
+        # Dynamic quantization runs on CPU only
+        self.device = "cpu"
+        model = AutoModelForCausalLM.from_pretrained(
+            model_name,
+            torch_dtype=torch.float32,
+            low_cpu_mem_usage=True,
+            trust_remote_code=True
+        ).eval()
+        started = time.perf_counter()
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        self.load_timings["quantize"] = time.perf_counter() - started
+        return model
+
+class LlamaCppBackend(InferenceBackend):
+    """GGUF model run by llama.cpp (llama-cpp-python), the fastest option on CPU
+
+    llama.cpp keeps the KV cache of the previous prompt and only evaluates the
+    part of a new prompt after the common prefix; the RAM cache additionally
+    keeps states for both prompt templates, so their shared instruction
+    prefixes are not recomputed when requests alternate between them.
+    """
+
+    name = "llamacpp"
+
+    # Re-check the section format every few streamed pieces
+    CHECK_EVERY = 8
+
+    def __init__(self, model_name: str, threads: Optional[int] = None):
+        super().__init__(model_name, threads)
+        self.llm = None
+        # Llama is not thread-safe; the registry shares one across sessions and worker threads
+        self._llm_lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.llm is not None
+
+    def load(self):
+        started = time.perf_counter()
+        from llama_cpp import Llama, LlamaRAMCache
+        self.load_timings["imports"] = time.perf_counter() - started
+
+        model_path = Config.LLM_GGUF_PATH or self.model_name
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"GGUF model not found: {model_path} (set LLM_GGUF_PATH)")
+        started = time.perf_counter()
+        self.llm = Llama(
+            model_path=model_path,
+            n_ctx=Config.LLM_CONTEXT_LENGTH,
+            n_threads=self.threads or None,
+            n_threads_batch=self.threads or None,
+            verbose=False
+        )
+        if Config.LLM_PREFIX_CACHE_BYTES:
+            self.llm.set_cache(LlamaRAMCache(capacity_bytes=Config.LLM_PREFIX_CACHE_BYTES))
+        self.model_name = model_path
+        self.load_timings["model"] = time.perf_counter() - started
+
+    @property
+    def context_length(self) -> int:
+        return self.llm.n_ctx()
+
+    def count_tokens(self, text: str) -> int:
+        with self._llm_lock:
+            return len(self.llm.tokenize(text.encode("utf-8"), add_bos=False))
+
+    def warm_up(self):
+        with self._llm_lock:
+            self.llm.create_completion("Warm up", max_tokens=1)
+
+    def generate(self, prompts: List[str], sections: List[str], params: Dict[str, Any],
+                 prefix: Optional[str] = None) -> List[str]:
+        # llama.cpp decodes one sequence at a time
+        return ["".join(self.stream(prompt, sections, params)) for prompt in prompts]
+
+    def stream(self, prompt: str, sections: List[str], params: Dict[str, Any],
+               prefix: Optional[str] = None) -> Iterator[str]:
+        # Prefix reuse is built into llama.cpp (see class docstring). The lock is held
+        # for the whole completion, until the stream is exhausted or closed
+        with self._llm_lock:
+            yield from self._stream_locked(prompt, sections, params)
+
+    def _stream_locked(self, prompt: str, sections: List[str], params: Dict[str, Any]) -> Iterator[str]:
+        with metrics.span("llm.tokenize"):
+            prompt_tokens = len(self.llm.tokenize(prompt.encode("utf-8")))
+        text = ""
+        pieces = 0
+        started = time.perf_counter()
+        try:
+            for chunk in self.llm.create_completion(
+                prompt,
+                max_tokens=params.get("max_new_tokens", 1000),
+                temperature=params.get("temperature", 0.7) if params.get("do_sample") else 0.0,
+                top_p=params.get("top_p", 1.0),
+                stream=True
+            ):
+                piece = chunk["choices"][0]["text"]
+                text += piece
+                pieces += 1
+                yield piece
+                if pieces % self.CHECK_EVERY == 0 and sections_complete(text, sections):
+                    break
+        finally:
+            self._record_generation(prompt_tokens, pieces, time.perf_counter() - started)
+
+BACKENDS = {
+    backend.name: backend for backend in (TransformersBackend, Int8Backend, LlamaCppBackend)
+}
+
+def create_backend(name: str, model_name: str, threads: Optional[int] = None) -> InferenceBackend:
+    """Instantiate a backend by its LLM_BACKEND name"""
+    backend = BACKENDS.get(name)
+    if backend is None:
+        raise ValueError(f"Unknown LLM backend: {name} (choose from {', '.join(BACKENDS)})")
+    return backend(model_name, threads)
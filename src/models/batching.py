@@ -0,0 +1,80 @@
+from typing import Any, Callable, List
+from concurrent.futures import Future
+import queue
+import threading
+import time
+
+class MicroBatcher:
+    """Background queue that groups concurrent requests into batches
+
+    Requests submitted within ``max_wait`` seconds of the first queued one
+    (up to ``max_batch_size``) are handed to ``process_batch`` in a single
+    call. Each caller gets a Future resolved with its own result.
+    """
+
+    def __init__(self, process_batch: Callable[[List[Any]], List[Any]],
+                 max_batch_size: int = 8, max_wait: float = 0.05):
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        """Queue one request and return a Future for its result"""
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def close(self, wait: bool = True):
+        """Stop accepting requests; queued requests are still processed"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        if wait:
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            # Collect more requests until the batch is full or the window ends
+            batch = [first]
+            deadline = time.monotonic() + self.max_wait
+            stop = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stop = True
+                    break
+                batch.append(entry)
+
+            self._dispatch(batch)
+            if stop:
+                return
+
+    def _dispatch(self, batch: List[Any]):
+        active = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+        if not active:
+            return
+        try:
+            results = self.process_batch([item for item, _ in active])
+        except Exception as e:
+            for _, future in active:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(active, results):
+            future.set_result(result)
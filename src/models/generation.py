@@ -0,0 +1,22 @@
+from typing import List
+import torch
+from transformers import StoppingCriteria
+
+from parsers.segmenter import sections_complete
+
+class SectionStoppingCriteria(StoppingCriteria):
+    """Stop generation as soon as every expected section has been produced and closed"""
+
+    def __init__(self, tokenizer, sections: List[str], prompt_length: int, check_every: int = 8):
+        self.tokenizer = tokenizer
+        self.sections = sections
+        self.prompt_length = prompt_length
+        self.check_every = check_every
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> bool:
+        generated = input_ids.shape[1] - self.prompt_length
+        # Decoding is not free, so only look every few steps
+        if generated <= 0 or generated % self.check_every:
+            return False
+        texts = self.tokenizer.batch_decode(input_ids[:, self.prompt_length:], skip_special_tokens=True)
+        return all(sections_complete(text, self.sections) for text in texts)
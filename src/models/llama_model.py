@@ -1,56 +1,23 @@
-from transformers import AutoModelForCausalLM, AutoTokenizer
-import torch
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Callable, Generator, Iterator, Optional, Tuple
+from concurrent.futures import Future
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
+from config.config import Config
+from models.backends import InferenceBackend, create_backend
+from models.batching import MicroBatcher
+from models.preprocess import InputPreprocessor, merge_analyses, new_token_budget
+from parsers.segmenter import find_section, split_items, split_lines
+from storage.records import JobRequirements, Record, ResumeAnalysis
+from utils.cache import TieredCache, make_key
+from utils.metrics import metrics
+
 load_dotenv()
 
 class LlamaModel:
-    def __init__(self):
-        self.model_name = "meta-llama/Llama-2-7b-chat-hf"  # Using Llama 2 as Llama 3.2 requires special access
-        self.tokenizer = None
-        self.model = None
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        self.load_model()
-        
-    def load_model(self):
-        """Load the Llama model and tokenizer"""
-        try:
-            # Load tokenizer first
-            self.tokenizer = AutoTokenizer.from_pretrained(
-                self.model_name,
-                trust_remote_code=True
-            )
-            
-            # Configure tokenizer
-            self.tokenizer.pad_token = self.tokenizer.eos_token
-            self.tokenizer.padding_side = "left"
-            
-            # Load model
-            self.model = AutoModelForCausalLM.from_pretrained(
-                self.model_name,
-                torch_dtype=torch.float16,
-                device_map="auto",
-                trust_remote_code=True
-            )
-            
-            # Configure model
-            self.model.config.pad_token_id = self.tokenizer.pad_token_id
-            
-        except Exception as e:
-            print(f"Error loading model: {e}")
-            # Fallback to a simpler model for testing
-            self.model_name = "gpt2"
-            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-            self.model = AutoModelForCausalLM.from_pretrained(self.model_name)
-        
-    def analyze_resume(self, resume_text: str) -> Dict[str, Any]:
-        """Analyze resume text and extract key information"""
-        if not self.model or not self.tokenizer:
-            raise RuntimeError("Model not loaded. Call load_model() first.")
-            
-        prompt = f"""
+    RESUME_PROMPT = """
         You are an expert resume analyzer. Analyze the following resume and extract the following information in a structured format:
 
         1. Skills: List all technical and soft skills mentioned
@@ -62,42 +29,10 @@ class LlamaModel:
         Format the output as a JSON-like structure with clear sections.
 
         Resume:
-        {resume_text}
+        {text}
         """
-        
-        try:
-            # Tokenize with proper padding
-            inputs = self.tokenizer(
-                prompt,
-                return_tensors="pt",
-                padding=True,
-                truncation=True,
-                max_length=2048
-            ).to(self.device)
-            
-            # Generate with proper parameters
-            outputs = self.model.generate(
-                **inputs,
-                max_new_tokens=1000,
-                temperature=0.7,
-                do_sample=True,
-                top_p=0.9,
-                pad_token_id=self.tokenizer.pad_token_id
-            )
-            
-            analysis = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-            return self._parse_analysis(analysis)
-            
-        except Exception as e:
-            print(f"Error in resume analysis: {e}")
-            return self._get_default_resume_data()
     
-    def analyze_job_requirements(self, job_description: str) -> Dict[str, Any]:
-        """Analyze job description and extract requirements"""
-        if not self.model or not self.tokenizer:
-            raise RuntimeError("Model not loaded. Call load_model() first.")
-            
-        prompt = f"""
+    JOB_PROMPT = """
         You are an expert job requirements analyzer. Analyze the following job description and extract:
 
         1. Required Skills: List all mandatory technical and soft skills
@@ -108,101 +43,362 @@ class LlamaModel:
         Format the output as a JSON-like structure with clear sections.
 
         Job Description:
-        {job_description}
+        {text}
         """
+    
+    RESUME_SECTIONS = ["Skills", "Work Experience", "Education", "Certifications", "Projects"]
+    JOB_SECTIONS = ["Required Skills", "Required Experience", "Required Education", "Nice-to-have Skills"]
+    
+    # Bump when generation or parsing changes so cached analyses are not reused
+    ANALYSIS_VERSION = 7
+    
+    def __init__(self, model_name: Optional[str] = None, backend: Optional[str] = None,
+                 cache: Optional[TieredCache] = None):
+        # Using Llama 2 as Llama 3.2 requires special access
+        self.model_name = model_name or Config.MODEL_NAME
+        # Inference backend name (see models.backends); created on load
+        self.backend_name = backend or Config.LLM_BACKEND
+        self.backend = None
+        # The model actually loaded (a GGUF path, or gpt2 if loading fell back)
+        self.loaded_model_name = None
+        # Fits inputs into the backend's context window; created on load
+        self.preprocessor = None
+        self._template_token_counts = {}
+        self.load_timings = {}
+        self.generation_params = {
+            "max_new_tokens": 1000,
+            "temperature": 0.7,
+            "do_sample": True,
+            "top_p": 0.9
+        }
+        # Analyses keyed by content hash (see _cache_key); persistent unless a cache is given
+        self.cache = cache if cache is not None else TieredCache(
+            Config.LLM_CACHE_PATH,
+            memory_entries=Config.LLM_CACHE_MEMORY_ENTRIES,
+            max_entries=Config.LLM_CACHE_MAX_ENTRIES,
+            max_bytes=Config.LLM_CACHE_MAX_BYTES,
+            ttl=Config.LLM_CACHE_TTL
+        )
+        metrics.register_gauge("cache_hit_rate", lambda: self.cache.stats()["hit_rate"], {"cache": "llm"})
+        self._batcher = None
+        self._batcher_lock = threading.Lock()
+        # The model is loaded lazily on first use (see ensure_loaded)
+        self._load_lock = threading.Lock()
         
-        try:
-            # Tokenize with proper padding
-            inputs = self.tokenizer(
-                prompt,
-                return_tensors="pt",
-                padding=True,
-                truncation=True,
-                max_length=2048
-            ).to(self.device)
-            
-            # Generate with proper parameters
-            outputs = self.model.generate(
-                **inputs,
-                max_new_tokens=1000,
-                temperature=0.7,
-                do_sample=True,
-                top_p=0.9,
-                pad_token_id=self.tokenizer.pad_token_id
-            )
+    @property
+    def is_loaded(self) -> bool:
+        return self.backend is not None and self.backend.is_loaded
+        
+    def ensure_loaded(self):
+        """Load the model once, on first use"""
+        if self.is_loaded:
+            return
+        with self._load_lock:
+            if not self.is_loaded:
+                self.load_model()
+        
+    def load_model(self):
+        """Load the model through the configured inference backend"""
+        backend = self._create_backend()
+        backend.load()
+        self.load_timings.update(backend.load_timings)
+        # Not self.model_name: cache keys use the configured model, which must not change on load
+        self.loaded_model_name = backend.model_name
+        self._template_token_counts = {}
+        self.preprocessor = InputPreprocessor(backend.count_tokens)
+        self.backend = backend
+        
+    def _create_backend(self) -> InferenceBackend:
+        return create_backend(self.backend_name, self.model_name)
             
-            analysis = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-            return self._parse_analysis(analysis)
+    def warm_up(self):
+        """Load the model and run a tiny generation so the first request is not the slowest"""
+        self.ensure_loaded()
+        started = time.perf_counter()
+        self.backend.warm_up()
+        self.load_timings["warm_up"] = time.perf_counter() - started
+        
+    def analyze_resume(self, resume_text: str,
+                       on_token: Optional[Callable[[str], None]] = None) -> ResumeAnalysis:
+        """Analyze resume text and extract key information
+
+        If on_token is given, generated text is passed to it as it is produced.
+        """
+        if on_token is not None:
+            return self._analyze_streaming(self.RESUME_PROMPT, resume_text, on_token)
+        return self.analyze_resumes([resume_text])[0]
+    
+    def analyze_job_requirements(self, job_description: str,
+                                 on_token: Optional[Callable[[str], None]] = None) -> JobRequirements:
+        """Analyze job description and extract requirements
+
+        If on_token is given, generated text is passed to it as it is produced.
+        """
+        if on_token is not None:
+            return self._analyze_streaming(self.JOB_PROMPT, job_description, on_token)
+        return self.analyze_job_requirements_batch([job_description])[0]
+    
+    def analyze_resumes(self, resume_texts: List[str], batch_size: Optional[int] = None) -> List[ResumeAnalysis]:
+        """Analyze many resumes, generating up to batch_size (default LLM_BATCH_SIZE) prompts per call"""
+        return self._analyze_batch(self.RESUME_PROMPT, resume_texts, batch_size or Config.LLM_BATCH_SIZE)
+    
+    def analyze_job_requirements_batch(self, job_descriptions: List[str],
+                                       batch_size: Optional[int] = None) -> List[JobRequirements]:
+        """Analyze many job descriptions, generating up to batch_size (default LLM_BATCH_SIZE) prompts per call"""
+        return self._analyze_batch(self.JOB_PROMPT, job_descriptions, batch_size or Config.LLM_BATCH_SIZE)
+    
+    def stream_resume(self, resume_text: str) -> Iterator[str]:
+        """Yield the resume analysis text as it is generated; the parsed result is cached at the end"""
+        return self._stream(self.RESUME_PROMPT, resume_text)
+    
+    def stream_job_requirements(self, job_description: str) -> Iterator[str]:
+        """Yield the job analysis text as it is generated; the parsed result is cached at the end"""
+        return self._stream(self.JOB_PROMPT, job_description)
+    
+    def submit_resume(self, resume_text: str) -> Future:
+        """Queue a resume analysis on the shared micro-batching queue"""
+        return self._get_batcher().submit((self.RESUME_PROMPT, resume_text))
+    
+    def submit_job_requirements(self, job_description: str) -> Future:
+        """Queue a job requirements analysis on the shared micro-batching queue"""
+        return self._get_batcher().submit((self.JOB_PROMPT, job_description))
+    
+    def close(self):
+        """Stop the micro-batching queue after draining queued requests"""
+        with self._batcher_lock:
+            if self._batcher is not None:
+                self._batcher.close()
+                self._batcher = None
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of the analysis cache"""
+        return self.cache.stats()
+    
+    def _get_batcher(self) -> MicroBatcher:
+        with self._batcher_lock:
+            if self._batcher is None:
+                self._batcher = MicroBatcher(
+                    self._process_queued,
+                    max_batch_size=Config.LLM_BATCH_SIZE,
+                    max_wait=Config.LLM_BATCH_WAIT
+                )
+            return self._batcher
+    
+    def _process_queued(self, items: List[Tuple[str, str]]) -> List[Record]:
+        """Run one window of queued requests, one generate call per prompt template"""
+        analyze = {
+            self.RESUME_PROMPT: self.analyze_resumes,
+            self.JOB_PROMPT: self.analyze_job_requirements_batch
+        }
+        results = [None] * len(items)
+        for template, analyze_batch in analyze.items():
+            indices = [i for i, (item_template, _) in enumerate(items) if item_template == template]
+            if not indices:
+                continue
+            analyses = analyze_batch([items[i][1] for i in indices], batch_size=len(indices))
+            for i, analysis in zip(indices, analyses):
+                results[i] = analysis
+        return results
+    
+    def _task(self, template: str) -> Tuple[str, Callable[[], Record], Callable[[str], Record], List[str]]:
+        """Error label, default result, parser and expected sections for a prompt template"""
+        if template == self.JOB_PROMPT:
+            return ("Error in job requirements analysis", self._get_default_job_requirements,
+                    self._parse_job_analysis, self.JOB_SECTIONS)
+        return ("Error in resume analysis", self._get_default_resume_data,
+                self._parse_resume_analysis, self.RESUME_SECTIONS)
+    
+    def _record_type(self, template: str) -> type:
+        """Record class of a prompt template's analyses"""
+        return JobRequirements if template == self.JOB_PROMPT else ResumeAnalysis
+    
+    def _analyze_batch(self, template: str, texts: List[str], batch_size: int) -> List[Record]:
+        """Run a prompt template over many inputs, serving repeats from the cache"""
+        error_message, default, parse, sections = self._task(template)
+        results = [None] * len(texts)
+        
+        # Cache lookups first; identical inputs are generated only once
+        pending = {}
+        for i, text in enumerate(texts):
+            key = self._cache_key(template, text)
+            if key in pending:
+                pending[key][1].append(i)
+                continue
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[i] = self._record_type(template).from_dict(cached)
+            else:
+                pending[key] = (text, [i])
+                
+        misses = list(pending.items())
+        if misses:
+            self.ensure_loaded()
+        # Long inputs become several chunks; all chunks are batched together
+        units = []
+        for miss, (_, (text, _)) in enumerate(misses):
+            units.extend((miss, chunk) for chunk in self._prepare_input(template, text))
+        chunk_analyses = [[] for _ in misses]
+        failed = set()
+        for start in range(0, len(units), batch_size):
+            batch = units[start:start + batch_size]
+            chunks = [chunk for _, chunk in batch]
+            try:
+                outputs = self._generate_batch(
+                    [template.format(text=chunk) for chunk in chunks], sections,
+                    prefix=self._prompt_prefix(template), params=self._generation_params(template, chunks)
+                )
+                analyses = [parse(output) for output in outputs]
+            except Exception as e:
+                print(f"{error_message}: {e}")
+                failed.update(miss for miss, _ in batch)
+                continue
+            for (miss, _), analysis in zip(batch, analyses):
+                chunk_analyses[miss].append(analysis)
+                
+        for miss, (key, (_, indices)) in enumerate(misses):
+            if miss in failed:
+                for i in indices:
+                    results[i] = default()
+                continue
+            analysis = merge_analyses(chunk_analyses[miss])
+            self._cache_set(key, analysis)
+            # Records are read-only through their dict view, so repeats can share one
+            for i in indices:
+                results[i] = analysis
+                    
+        return results
+    
+    def _analyze_streaming(self, template: str, text: str,
+                           on_token: Callable[[str], None]) -> Record:
+        """Analyze a single input, forwarding generated text to on_token"""
+        error_message, default, parse, _ = self._task(template)
+        cached = self.cache.get(self._cache_key(template, text))
+        if cached is not None:
+            return self._record_type(template).from_dict(cached)
             
+        stream = self._stream(template, text)
+        try:
+            while True:
+                on_token(next(stream))
+        except StopIteration as done:
+            # _stream returns the parsed analysis
+            return done.value
         except Exception as e:
-            print(f"Error in job requirements analysis: {e}")
-            return self._get_default_job_requirements()
+            print(f"{error_message}: {e}")
+            return default()
     
-    def _get_default_resume_data(self) -> Dict[str, Any]:
+    def _stream(self, template: str, text: str) -> Generator[str, None, Record]:
+        """Stream a fresh generation for one input, then cache and return its parsed result"""
+        _, _, parse, sections = self._task(template)
+        self.ensure_loaded()
+        analyses = []
+        for n, chunk in enumerate(self._prepare_input(template, text)):
+            if n:
+                yield "\n\n"
+            pieces = []
+            for piece in self.backend.stream(template.format(text=chunk), sections,
+                                             self._generation_params(template, [chunk]),
+                                             prefix=self._prompt_prefix(template)):
+                pieces.append(piece)
+                yield piece
+            analyses.append(parse("".join(pieces)))
+            
+        analysis = merge_analyses(analyses)
+        self._cache_set(self._cache_key(template, text), analysis)
+        return analysis
+    
+    def _cache_key(self, template: str, text: str) -> str:
+        """Hash of everything that determines an analysis
+
+        Only configuration goes in, so the key is the same before and after
+        the model is loaded and lookups never need to load it. That includes
+        the settings that chunk the input and size the generation budget.
+        """
+        normalized_text = " ".join(text.split())
+        gguf_path = Config.LLM_GGUF_PATH if self.backend_name == "llamacpp" else ""
+        input_settings = (Config.LLM_CONTEXT_LENGTH, Config.LLM_MAX_CHUNKS, Config.LLM_MIN_NEW_TOKENS,
+                          Config.LLM_NEW_TOKENS_PER_INPUT_TOKEN, Config.LLM_CPU_DTYPE)
+        return make_key(self.ANALYSIS_VERSION, self.model_name, self.backend_name, gguf_path, input_settings,
+                        template, normalized_text, self.generation_params)
+    
+    def _cache_set(self, key: str, analysis: Record):
+        """Cache an analysis unless it came from a fallback model, which the key does not name"""
+        if self.backend is not None and self.backend.fallback:
+            return
+        self.cache.set(key, analysis.to_dict())
+    
+    def _generate_batch(self, prompts: List[str], sections: List[str], prefix: Optional[str] = None,
+                        params: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Generate completions for a batch of prompts"""
+        return self.backend.generate(prompts, sections, params or self.generation_params, prefix=prefix)
+    
+    def _prepare_input(self, template: str, text: str) -> List[str]:
+        """An input cleaned, reduced to its relevant sections and split to fit the context window"""
+        context = self.backend.context_length - self._template_tokens(template)
+        # Leave room for the generation; short contexts (gpt2) split it evenly with the input
+        budget = context - min(self.generation_params["max_new_tokens"], context // 2)
+        kind = "job" if template == self.JOB_PROMPT else "resume"
+        with metrics.span("llm.preprocess"):
+            chunks = self.preprocessor.prepare(text, kind, budget)
+        if len(chunks) > Config.LLM_MAX_CHUNKS:
+            # The analysis covers only the first chunks; count it so truncation shows up in /metrics
+            metrics.increment("llm_inputs_truncated_total", labels={"kind": kind})
+            metrics.increment("llm_input_chunks_dropped_total", len(chunks) - Config.LLM_MAX_CHUNKS, {"kind": kind})
+            chunks = chunks[:Config.LLM_MAX_CHUNKS]
+        metrics.increment("llm_input_chunks_total", len(chunks))
+        return chunks
+    
+    def _generation_params(self, template: str, chunks: List[str]) -> Dict[str, Any]:
+        """generation_params with max_new_tokens sized to the largest input of a batch"""
+        input_tokens = max(self.backend.count_tokens(chunk) for chunk in chunks)
+        room = self.backend.context_length - self._template_tokens(template) - input_tokens
+        limit = min(self.generation_params["max_new_tokens"], room)
+        return dict(self.generation_params, max_new_tokens=new_token_budget(input_tokens, limit))
+    
+    def _template_tokens(self, template: str) -> int:
+        """Prompt tokens of a template without its input"""
+        count = self._template_token_counts.get(template)
+        if count is None:
+            count = self._template_token_counts[template] = self.backend.count_tokens(template.format(text=""))
+        return count
+    
+    @staticmethod
+    def _prompt_prefix(template: str) -> str:
+        """The static instruction block of a template, shared by every prompt built from it"""
+        return template.split("{text}", 1)[0]
+    
+    def _get_default_resume_data(self) -> ResumeAnalysis:
         """Return default resume data structure"""
-        return {
-            "skills": [],
-            "experience": [],
-            "education": [],
-            "certifications": [],
-            "projects": []
-        }
+        return ResumeAnalysis()
     
-    def _get_default_job_requirements(self) -> Dict[str, Any]:
+    def _get_default_job_requirements(self) -> JobRequirements:
         """Return default job requirements structure"""
-        return {
-            "required_skills": [],
-            "required_experience": {"description": ""},
-            "required_education": {"description": ""},
-            "nice_to_have_skills": []
-        }
+        return JobRequirements()
     
-    def _parse_analysis(self, text: str) -> Dict[str, Any]:
+    def _parse_analysis(self, text: str) -> Record:
         """Parse the model's output into structured data"""
         # For job requirements analysis
         if "Required Skills" in text:
-            return {
-                "required_skills": self._extract_list(text, "Required Skills"),
-                "required_experience": self._extract_dict(text, "Required Experience"),
-                "required_education": self._extract_dict(text, "Required Education"),
-                "nice_to_have_skills": self._extract_list(text, "Nice-to-have Skills")
-            }
+            return self._parse_job_analysis(text)
         # For resume analysis
         else:
-            return {
-                "skills": self._extract_list(text, "Skills"),
-                "experience": self._extract_list(text, "Work Experience"),
-                "education": self._extract_list(text, "Education"),
-                "certifications": self._extract_list(text, "Certifications"),
-                "projects": self._extract_list(text, "Projects")
-            }
-    
-    def _extract_list(self, text: str, section: str) -> List[str]:
-        """Extract a list of items from a section"""
-        try:
-            start = text.find(section)
-            if start == -1:
-                return []
-            start = text.find("\n", start) + 1
-            end = text.find("\n\n", start)
-            if end == -1:
-                end = len(text)
-            section_text = text[start:end].strip()
-            return [item.strip() for item in section_text.split("\n") if item.strip()]
-        except Exception:
-            return []
-    
-    def _extract_dict(self, text: str, section: str) -> Dict[str, str]:
-        """Extract a dictionary from a section"""
-        try:
-            start = text.find(section)
-            if start == -1:
-                return {"description": ""}
-            start = text.find("\n", start) + 1
-            end = text.find("\n\n", start)
-            if end == -1:
-                end = len(text)
-            section_text = text[start:end].strip()
-            return {"description": section_text}
-        except Exception:
-            return {"description": ""} 
\ No newline at end of file
+            return self._parse_resume_analysis(text)
+    
+    def _parse_job_analysis(self, text: str) -> JobRequirements:
+        """Parse a job requirements analysis"""
+        return JobRequirements(
+            required_skills=split_items(find_section(text, "Required Skills")),
+            required_experience=find_section(text, "Required Experience"),
+            required_education=find_section(text, "Required Education"),
+            nice_to_have_skills=split_items(find_section(text, "Nice-to-have Skills"))
+        )
+    
+    def _parse_resume_analysis(self, text: str) -> ResumeAnalysis:
+        """Parse a resume analysis"""
+        return ResumeAnalysis(
+            skills=split_items(find_section(text, "Skills")),
+            experience=split_lines(find_section(text, "Work Experience")),
+            education=split_lines(find_section(text, "Education")),
+            certifications=split_lines(find_section(text, "Certifications")),
+            projects=split_lines(find_section(text, "Projects"))
+        )
\ No newline at end of file
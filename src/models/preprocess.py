@@ -0,0 +1,192 @@
+from typing import Dict, Any, Callable, List, Tuple
+from collections import Counter
+import re
+
+from config.config import Config
+from parsers.segmenter import job_segmenter, resume_segmenter
+from storage.records import Record
+
+# Sections passed to the model; everything else is dropped before tokenizing
+RESUME_SECTIONS = ("summary", "skills", "experience", "education", "certifications", "projects")
+JOB_BOILERPLATE_SECTIONS = ("about", "benefits", "equal_opportunity", "application")
+
+# Lines that carry nothing the analysis extracts: page furniture, contact details, separators
+_BOILERPLATE_LINES = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    # Page numbers, but not years ("2019") or year ranges
+    r"^(page\s*)?\d{1,3}(\s*(of|/)\s*\d{1,3})?$",
+    r"^(curriculum vitae|resume|résumé|cv)$",
+    r"^references( are)? available (up)?on request\.?$",
+    r"^(e-?mail|linkedin|github|website)?\s*:?\s*(\S+@\S+\.\S+|(https?://|www\.)\S+)$",
+    # Phone numbers need a label or a leading "+" and at least 9 digits
+    r"^(?=(\D*\d){9})((phone|tel|mobile)\s*:?\s*\+?|\+)[\d\s().-]+$",
+    r"^[\W_]+$"
+)]
+_SPACES = re.compile(r"[ \t ​]+")
+# Short lines repeated this often are page headers/footers
+_REPEATED_LINE_COUNT = 3
+_REPEATED_LINE_LENGTH = 80
+
+def clean_text(text: str) -> str:
+    """Collapse whitespace and drop boilerplate and repeated header/footer lines"""
+    lines = [_SPACES.sub(" ", line).strip() for line in text.replace("\r", "\n").split("\n")]
+    counts = Counter(line.lower() for line in lines if line and len(line) <= _REPEATED_LINE_LENGTH)
+    kept = []
+    seen = set()
+    for line in lines:
+        if not line:
+            # At most one blank line in a row; blank lines separate paragraphs
+            if kept and kept[-1]:
+                kept.append("")
+            continue
+        if any(pattern.match(line) for pattern in _BOILERPLATE_LINES):
+            continue
+        key = line.lower()
+        if counts.get(key, 0) >= _REPEATED_LINE_COUNT:
+            if key in seen:
+                continue
+            seen.add(key)
+        kept.append(line)
+    return "\n".join(kept).strip()
+
+def select_sections(text: str, kind: str) -> List[Tuple[str, str]]:
+    """(heading, body) pairs of the sections worth analyzing, in document order
+
+    A resume keeps its summary, skills, experience, education, certifications
+    and projects; a job description drops company blurbs, benefits and legal
+    boilerplate. Text before the first heading (contact details of a resume,
+    the intro of a job ad) is kept for jobs only. Documents without any
+    recognized heading are kept whole.
+    """
+    segmenter = job_segmenter if kind == "job" else resume_segmenter
+    spans = segmenter.spans(text)
+    if not spans:
+        return [("", text)]
+
+    selected = []
+    # Text before the line holding the first heading
+    preamble = text[:max(text.rfind("\n", 0, spans[0][1]), 0)]
+    if kind == "job" and preamble.strip():
+        selected.append(("", preamble.strip()))
+    for key, start, end in spans:
+        if kind == "job" and key in JOB_BOILERPLATE_SECTIONS:
+            continue
+        if kind != "job" and key not in RESUME_SECTIONS:
+            continue
+        body = text[start:end].strip()
+        if body:
+            selected.append((key.replace("_", " ").title(), body))
+    return selected or [("", text)]
+
+def merge_analyses(analyses: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine the analyses of a document's chunks into one
+
+    Lists are concatenated without case-insensitive duplicates and
+    descriptions are joined, both in chunk order. Records merge into a
+    record of the same type.
+    """
+    if len(analyses) == 1:
+        return analyses[0]
+    merged = {}
+    for analysis in analyses:
+        for key, value in analysis.items():
+            if isinstance(value, list):
+                items = merged.setdefault(key, [])
+                known = {str(item).strip().lower() for item in items}
+                for item in value:
+                    if str(item).strip().lower() not in known:
+                        known.add(str(item).strip().lower())
+                        items.append(item)
+            elif isinstance(value, dict):
+                target = merged.setdefault(key, {})
+                for field, text in value.items():
+                    current = target.get(field)
+                    if not current:
+                        target[field] = text
+                    elif text and text not in current:
+                        target[field] = f"{current}\n{text}"
+            else:
+                merged.setdefault(key, value)
+    if isinstance(analyses[0], Record):
+        return type(analyses[0]).from_dict(merged)
+    return merged
+
+class InputPreprocessor:
+    """Fits documents into the model's context window before analysis
+
+    A document is cleaned and reduced to its relevant sections; if it still
+    exceeds the input budget it is split into chunks at section, paragraph and
+    line boundaries (repeating the section heading in each chunk), so nothing
+    is truncated. Each chunk is analyzed separately and the results merged
+    with merge_analyses.
+    """
+
+    def __init__(self, count_tokens: Callable[[str], int]):
+        self.count_tokens = count_tokens
+
+    def prepare(self, text: str, kind: str, budget: int) -> List[str]:
+        """Cleaned, section-filtered text as one or more chunks of at most budget tokens"""
+        sections = select_sections(clean_text(text), kind)
+        document = self._join(sections)
+        if self.count_tokens(document) <= budget:
+            return [document]
+        return self._chunk(sections, max(budget, 1))
+
+    @staticmethod
+    def _join(sections: List[Tuple[str, str]]) -> str:
+        return "\n\n".join(f"{heading}:\n{body}" if heading else body for heading, body in sections)
+
+    def _chunk(self, sections: List[Tuple[str, str]], budget: int) -> List[str]:
+        """Greedily pack paragraphs into chunks that fit the budget"""
+        chunks = []
+        current = []
+        current_heading = None
+        used = 0
+        for heading, body in sections:
+            heading_text = f"{heading}:" if heading else ""
+            heading_tokens = self.count_tokens(heading_text) if heading else 0
+            for piece in self._pieces(body, max(budget - heading_tokens, 1)):
+                tokens = self.count_tokens(piece)
+                new_heading = bool(heading) and heading != current_heading
+                if current and used + tokens + (heading_tokens if new_heading else 0) > budget:
+                    chunks.append("\n".join(current))
+                    current, used = [], 0
+                    # Continuation chunks repeat the heading of their section
+                    new_heading = bool(heading)
+                if new_heading:
+                    current.append(heading_text)
+                    used += heading_tokens
+                current_heading = heading
+                current.append(piece)
+                used += tokens
+        if current:
+            chunks.append("\n".join(current))
+        return chunks
+
+    def _pieces(self, body: str, budget: int) -> List[str]:
+        """Paragraphs of body, with any paragraph over budget split into lines, then words"""
+        pieces = []
+        for paragraph in body.split("\n\n"):
+            if self.count_tokens(paragraph) <= budget:
+                pieces.append(paragraph)
+                continue
+            for line in paragraph.split("\n"):
+                if self.count_tokens(line) <= budget:
+                    pieces.append(line)
+                else:
+                    pieces.extend(self._split_words(line, budget))
+        return [piece for piece in pieces if piece.strip()]
+
+    def _split_words(self, line: str, budget: int) -> List[str]:
+        words = line.split()
+        # Estimate the words per piece from this line's own token density
+        per_piece = max(int(len(words) * budget / max(self.count_tokens(line), 1)), 1)
+        while True:
+            pieces = [" ".join(words[i:i + per_piece]) for i in range(0, len(words), per_piece)]
+            if per_piece == 1 or all(self.count_tokens(piece) <= budget for piece in pieces):
+                return pieces
+            per_piece = max(per_piece * 3 // 4, 1)
+
+def new_token_budget(input_tokens: int, limit: int) -> int:
+    """max_new_tokens for an input: grows with its size, capped at limit"""
+    wanted = Config.LLM_MIN_NEW_TOKENS + int(input_tokens * Config.LLM_NEW_TOKENS_PER_INPUT_TOKEN)
+    return max(min(wanted, limit), 1)
@@ -0,0 +1,62 @@
+# Process-wide registry of shared model instances. Streamlit re-executes the
+# app script on every interaction, but imported modules stay in sys.modules,
+# so models registered here are created once per process and shared by every
+# session and rerun.
+from typing import Dict, Optional
+import threading
+import time
+
+from config.config import Config
+from models.llama_model import LlamaModel
+
+_models: Dict[str, LlamaModel] = {}
+_lock = threading.Lock()
+_timings: Dict[str, float] = {}
+_preloaded = set()
+
+def get_llama_model(model_name: Optional[str] = None) -> LlamaModel:
+    """Return the shared LlamaModel for a model name; it loads lazily on first use"""
+    model_name = model_name or Config.MODEL_NAME
+    with _lock:
+        model = _models.get(model_name)
+        if model is None:
+            model = _models[model_name] = LlamaModel(model_name)
+        return model
+
+def preload(model_name: Optional[str] = None, warm_up: bool = True,
+            background: bool = False) -> Optional[threading.Thread]:
+    """Load (and optionally warm up) a model ahead of the first request; runs once per model"""
+    model_name = model_name or Config.MODEL_NAME
+    model = get_llama_model(model_name)
+    with _lock:
+        if model_name in _preloaded:
+            return None
+        _preloaded.add(model_name)
+
+    def load():
+        started = time.perf_counter()
+        if warm_up:
+            model.warm_up()
+        else:
+            model.ensure_loaded()
+        _timings["preload"] = time.perf_counter() - started
+
+    if not background:
+        load()
+        return None
+    thread = threading.Thread(target=load, name="model-preload", daemon=True)
+    thread.start()
+    return thread
+
+def record_timing(stage: str, seconds: float):
+    """Record a startup stage duration for the startup report"""
+    _timings[stage] = seconds
+
+def startup_report() -> Dict[str, float]:
+    """Startup stage durations in seconds, including per-model load timings"""
+    report = dict(_timings)
+    with _lock:
+        for model_name, model in _models.items():
+            for stage, seconds in model.load_timings.items():
+                report[f"{model_name}:{stage}"] = seconds
+    return report
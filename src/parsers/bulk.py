@@ -0,0 +1,122 @@
+from typing import Dict, Any, Iterator, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import os
+import signal
+import tarfile
+import time
+import zipfile
+
+from config.config import Config
+from parsers.resume_parser import ResumeParser
+
+# One parser per worker process
+_parser = None
+
+def _parse_one(source: str, data: Optional[bytes], timeout: Optional[float]) -> Dict[str, Any]:
+    """Parse one file inside a worker process, isolating failures and timeouts"""
+    global _parser
+    if _parser is None:
+        _parser = ResumeParser()
+
+    def on_timeout(signum, frame):
+        raise TimeoutError(f"Parsing took longer than {timeout}s")
+
+    # SIGALRM interrupts the pure-Python PDF extraction; unavailable on Windows
+    use_alarm = bool(timeout) and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, on_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        if data is not None:
+            # Archive members: detect the format from the bytes themselves
+            resume = _parser.parse_bytes(data)
+        else:
+            resume = _parser.parse_file(source, source.lower())
+        return {"source": source, "ok": True, "resume": resume}
+    except Exception as e:
+        return {"source": source, "ok": False, "error": f"{type(e).__name__}: {e}"}
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+class BulkIngestor:
+    """Parse a directory or archive of resumes in a process pool
+
+    Results are yielded as they complete, with at most ``max_pending`` files
+    in flight so memory stays bounded regardless of the dump size.
+    """
+
+    def __init__(self, workers: Optional[int] = None, timeout: Optional[float] = 60,
+                 max_pending: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.max_pending = max_pending or self.workers * 4
+        self.stats = {"files": 0, "parsed": 0, "failed": 0, "seconds": 0.0, "files_per_sec": 0.0}
+
+    def run(self, path: str) -> Iterator[Dict[str, Any]]:
+        """Yield one result dict per resume file found under path"""
+        self.stats = {"files": 0, "parsed": 0, "failed": 0, "seconds": 0.0, "files_per_sec": 0.0}
+        started = time.perf_counter()
+        sources = self._iter_sources(path)
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            pending = {}
+            exhausted = False
+            while pending or not exhausted:
+                # Keep the pool fed without reading the whole dump into memory
+                while not exhausted and len(pending) < self.max_pending:
+                    try:
+                        source, data = next(sources)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    future = executor.submit(_parse_one, source, data, self.timeout)
+                    pending[future] = source
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    source = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # The worker itself died (e.g. out of memory)
+                        result = {"source": source, "ok": False, "error": f"{type(e).__name__}: {e}"}
+                    self._record(result, started)
+                    yield result
+
+    def _record(self, result: Dict[str, Any], started: float):
+        self.stats["files"] += 1
+        self.stats["parsed" if result["ok"] else "failed"] += 1
+        self.stats["seconds"] = time.perf_counter() - started
+        if self.stats["seconds"] > 0:
+            self.stats["files_per_sec"] = self.stats["files"] / self.stats["seconds"]
+
+    def _iter_sources(self, path: str) -> Iterator[Tuple[str, Optional[bytes]]]:
+        """Yield (source name, bytes or None for on-disk files) for every resume under path"""
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if self._is_supported(name):
+                        yield os.path.join(root, name), None
+        elif self._is_supported(path):
+            # Checked before archives since a .docx is itself a zip file
+            yield path, None
+        elif zipfile.is_zipfile(path):
+            with zipfile.ZipFile(path) as archive:
+                for info in archive.infolist():
+                    if not info.is_dir() and self._is_supported(info.filename):
+                        yield f"{path}:{info.filename}", archive.read(info)
+        elif tarfile.is_tarfile(path):
+            with tarfile.open(path) as archive:
+                for member in archive:
+                    if member.isfile() and self._is_supported(member.name):
+                        yield f"{path}:{member.name}", archive.extractfile(member).read()
+        else:
+            raise ValueError(f"Not a directory, archive or supported resume file: {path}")
+
+    @staticmethod
+    def _is_supported(name: str) -> bool:
+        return os.path.splitext(name)[1].lower() in Config.ALLOWED_EXTENSIONS
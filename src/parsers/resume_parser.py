@@ -1,77 +1,194 @@
 import PyPDF2
 from docx import Document
-from typing import Dict, Any, List
-import re
+from typing import Dict, List, BinaryIO, Callable, Optional, Union
+import hashlib
+import io
+import threading
+import zipfile
+
+from config.config import Config
+from matching.skills import get_taxonomy
+from parsers.segmenter import resume_segmenter, split_items, split_lines
+from storage.records import ParsedResume
+from utils.cache import TieredCache, make_key
+from utils.metrics import metrics
+
+PDF_CONTENT_TYPE = "application/pdf"
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+class _MemoryViewStream(io.RawIOBase):
+    """Seekable read-only stream over a memoryview, so parsers can read it without a copy"""
+    
+    def __init__(self, view: memoryview):
+        self._view = view
+        self._position = 0
+        
+    def readable(self) -> bool:
+        return True
+        
+    def seekable(self) -> bool:
+        return True
+        
+    def readinto(self, buffer) -> int:
+        end = min(self._position + len(buffer), len(self._view))
+        size = max(end - self._position, 0)
+        buffer[:size] = self._view[self._position:end]
+        self._position += size
+        return size
+        
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._position = offset
+        elif whence == io.SEEK_CUR:
+            self._position += offset
+        else:
+            self._position = len(self._view) + offset
+        return self._position
+        
+    def tell(self) -> int:
+        return self._position
+
+_parse_cache = None
+_parse_cache_lock = threading.Lock()
+
+def get_parse_cache() -> TieredCache:
+    """Process-wide parse cache at Config.PARSE_CACHE_PATH, shared by every ResumeParser
+
+    The app creates a parser per rerun; sharing the cache keeps its hit-rate
+    gauge registered once and its counts from resetting.
+    """
+    global _parse_cache
+    with _parse_cache_lock:
+        if _parse_cache is None:
+            cache = TieredCache(
+                Config.PARSE_CACHE_PATH,
+                memory_entries=Config.PARSE_CACHE_MEMORY_ENTRIES,
+                max_entries=Config.PARSE_CACHE_MAX_ENTRIES,
+                max_bytes=Config.PARSE_CACHE_MAX_BYTES
+            )
+            metrics.register_gauge("cache_hit_rate", lambda: cache.stats()["hit_rate"], {"cache": "parse"})
+            _parse_cache = cache
+        return _parse_cache
 
 class ResumeParser:
-    def __init__(self):
-        self.skills_pattern = re.compile(r'(?i)(?:skills|technical skills|expertise):\s*(.*?)(?=\n\n|\Z)')
-        self.experience_pattern = re.compile(r'(?i)(?:experience|work history):\s*(.*?)(?=\n\n|\Z)')
-        self.education_pattern = re.compile(r'(?i)(?:education|academic background):\s*(.*?)(?=\n\n|\Z)')
+    # Bump when extraction logic changes so cached parse results are invalidated
+    PARSER_VERSION = 3
+    
+    def __init__(self, cache: Optional[TieredCache] = None):
+        # Parse results keyed by the SHA-256 of the file bytes
+        self.cache = cache if cache is not None else get_parse_cache()
         
-    def parse_resume(self, file_path: str) -> Dict[str, Any]:
+    def parse_resume(self, file_path: str) -> ParsedResume:
         """Parse resume from file and extract information"""
-        if file_path.endswith('.pdf'):
-            return self._parse_pdf(file_path)
-        elif file_path.endswith('.docx'):
-            return self._parse_docx(file_path)
+        return self.parse_file(file_path, file_path)
+        
+    def parse_file(self, source: Union[str, BinaryIO], file_name: str) -> ParsedResume:
+        """Parse resume from a path or binary stream, dispatching on the file name"""
+        if file_name.endswith('.pdf'):
+            parse = self._parse_pdf
+        elif file_name.endswith('.docx'):
+            parse = self._parse_docx
         else:
             raise ValueError("Unsupported file format")
             
-    def _parse_pdf(self, file_path: str) -> Dict[str, Any]:
+        if isinstance(source, str):
+            with open(source, 'rb') as file:
+                data = file.read()
+        else:
+            data = source.read()
+        return self._parse_cached(memoryview(data), parse)
+        
+    def parse_bytes(self, buffer: Union[bytes, bytearray, memoryview, BinaryIO],
+                    content_type: Optional[str] = None) -> ParsedResume:
+        """Parse resume from memory, detecting the format from its magic bytes
+
+        A BytesIO (such as a Streamlit upload) is read through its buffer without
+        copying. content_type is only a fallback when the magic bytes are inconclusive.
+        """
+        if isinstance(buffer, io.BytesIO):
+            view = buffer.getbuffer()
+        elif isinstance(buffer, (bytes, bytearray, memoryview)):
+            view = memoryview(buffer)
+        else:
+            view = memoryview(buffer.read())
+        view = view.cast("B")
+        return self._parse_cached(view, self._detect_format(view, content_type))
+        
+    def _detect_format(self, view: memoryview, content_type: Optional[str]) -> Callable[[BinaryIO], ParsedResume]:
+        """Pick the parser from the file signature rather than its name"""
+        head = bytes(view[:1024])
+        # PDF readers accept junk before the header, so search the first KB
+        if b"%PDF-" in head:
+            return self._parse_pdf
+        # DOCX is a zip (OOXML) package containing the main document part
+        if head.startswith(b"PK\x03\x04"):
+            try:
+                with zipfile.ZipFile(_MemoryViewStream(view)) as package:
+                    if "word/document.xml" in package.namelist():
+                        return self._parse_docx
+            except zipfile.BadZipFile:
+                pass
+        if content_type == PDF_CONTENT_TYPE:
+            return self._parse_pdf
+        if content_type == DOCX_CONTENT_TYPE:
+            return self._parse_docx
+        raise ValueError("Unsupported file format")
+        
+    def _parse_cached(self, view: memoryview, parse: Callable[[BinaryIO], ParsedResume]) -> ParsedResume:
+        """Parse file bytes, serving repeats from the cache"""
+        # Re-uploads and shared candidates skip extraction entirely
+        key = make_key("resume", self.PARSER_VERSION, hashlib.sha256(view).hexdigest())
+        cached = self.cache.get(key)
+        if cached is not None:
+            return ParsedResume.from_dict(cached)
+            
+        result = parse(_MemoryViewStream(view))
+        self.cache.set(key, result.to_dict())
+        return result
+            
+    def _parse_pdf(self, source: Union[str, BinaryIO]) -> ParsedResume:
         """Parse PDF resume"""
-        text = ""
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page in pdf_reader.pages:
-                text += page.extract_text()
+        with metrics.span("parser.pdf_extraction"):
+            pdf_reader = PyPDF2.PdfReader(source)
+            # Join once instead of repeated concatenation, which is quadratic on long CVs
+            text = "".join(page.extract_text() for page in pdf_reader.pages)
         return self._extract_information(text)
         
-    def _parse_docx(self, file_path: str) -> Dict[str, Any]:
+    def _parse_docx(self, source: Union[str, BinaryIO]) -> ParsedResume:
         """Parse DOCX resume"""
-        doc = Document(file_path)
-        text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
+        with metrics.span("parser.docx_extraction"):
+            doc = Document(source)
+            text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
         return self._extract_information(text)
         
-    def _extract_information(self, text: str) -> Dict[str, Any]:
+    @metrics.timed("parser.regex_extraction")
+    def _extract_information(self, text: str) -> ParsedResume:
         """Extract information from resume text"""
-        return {
-            "skills": self._extract_skills(text),
-            "experience": self._extract_experience(text),
-            "education": self._extract_education(text),
-            "raw_text": text
-        }
+        # One pass splits the text into its headed sections
+        sections = resume_segmenter.segment(text)
+        return ParsedResume(
+            summary=sections.get("summary", ""),
+            skills=self._extract_skills(sections.get("skills", "")),
+            canonical_skills=get_taxonomy().canonical_names(text),
+            experience=self._extract_experience(sections.get("experience", "")),
+            education=self._extract_education(sections.get("education", "")),
+            certifications=split_lines(sections.get("certifications", "")),
+            projects=split_lines(sections.get("projects", "")),
+            raw_text=text
+        )
         
-    def _extract_skills(self, text: str) -> List[str]:
-        """Extract skills from resume text"""
-        match = self.skills_pattern.search(text)
-        if match:
-            skills_text = match.group(1)
-            return [skill.strip() for skill in skills_text.split(',')]
-        return []
+    def _extract_skills(self, skills_text: str) -> List[str]:
+        """Extract skills from the skills section"""
+        # Drop group labels such as "Languages:" or "Dev Tools:"
+        lines = [line.split(":", 1)[-1] for line in skills_text.split("\n")]
+        return split_items("\n".join(lines))
         
-    def _extract_experience(self, text: str) -> List[Dict[str, str]]:
-        """Extract work experience from resume text"""
-        match = self.experience_pattern.search(text)
-        if match:
-            experience_text = match.group(1)
-            # Basic implementation - can be enhanced with more sophisticated parsing
-            experiences = []
-            for exp in experience_text.split('\n'):
-                if exp.strip():
-                    experiences.append({"text": exp.strip()})
-            return experiences
-        return []
+    def _extract_experience(self, experience_text: str) -> List[Dict[str, str]]:
+        """Extract work experience from the experience section"""
+        # Basic implementation - one entry per line
+        return [{"text": line} for line in split_lines(experience_text)]
         
-    def _extract_education(self, text: str) -> List[Dict[str, str]]:
-        """Extract education information from resume text"""
-        match = self.education_pattern.search(text)
-        if match:
-            education_text = match.group(1)
-            # Basic implementation - can be enhanced with more sophisticated parsing
-            education = []
-            for edu in education_text.split('\n'):
-                if edu.strip():
-                    education.append({"text": edu.strip()})
-            return education
-        return [] 
\ No newline at end of file
+    def _extract_education(self, education_text: str) -> List[Dict[str, str]]:
+        """Extract education information from the education section"""
+        # Basic implementation - one entry per line
+        return [{"text": line} for line in split_lines(education_text)]
@@ -0,0 +1,165 @@
+from typing import Dict, Iterable, List, Tuple
+import re
+
+# Section key -> headings that start it (matched case-insensitively, whole line or before a colon)
+RESUME_HEADINGS = {
+    "summary": ["summary", "professional summary", "profile", "professional profile", "objective",
+                "career objective", "about me"],
+    "skills": ["skills", "technical skills", "expertise", "core competencies", "key skills",
+               "skills and expertise", "competencies"],
+    "experience": ["experience", "work experience", "work history", "professional experience",
+                   "employment history", "employment", "career history"],
+    "education": ["education", "academic background", "academic qualifications", "education and training",
+                  "qualifications"],
+    "certifications": ["certifications", "certificates", "licenses and certifications",
+                       "certifications and licenses", "licenses", "accreditations"],
+    "projects": ["projects", "project", "personal projects", "key projects", "selected projects", "portfolio",
+                 "project and work", "projects and work", "projects and experience"],
+    "awards": ["awards", "honors", "honors and awards", "achievements"],
+    "languages": ["languages", "spoken languages"],
+    "publications": ["publications", "papers"]
+}
+
+# Headings that are also common labels inside a section ("Languages: Java, Python"
+# under Skills), so they only count on a line of their own
+RESUME_STANDALONE_HEADINGS = {"languages", "spoken languages", "employment", "qualifications", "profile",
+                              "licenses", "portfolio", "papers", "expertise", "competencies", "project"}
+
+# Sections of a job description; "about", "benefits", "equal_opportunity" and
+# "application" are boilerplate the job analysis does not need
+JOB_HEADINGS = {
+    "overview": ["job summary", "role overview", "position summary", "the role", "about the role",
+                 "job description", "position overview"],
+    "responsibilities": ["responsibilities", "key responsibilities", "duties", "what you will do",
+                         "what you'll do", "your role", "the job"],
+    "requirements": ["requirements", "qualifications", "minimum qualifications", "required qualifications",
+                     "required skills", "what you bring", "what we are looking for",
+                     "what we're looking for", "who you are", "must have", "must haves"],
+    "nice_to_have": ["nice to have", "nice-to-have", "preferred qualifications", "preferred skills",
+                     "bonus points", "pluses", "desired skills"],
+    "education": ["education", "education requirements"],
+    "about": ["about us", "about the company", "who we are", "company overview", "our company",
+              "our mission"],
+    "benefits": ["benefits", "perks", "perks and benefits", "what we offer", "compensation",
+                 "compensation and benefits", "salary"],
+    "equal_opportunity": ["equal opportunity", "equal opportunity employer", "equal employment opportunity",
+                          "eeo statement", "diversity and inclusion"],
+    "application": ["how to apply", "application process", "to apply"]
+}
+
+# Numbering, bullets and markdown emphasis around a heading ("1. **Skills:**")
+_DECORATION = " \t#*_-•>"
+_NUMBERING = re.compile(r"^\(?\d+[.)]\s*")
+# List bullet at the start of a line (of a whole body, or of one item)
+_BULLET = re.compile(r"^[^\S\n]*(?:[-*•·‣▪◦]|\(?\d+[.)])[^\S\n]+", re.MULTILINE)
+_LIST_SEPARATORS = re.compile(r"[,;|•\n]")
+
+def _normalize_heading(text: str) -> str:
+    text = _NUMBERING.sub("", text.strip(_DECORATION))
+    text = text.strip(_DECORATION).rstrip(":").strip(_DECORATION).lower().replace("&", "and")
+    return " ".join(text.split())
+
+def split_lines(body: str) -> List[str]:
+    """Non-empty lines of a section with list bullets removed"""
+    return [line for line in (line.strip() for line in _BULLET.sub("", body).split("\n")) if line]
+
+def split_items(body: str) -> List[str]:
+    """Comma/semicolon/line separated items of a section (e.g. a skills list)"""
+    return [item for item in (_BULLET.sub("", item).strip() for item in _LIST_SEPARATORS.split(body)) if item]
+
+class Segmenter:
+    """Splits a document into headed sections in one pass over its lines
+
+    A line starts a section when, ignoring numbering and bullets, it is a known
+    heading or a known heading followed by a colon and inline content
+    ("Skills: Python, SQL"). A section runs until the next heading, so
+    multi-paragraph sections are kept whole. Each line costs one dictionary
+    lookup, so the whole document is segmented in linear time.
+    """
+
+    # Longest text before a colon that is still considered as a heading
+    MAX_HEADING_LENGTH = 48
+
+    def __init__(self, headings: Dict[str, Iterable[str]], standalone: Iterable[str] = ()):
+        self._headings = {}
+        for key, aliases in headings.items():
+            for alias in [key] + list(aliases):
+                self._headings.setdefault(_normalize_heading(alias), key)
+        # Headings followed by inline content ("Skills: Python")
+        standalone = {_normalize_heading(alias) for alias in standalone}
+        self._inline_headings = {
+            alias: key for alias, key in self._headings.items() if alias not in standalone
+        }
+
+    def spans(self, text: str) -> List[Tuple[str, int, int]]:
+        """(section key, body start, body end) for every heading, in document order"""
+        spans = []
+        position = 0
+        length = len(text)
+        while position < length:
+            line_end = text.find("\n", position)
+            if line_end == -1:
+                line_end = length
+            key, body_start = self._match_heading(text, position, line_end)
+            if key is not None:
+                if spans:
+                    spans[-1] = (spans[-1][0], spans[-1][1], position)
+                spans.append((key, body_start, length))
+            position = line_end + 1
+        return spans
+
+    def segment(self, text: str) -> Dict[str, str]:
+        """Section key -> stripped body; the first occurrence of a repeated heading wins"""
+        sections = {}
+        for key, start, end in self.spans(text):
+            if key not in sections:
+                # Closing emphasis of a "**Skills:**" heading
+                sections[key] = text[start:end].strip().lstrip("*_").strip()
+        return sections
+
+    def _match_heading(self, text: str, start: int, end: int):
+        colon = text.find(":", start, end)
+        if colon != -1 and colon - start <= self.MAX_HEADING_LENGTH:
+            key = self._inline_headings.get(_normalize_heading(text[start:colon]))
+            if key is not None:
+                return key, colon + 1
+        if end - start <= self.MAX_HEADING_LENGTH:
+            key = self._headings.get(_normalize_heading(text[start:end]))
+            if key is not None:
+                return key, end
+        return None, end
+
+resume_segmenter = Segmenter(RESUME_HEADINGS, standalone=RESUME_STANDALONE_HEADINGS)
+job_segmenter = Segmenter(JOB_HEADINGS, standalone={"education", "salary", "the job", "your role"})
+
+# The LLM analyses have a fixed format set by the prompts (a "Heading:" line,
+# items, a blank line), so a str.find per heading is all they need; a full
+# segmentation costs several times more than these short outputs are worth.
+def find_section(text: str, heading: str) -> str:
+    """Body of an analysis section: inline content after the heading, then lines up to the next blank line"""
+    start = text.find(heading)
+    if start == -1:
+        return ""
+    start += len(heading)
+    line_end = text.find("\n", start)
+    if line_end == -1:
+        line_end = len(text)
+    # Colon and closing emphasis of a "**Skills:**" heading
+    inline = text[start:line_end].strip().lstrip("*_:").strip()
+    # A blank line right after a bare heading does not end its section
+    end = text.find("\n\n", line_end if inline else line_end + 1)
+    if end == -1:
+        end = len(text)
+    return text[start:end].strip().lstrip("*_:").strip()
+
+def sections_complete(text: str, sections: List[str]) -> bool:
+    """True once every section heading appears and the last one is closed by a blank line"""
+    # Same heading recognition as find_section
+    positions = [text.find(section) for section in sections]
+    if min(positions) == -1:
+        return False
+    body_start = text.find("\n", max(positions))
+    if body_start == -1:
+        return False
+    body = text[body_start:].lstrip()
+    return "\n\n" in body
@@ -0,0 +1,3 @@
+"""
+Pipeline package for AI Recruiter Agency
+"""
@@ -0,0 +1,135 @@
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import queue
+import time
+
+from config.config import Config
+from matching.matcher import ResumeMatcher
+from models.llama_model import LlamaModel
+from parsers.resume_parser import ResumeParser
+from utils.metrics import metrics, profiled
+
+# An uploaded resume: (name, bytes or binary buffer, content type)
+Upload = Tuple[str, Any, Optional[str]]
+
+class PipelineOrchestrator:
+    """Runs the resume side and the job side of an analysis concurrently
+
+    Parsing the uploads and analyzing the job description do not depend on
+    each other, so they run in worker threads (the LLM releases the GIL while
+    generating), and resumes are matched as soon as both they and the job
+    analysis are ready. Latency is then about max(parse, LLM) rather than
+    their sum. With many uploads ("batch job" mode) the job is analyzed once,
+    and the resumes that are ready together (typically all those parsed
+    while the LLM was generating) are scored in one rank_candidates pass.
+    """
+
+    def __init__(self, resume_parser: ResumeParser, llama_model: LlamaModel, matcher: ResumeMatcher,
+                 workers: Optional[int] = None):
+        self.resume_parser = resume_parser
+        self.llama_model = llama_model
+        self.matcher = matcher
+        self.workers = workers or Config.PIPELINE_WORKERS
+
+    def run(self, job_description: str, uploads: List[Upload]) -> Iterator[Dict[str, Any]]:
+        """Yield progress events in completion order
+
+        Every event is a dict with an "event" key:
+
+        - ``job_token``: ``text``, the next piece of the streamed job analysis
+        - ``job_analyzed``: ``job_requirements``, ``seconds``
+        - ``job_failed``: ``error``; no resume is matched
+        - ``resume_parsed``: ``index``, ``name``, ``resume``, ``seconds``
+        - ``resume_failed``: ``index``, ``name``, ``error``
+        - ``match``: ``index``, ``name``, ``scores``
+        - ``done``: ``ranking`` (``index``, ``name``, ``overall_match`` best first), ``seconds``
+
+        Events are produced by worker threads but yielded on the caller's
+        thread, so a UI can render them directly.
+        """
+        started = time.perf_counter()
+        events = queue.Queue()
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pipeline")
+        try:
+            self._submit(executor, self._analyze_job, job_description, events)
+            for index, upload in enumerate(uploads):
+                self._submit(executor, self._parse, index, upload, events)
+
+            # One completion event per task; job tokens arrive in between
+            remaining = 1 + len(uploads)
+            job_requirements = None
+            job_failed = False
+            waiting = []
+            ranking = []
+            while remaining:
+                event = events.get()
+                kind = event["event"]
+                if kind != "job_token":
+                    remaining -= 1
+                yield event
+
+                if kind == "job_analyzed":
+                    job_requirements = event["job_requirements"]
+                elif kind == "job_failed":
+                    job_failed = True
+                    waiting = []
+                elif kind == "resume_parsed" and not job_failed:
+                    waiting.append((event["index"], event["name"], event["resume"]))
+
+                # Match everything parsed so far in one pass once no other event is ready,
+                # so resumes still stream in one by one when they finish apart
+                if job_requirements is not None and waiting and (events.empty() or not remaining):
+                    yield from self._match(waiting, job_requirements, ranking)
+                    waiting = []
+
+            ranking.sort(key=lambda entry: entry[2], reverse=True)
+            yield {"event": "done", "ranking": ranking, "seconds": time.perf_counter() - started}
+        finally:
+            # If the caller stops early, running tasks finish in the background
+            executor.shutdown(wait=False)
+
+    @staticmethod
+    def _submit(executor: ThreadPoolExecutor, fn: Callable, *args: Any):
+        # Each task runs in a copy of this context so its spans join the caller's trace,
+        # and its profile the caller's profile() block
+        executor.submit(contextvars.copy_context().run, profiled, fn, *args)
+
+    def _analyze_job(self, job_description: str, events: queue.Queue):
+        started = time.perf_counter()
+        try:
+            with metrics.span("pipeline.analyze_job"):
+                job_requirements = self.llama_model.analyze_job_requirements(
+                    job_description, on_token=lambda text: events.put({"event": "job_token", "text": text})
+                )
+        except Exception as e:
+            events.put({"event": "job_failed", "error": f"{type(e).__name__}: {e}"})
+            return
+        events.put({"event": "job_analyzed", "job_requirements": job_requirements,
+                    "seconds": time.perf_counter() - started})
+
+    def _parse(self, index: int, upload: Upload, events: queue.Queue):
+        name, buffer, content_type = upload
+        started = time.perf_counter()
+        try:
+            with metrics.span("pipeline.parse_resume"):
+                resume = self.resume_parser.parse_bytes(buffer, content_type)
+        except Exception as e:
+            events.put({"event": "resume_failed", "index": index, "name": name,
+                        "error": f"{type(e).__name__}: {e}"})
+            return
+        events.put({"event": "resume_parsed", "index": index, "name": name, "resume": resume,
+                    "seconds": time.perf_counter() - started})
+
+    def _match(self, batch: List[Tuple[int, str, Dict[str, Any]]], job_requirements: Dict[str, Any],
+               ranking: List[Tuple[int, str, float]]) -> List[Dict[str, Any]]:
+        """Score parsed resumes against the job in one vectorized pass; one match event each"""
+        with metrics.span("pipeline.match"):
+            ranked = self.matcher.rank_candidates(job_requirements, [resume for _, _, resume in batch],
+                                                  top_k=len(batch))
+        matches = []
+        for scores in ranked:
+            index, name, _ = batch[scores.pop("index")]
+            ranking.append((index, name, scores["overall_match"]))
+            matches.append({"event": "match", "index": index, "name": name, "scores": scores})
+        return matches
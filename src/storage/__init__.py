@@ -0,0 +1,3 @@
+"""
+Storage package for AI Recruiter Agency
+"""
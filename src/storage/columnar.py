@@ -0,0 +1,166 @@
+from typing import Any, Iterator, List, Mapping, Optional, Type
+from array import array
+import json
+import os
+import numpy as np
+
+from storage.records import RECORD_TYPES, ParsedResume, Record
+
+FORMAT_VERSION = 1
+META_FILE = "meta.json"
+
+class ColumnarStore:
+    """Column-wise store of many records (e.g. parsed resumes) for large candidate sets
+
+    Every distinct string is stored once in a string pool (one UTF-8 blob
+    plus an offset array). Text fields are a column of int32 string IDs per
+    row; list fields are a flat int32 ID column plus int64 row offsets, as in
+    a CSR matrix. A saved store is a directory of ``.npy`` files that load
+    memory-mapped, so opening it copies nothing and rows are decoded only
+    when read. ``store[i]`` returns a record, which reads like the old dict.
+    """
+
+    def __init__(self, record_type: Type[Record] = ParsedResume, keep_raw_text: bool = False):
+        self.record_type = record_type
+        # raw_text is rarely shared and dominates the size of a resume
+        self.fields = {
+            field: kind for field, kind in record_type.FIELDS.items()
+            if keep_raw_text or field != "raw_text"
+        }
+        self.read_only = False
+        self._pool = {}
+        self._strings = []
+        self._ids = array("i")
+        self._columns = {field: array("i") for field in self.fields}
+        self._offsets = {
+            field: array("q", [0]) for field, kind in self.fields.items() if kind in ("list", "items")
+        }
+        self._blob = None
+        self._string_offsets = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, row: int) -> Record:
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        values = {}
+        for field, kind in self.fields.items():
+            column = self._columns[field]
+            if field in self._offsets:
+                offsets = self._offsets[field]
+                values[field] = [self._string(int(i)) for i in column[offsets[row]:offsets[row + 1]]]
+            else:
+                values[field] = self._string(int(column[row]))
+        return self.record_type(**values)
+
+    def __iter__(self) -> Iterator[Record]:
+        for row in range(len(self)):
+            yield self[row]
+
+    def candidate_id(self, row: int) -> str:
+        return self._string(int(self._ids[row]))
+
+    def add(self, candidate_id: str, record: Mapping[str, Any]):
+        """Append one record (a dict is converted first)"""
+        if self.read_only:
+            raise ValueError("A store loaded from disk is read-only")
+        record = self.record_type.from_dict(record)
+        self._ids.append(self._intern(candidate_id))
+        for field, kind in self.fields.items():
+            value = getattr(record, field)
+            if field in self._offsets:
+                column = self._columns[field]
+                column.extend(self._intern(item) for item in value)
+                self._offsets[field].append(len(column))
+            else:
+                self._columns[field].append(self._intern(value))
+
+    def nbytes(self) -> int:
+        """Bytes held by the columns and the string pool"""
+        arrays = [self._ids] + list(self._columns.values()) + list(self._offsets.values())
+        if self.read_only:
+            return sum(column.nbytes for column in arrays) + self._blob.nbytes + self._string_offsets.nbytes
+        return (sum(column.itemsize * len(column) for column in arrays) +
+                sum(len(string.encode("utf-8")) + 8 for string in self._strings))
+
+    def save(self, path: str):
+        """Write the store as .npy columns; the metadata file is written last"""
+        os.makedirs(path, exist_ok=True)
+        blob, string_offsets = self._string_arrays()
+        arrays = {"strings": blob, "string_offsets": string_offsets, "ids": self._ids}
+        for field in self.fields:
+            arrays[field] = self._columns[field]
+            if field in self._offsets:
+                arrays[f"{field}_offsets"] = self._offsets[field]
+        for name, column in arrays.items():
+            tmp_path = os.path.join(path, f"{name}.tmp.npy")
+            np.save(tmp_path, np.asarray(column))
+            os.replace(tmp_path, os.path.join(path, f"{name}.npy"))
+        meta = {
+            "version": FORMAT_VERSION,
+            "record_type": self.record_type.__name__,
+            "fields": self.fields,
+            "rows": len(self)
+        }
+        tmp_path = os.path.join(path, META_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, os.path.join(path, META_FILE))
+
+    @staticmethod
+    def load(path: str, mmap: bool = True) -> "ColumnarStore":
+        """Open a saved store, memory-mapped by default"""
+        with open(os.path.join(path, META_FILE), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported store format in {path}")
+        store = ColumnarStore(RECORD_TYPES[meta["record_type"]], keep_raw_text=True)
+        store.fields = meta["fields"]
+        store.read_only = True
+
+        def column(name: str) -> np.ndarray:
+            return np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r" if mmap else None)
+
+        store._blob = column("strings")
+        store._string_offsets = column("string_offsets")
+        store._ids = column("ids")
+        store._columns = {field: column(field) for field in store.fields}
+        store._offsets = {
+            field: column(f"{field}_offsets") for field, kind in store.fields.items() if kind in ("list", "items")
+        }
+        store._pool = None
+        store._strings = None
+        return store
+
+    def _intern(self, string: str) -> int:
+        string_id = self._pool.get(string)
+        if string_id is None:
+            string_id = self._pool[string] = len(self._strings)
+            self._strings.append(string)
+        return string_id
+
+    def _string(self, string_id: int) -> str:
+        if not self.read_only:
+            return self._strings[string_id]
+        start, end = self._string_offsets[string_id], self._string_offsets[string_id + 1]
+        return self._blob[start:end].tobytes().decode("utf-8")
+
+    def _string_arrays(self):
+        """(UTF-8 blob, offsets) of the string pool"""
+        if self.read_only:
+            return self._blob, self._string_offsets
+        encoded = [string.encode("utf-8") for string in self._strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(data) for data in encoded], out=offsets[1:])
+        return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+def build_store(records: List[Mapping[str, Any]], candidate_ids: Optional[List[str]] = None,
+                record_type: Type[Record] = ParsedResume, keep_raw_text: bool = False) -> ColumnarStore:
+    """Columnar store of records, with candidate IDs defaulting to row numbers"""
+    store = ColumnarStore(record_type, keep_raw_text=keep_raw_text)
+    for row, record in enumerate(records):
+        store.add(candidate_ids[row] if candidate_ids is not None else str(row), record)
+    return store
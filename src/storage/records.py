@@ -0,0 +1,123 @@
+from typing import Dict, Any, Iterator, Mapping, Optional
+from collections.abc import Mapping as MappingABC
+import sys
+
+# Field kinds: how a field is stored and how the dict view presents it
+#   text         str                   -> str
+#   list         tuple of interned str -> list of str
+#   items        tuple of str          -> list of {"text": str}
+#   description  str                   -> {"description": str}
+FIELD_KINDS = ("text", "list", "items", "description")
+
+def _item_text(item: Any) -> str:
+    return item.get("text", "") if isinstance(item, MappingABC) else str(item)
+
+def _pack(kind: str, value: Any):
+    """Compact stored form of a field value"""
+    if kind == "list":
+        # Skill names repeat across candidates, so share one string object each
+        return tuple(sys.intern(str(item)) for item in value or ())
+    if kind == "items":
+        return tuple(_item_text(item) for item in value or ())
+    if kind == "description":
+        if isinstance(value, MappingABC):
+            value = value.get("description", "")
+        return str(value or "")
+    return str(value or "")
+
+def _view(kind: str, value: Any) -> Any:
+    """Dict-era shape of a stored field value"""
+    if kind == "list":
+        return list(value)
+    if kind == "items":
+        return [{"text": text} for text in value]
+    if kind == "description":
+        return {"description": value}
+    return value
+
+class Record(MappingABC):
+    """Fixed-field record that reads like the dict it replaces
+
+    Fields are stored in ``__slots__`` (no per-instance ``__dict__``), lists
+    as tuples of strings. ``record["skills"]``, ``.get()``, ``dict(record)``
+    and ``==`` against a dict behave as before; values are returned in their
+    dict-era shape, built on access. Use the attributes for the compact
+    stored form.
+    """
+
+    __slots__ = ()
+    # Field name -> kind (see FIELD_KINDS), in dict key order
+    FIELDS: Dict[str, str] = {}
+
+    def __init__(self, **values: Any):
+        for field, kind in self.FIELDS.items():
+            setattr(self, field, _pack(kind, values.get(field)))
+
+    @classmethod
+    def from_dict(cls, data: Optional[Mapping[str, Any]]) -> "Record":
+        """Record from a dict (or record); unknown keys are dropped"""
+        if isinstance(data, cls):
+            return data
+        data = data or {}
+        return cls(**{field: data.get(field) for field in cls.FIELDS})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict copy, e.g. for JSON"""
+        return {field: self[field] for field in self.FIELDS}
+
+    def __getitem__(self, key: str) -> Any:
+        kind = self.FIELDS.get(key)
+        if kind is None:
+            raise KeyError(key)
+        return _view(kind, getattr(self, key))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.FIELDS)
+
+    def __len__(self) -> int:
+        return len(self.FIELDS)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.FIELDS)
+        return f"{type(self).__name__}({fields})"
+
+class ParsedResume(Record):
+    """ResumeParser output"""
+
+    __slots__ = ("summary", "skills", "canonical_skills", "experience", "education",
+                 "certifications", "projects", "raw_text")
+    FIELDS = {
+        "summary": "text",
+        "skills": "list",
+        "canonical_skills": "list",
+        "experience": "items",
+        "education": "items",
+        "certifications": "list",
+        "projects": "list",
+        "raw_text": "text"
+    }
+
+class ResumeAnalysis(Record):
+    """LlamaModel resume analysis"""
+
+    __slots__ = ("skills", "experience", "education", "certifications", "projects")
+    FIELDS = {
+        "skills": "list",
+        "experience": "list",
+        "education": "list",
+        "certifications": "list",
+        "projects": "list"
+    }
+
+class JobRequirements(Record):
+    """LlamaModel job requirements analysis"""
+
+    __slots__ = ("required_skills", "required_experience", "required_education", "nice_to_have_skills")
+    FIELDS = {
+        "required_skills": "list",
+        "required_experience": "description",
+        "required_education": "description",
+        "nice_to_have_skills": "list"
+    }
+
+RECORD_TYPES = {record.__name__: record for record in (ParsedResume, ResumeAnalysis, JobRequirements)}
@@ -1,67 +1,139 @@
+import time
+_import_started = time.perf_counter()
+
 import streamlit as st
-import os
 import sys
 from pathlib import Path
-from typing import Dict, Any
-import json
+from typing import Dict, Any, List, Tuple
 
 # Add the src directory to the Python path
 current_dir = Path(__file__).resolve().parent
 project_root = current_dir.parent
 sys.path.append(str(project_root))
+# Repository root, for the top-level config package
+sys.path.append(str(project_root.parent))
 
 # Import using the correct path
+from config.config import Config
 from parsers.resume_parser import ResumeParser
-from models.llama_model import LlamaModel
+from models.registry import get_llama_model, preload, record_timing, startup_report
 from matching.matcher import ResumeMatcher
+from pipeline.orchestrator import PipelineOrchestrator
+from utils.metrics import metrics, peak_rss_bytes, profile
+
+record_timing("app_imports", time.perf_counter() - _import_started)
 
 class RecruiterApp:
     def __init__(self):
         self.resume_parser = ResumeParser()
-        self.llama_model = LlamaModel()
+        # Shared across sessions and reruns; loads on first analysis
+        self.llama_model = get_llama_model()
         self.matcher = ResumeMatcher()
+        self.orchestrator = PipelineOrchestrator(self.resume_parser, self.llama_model, self.matcher)
         
     def run(self):
         st.title("AI Recruiter Agency")
         st.write("Upload resumes and job descriptions to get matching scores")
         
-        # File uploaders
-        resume_file = st.file_uploader("Upload Resume (PDF or DOCX)", type=["pdf", "docx"])
+        # File uploaders; several resumes are ranked against the one job description
+        resume_files = st.file_uploader("Upload Resumes (PDF or DOCX)", type=["pdf", "docx"],
+                                        accept_multiple_files=True)
         job_description = st.text_area("Enter Job Description")
         
         if st.button("Analyze"):
-            if resume_file and job_description:
-                # Save uploaded file
-                resume_path = self._save_uploaded_file(resume_file)
-                
-                # Parse resume
-                resume_data = self.resume_parser.parse_resume(resume_path)
-                
-                # Analyze job requirements
-                job_requirements = self.llama_model.analyze_job_requirements(job_description)
-                
-                # Calculate match scores
-                scores = self.matcher.calculate_match_score(resume_data, job_requirements)
-                
-                # Display results
-                self._display_results(scores, resume_data, job_requirements)
-                
-                # Clean up
-                os.remove(resume_path)
+            if resume_files and job_description:
+                with metrics.trace() as spans, profile("analyze"):
+                    with metrics.span("app.total"):
+                        self._analyze(resume_files, job_description)
+                self._display_timings(spans)
+                if Config.METRICS_DUMP_PATH:
+                    metrics.dump(Config.METRICS_DUMP_PATH)
             else:
-                st.error("Please upload a resume and enter a job description")
+                st.error("Please upload at least one resume and enter a job description")
                 
-    def _save_uploaded_file(self, uploaded_file) -> str:
-        """Save uploaded file to temporary location"""
-        temp_dir = Path("temp")
-        temp_dir.mkdir(exist_ok=True)
+        self._display_startup_report()
+                
+    def _analyze(self, resume_files: List[Any], job_description: str):
+        """Parse the resumes and analyze the job concurrently, showing each stage as it completes"""
+        # Parsed straight from the upload buffers, no temp files
+        uploads = [(resume_file.name, resume_file, resume_file.type) for resume_file in resume_files]
+        
+        with st.expander("Live job analysis", expanded=True):
+            live_output = st.empty()
+        progress = st.empty()
+        ranking_table = st.empty()
+        streamed = []
+        resumes = {}
+        scores = {}
+        job_requirements = None
         
-        file_path = temp_dir / uploaded_file.name
-        with open(file_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
+        for event in self.orchestrator.run(job_description, uploads):
+            kind = event["event"]
+            if kind == "job_token":
+                streamed.append(event["text"])
+                live_output.text("".join(streamed))
+                continue
+            if kind == "job_analyzed":
+                job_requirements = event["job_requirements"]
+            elif kind == "job_failed":
+                st.error(f"Job analysis failed: {event['error']}")
+            elif kind == "resume_parsed":
+                resumes[event["index"]] = event["resume"]
+            elif kind == "resume_failed":
+                st.error(f"Could not parse {event['name']}: {event['error']}")
+            elif kind == "match":
+                scores[event["index"]] = event["scores"]
+                if len(uploads) > 1:
+                    self._display_ranking(ranking_table, uploads, scores)
+            progress.caption(
+                f"Job analysis: {'done' if job_requirements is not None else 'running'} | "
+                f"Parsed: {len(resumes)}/{len(uploads)} | Matched: {len(scores)}/{len(uploads)}"
+            )
             
-        return str(file_path)
+        if job_requirements is None or not scores:
+            return
+        if len(uploads) == 1:
+            self._display_results(scores[0], resumes[0], job_requirements)
+            return
+        # Batch job: details of every candidate, best match first
+        st.header("Candidates")
+        for index in sorted(scores, key=lambda i: scores[i]["overall_match"], reverse=True):
+            with st.expander(f"{uploads[index][0]} - {scores[index]['overall_match'] * 100:.1f}%"):
+                st.json({"scores": scores[index], "resume": dict(resumes[index])})
+        with st.expander("Job Requirements Analysis"):
+            st.json(dict(job_requirements))
         
+    def _display_ranking(self, placeholder, uploads: List[Tuple[str, Any, Any]], scores: Dict[int, Dict[str, float]]):
+        """Show the candidates matched so far, best first"""
+        order = sorted(scores, key=lambda i: scores[i]["overall_match"], reverse=True)
+        placeholder.table({
+            "Resume": [uploads[i][0] for i in order],
+            "Overall": [f"{scores[i]['overall_match'] * 100:.1f}%" for i in order],
+            "Skills": [f"{scores[i]['skills_match'] * 100:.1f}%" for i in order],
+            "Experience": [f"{scores[i]['experience_match'] * 100:.1f}%" for i in order],
+            "Education": [f"{scores[i]['education_match'] * 100:.1f}%" for i in order]
+        })
+        
+    def _display_timings(self, spans: List[Tuple[str, float]]):
+        """Show where the time of the last request went"""
+        with st.expander("Timing breakdown"):
+            totals = {}
+            for stage, seconds in spans:
+                totals[stage] = totals.get(stage, 0.0) + seconds
+            st.table({
+                "Stage": list(totals),
+                "Milliseconds": [f"{seconds * 1000:.1f}" for seconds in totals.values()]
+            })
+            llm_hit_rate = metrics.gauge("cache_hit_rate", {"cache": "llm"}) or 0.0
+            parse_hit_rate = metrics.gauge("cache_hit_rate", {"cache": "parse"}) or 0.0
+            tokens_per_second = metrics.gauge("llm_tokens_per_second") or 0.0
+            st.caption(
+                f"LLM cache hit rate: {llm_hit_rate * 100:.0f}% | "
+                f"Parse cache hit rate: {parse_hit_rate * 100:.0f}% | "
+                f"Generation: {tokens_per_second:.1f} tokens/s | "
+                f"Peak RSS: {(peak_rss_bytes() or 0) / 2**20:.0f} MB"
+            )
+            
     def _display_results(self, scores: Dict[str, float], 
                         resume_data: Dict[str, Any], 
                         job_requirements: Dict[str, Any]):
@@ -86,11 +158,26 @@ class RecruiterApp:
         st.subheader("Extracted Information")
         
         with st.expander("Resume Analysis"):
-            st.json(resume_data)
+            st.json(dict(resume_data))
             
         with st.expander("Job Requirements Analysis"):
-            st.json(job_requirements)
+            st.json(dict(job_requirements))
+
+    def _display_startup_report(self):
+        """Show how long startup stages and model loading took"""
+        with st.sidebar.expander("Startup timings"):
+            report = startup_report()
+            if not self.llama_model.is_loaded:
+                st.caption("Model not loaded yet - it loads on the first analysis")
+            st.table({
+                "Stage": list(report),
+                "Seconds": [f"{seconds:.3f}" for seconds in report.values()]
+            })
 
 if __name__ == "__main__":
+    if Config.PRELOAD_MODEL:
+        preload(background=True)
+    if Config.METRICS_PORT:
+        metrics.start_server(Config.API_HOST, Config.METRICS_PORT)
     app = RecruiterApp()
     app.run() 
\ No newline at end of file
@@ -0,0 +1,3 @@
+"""
+Utilities package for AI Recruiter Agency
+"""
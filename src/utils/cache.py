@@ -0,0 +1,164 @@
+from typing import Any, Dict, Optional
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+def make_key(*parts: Any) -> str:
+    """Content-addressed cache key: SHA-256 of the JSON-encoded parts"""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class TieredCache:
+    """Two-tier cache for JSON-serializable values
+
+    An in-memory LRU tier sits in front of an optional SQLite tier that
+    survives restarts and is shared between processes. Entries expire after
+    ``ttl`` seconds; the SQLite tier is bounded by entry count and total
+    payload size, evicting least recently used entries first.
+    """
+
+    def __init__(self, path: Optional[str] = None, memory_entries: int = 256,
+                 max_entries: int = 10000, max_bytes: int = 100 * 1024 * 1024,
+                 ttl: Optional[float] = None):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        self._db = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            # WAL lets several processes (app sessions, ingestion workers) share the file
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+            self._db.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value or None"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created, value = entry
+                if not self._expired(created, now):
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return json.loads(value)
+                del self._memory[key]
+
+            if self._db is not None:
+                try:
+                    value = self._get_persistent(key, now)
+                except sqlite3.Error as e:
+                    # A cache failure must never fail the caller
+                    print(f"Error reading cache {self.path}: {e}")
+                    value = None
+                if value is not None:
+                    self._stats["disk_hits"] += 1
+                    return json.loads(value)
+
+            self._stats["misses"] += 1
+            return None
+
+    def set(self, key: str, value: Any):
+        """Store a value in both tiers"""
+        now = time.time()
+        payload = json.dumps(value)
+        with self._lock:
+            self._remember(key, now, payload)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO entries (key, value, size, created, accessed) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (key, payload, len(payload), now, now)
+                    )
+                    self._evict(now)
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    print(f"Error writing cache {self.path}: {e}")
+                    self._db.rollback()
+
+    def clear(self):
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM entries")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and hit rate"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        stats["hits"] = stats["memory_hits"] + stats["disk_hits"]
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def _get_persistent(self, key: str, now: float) -> Optional[str]:
+        """Look up the SQLite tier, promoting hits into the memory tier"""
+        row = self._db.execute(
+            "SELECT value, created FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, created = row
+        if self._expired(created, now):
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._db.commit()
+            return None
+        self._db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        self._db.commit()
+        self._remember(key, created, value)
+        return value
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl is not None and now - created > self.ttl
+
+    def _remember(self, key: str, created: float, payload: str):
+        """Insert into the memory tier, evicting the least recently used entry"""
+        self._memory[key] = (created, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _evict(self, now: float):
+        """Apply TTL, entry-count and size bounds to the SQLite tier"""
+        if self.ttl is not None:
+            self._db.execute("DELETE FROM entries WHERE created < ?", (now - self.ttl,))
+
+        count, total = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        # Walk from least recently used until both bounds hold
+        excess_count = count - self.max_entries
+        excess_bytes = total - self.max_bytes
+        doomed = []
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY accessed"):
+            if excess_count <= 0 and excess_bytes <= 0:
+                break
+            doomed.append((key,))
+            excess_count -= 1
+            excess_bytes -= size
+        self._db.executemany("DELETE FROM entries WHERE key = ?", doomed)
+        self._stats["evictions"] += len(doomed)
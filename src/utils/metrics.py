@@ -0,0 +1,246 @@
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import contextvars
+import cProfile
+import functools
+import os
+import pstats
+import sys
+import threading
+import time
+
+from config.config import Config
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Histogram buckets for stage durations, in seconds
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# Spans of the request currently being traced, if any
+_trace = contextvars.ContextVar("trace", default=None)
+# Profilers of the profile() block currently running, if any
+_profilers = contextvars.ContextVar("profilers", default=None)
+
+def _labels(labels: Optional[Dict[str, str]]) -> Labels:
+    return tuple(sorted((labels or {}).items()))
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+class Metrics:
+    """Process-wide stage timers, counters and gauges with Prometheus text output"""
+
+    def __init__(self, prefix: str = "recruiter"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._timers = {}
+        self._counters = {}
+        self._gauges = {}
+        self._gauge_callbacks = {}
+        self._server = None
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        """Time a block as one observation of a stage"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def timed(self, stage: str) -> Callable:
+        """Decorator form of span"""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(stage):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @contextmanager
+    def trace(self) -> Iterator[List[Tuple[str, float]]]:
+        """Collect the (stage, seconds) spans recorded in this context, e.g. one request"""
+        spans = []
+        token = _trace.set(spans)
+        try:
+            yield spans
+        finally:
+            _trace.reset(token)
+
+    def observe(self, stage: str, seconds: float):
+        """Record one stage duration"""
+        spans = _trace.get()
+        if spans is not None:
+            spans.append((stage, seconds))
+        with self._lock:
+            timer = self._timers.get(stage)
+            if timer is None:
+                timer = self._timers[stage] = {"count": 0, "sum": 0.0, "max": 0.0, "buckets": [0] * len(BUCKETS)}
+            timer["count"] += 1
+            timer["sum"] += seconds
+            timer["max"] = max(timer["max"], seconds)
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    timer["buckets"][i] += 1
+
+    def increment(self, name: str, value: float = 1, labels: Optional[Dict[str, str]] = None):
+        with self._lock:
+            key = (name, _labels(labels))
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        with self._lock:
+            self._gauges[(name, _labels(labels))] = value
+
+    def register_gauge(self, name: str, callback: Callable[[], Optional[float]],
+                       labels: Optional[Dict[str, str]] = None):
+        """Gauge evaluated on every snapshot; re-registering replaces the callback"""
+        with self._lock:
+            self._gauge_callbacks[(name, _labels(labels))] = callback
+
+    def gauge(self, name: str, labels: Optional[Dict[str, str]] = None) -> Optional[float]:
+        """Current value of one gauge"""
+        key = (name, _labels(labels))
+        with self._lock:
+            callback = self._gauge_callbacks.get(key)
+            value = self._gauges.get(key)
+        if callback is not None:
+            try:
+                return callback()
+            except Exception:
+                return None
+        return value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current values of every metric"""
+        with self._lock:
+            timers = {stage: dict(timer, buckets=list(timer["buckets"])) for stage, timer in self._timers.items()}
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            callbacks = dict(self._gauge_callbacks)
+        for key, callback in callbacks.items():
+            try:
+                gauges[key] = callback()
+            except Exception:
+                gauges[key] = None
+        gauges[("peak_rss_bytes", ())] = peak_rss_bytes()
+        return {"timers": timers, "counters": counters, "gauges": gauges}
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        name = f"{self.prefix}_stage_seconds"
+        lines = [f"# TYPE {name} histogram"]
+        for stage, timer in sorted(snapshot["timers"].items()):
+            for bound, count in zip(BUCKETS, timer["buckets"]):
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {timer["count"]}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {timer["sum"]}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {timer["count"]}')
+
+        for kind, values in (("counter", snapshot["counters"]), ("gauge", snapshot["gauges"])):
+            typed = set()
+            for (metric, labels), value in sorted(values.items()):
+                if value is None:
+                    continue
+                full_name = f"{self.prefix}_{metric}"
+                if full_name not in typed:
+                    lines.append(f"# TYPE {full_name} {kind}")
+                    typed.add(full_name)
+                lines.append(f"{full_name}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str):
+        """Write the Prometheus text to a file (e.g. for a node exporter textfile collector)"""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp_path, path)
+
+    def start_server(self, host: str = "0.0.0.0", port: int = 9100) -> ThreadingHTTPServer:
+        """Serve /metrics from a daemon thread; only the first call starts a server"""
+        with self._lock:
+            if self._server is not None:
+                return self._server
+            metrics = self
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split("?")[0] != "/metrics":
+                        self.send_error(404)
+                        return
+                    body = metrics.render_prometheus().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *args):
+                    pass
+
+            self._server = ThreadingHTTPServer((host, port), Handler)
+            threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True).start()
+            return self._server
+
+@contextmanager
+def profile(name: str, directory: Optional[str] = None) -> Iterator[None]:
+    """cProfile a block into <directory>/<name>-<timestamp>.prof when a directory is set
+
+    cProfile only sees the thread it runs on, so work the block hands to
+    worker threads must run through profiled() (with the context copied, as
+    for trace spans); finished tasks are merged into the same file. The
+    output loads in snakeviz or ``python -m pstats``. For sampling without
+    code changes, attach py-spy to the process instead (``py-spy top --pid``).
+    """
+    directory = directory or Config.PROFILE_DIR
+    if not directory:
+        yield
+        return
+    os.makedirs(directory, exist_ok=True)
+    profiler = cProfile.Profile()
+    profilers = []
+    token = _profilers.set(profilers)
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        _profilers.reset(token)
+        stats = pstats.Stats(profiler)
+        # Tasks still running (the caller stopped early) are left out
+        for task_profiler in list(profilers):
+            stats.add(task_profiler)
+        stats.dump_stats(os.path.join(directory, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.prof"))
+
+def profiled(fn: Callable, *args: Any) -> Any:
+    """Run fn on a worker thread, adding its profile to the enclosing profile() block, if any"""
+    profilers = _profilers.get()
+    if profilers is None:
+        return fn(*args)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return fn(*args)
+    finally:
+        profiler.disable()
+        profilers.append(profiler)
+
+metrics = Metrics()
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# Same path setup as the Streamlit app: src/ for packages, repo root for config
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root / "src"))
+sys.path.append(str(project_root))
@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+from indexing.ann import AnnRetriever
+from matching.matcher import ResumeMatcher
+
+SKILLS = ["Python", "Java", "JavaScript", "Go", "SQL", "Docker", "Kubernetes", "AWS", "React", "Django",
+          "Spark", "PostgreSQL", "TensorFlow", "scikit-learn", "Node.js", "Terraform"]
+ROLES = ["Backend engineer", "Frontend developer", "Data scientist", "DevOps engineer", "Data engineer",
+         "Machine learning engineer", "Full stack developer", "Site reliability engineer"]
+DEGREES = ["BSc Computer Science", "MSc Statistics", "BA Design", "BEng Software Engineering", "PhD Physics"]
+
+JOBS = [
+    {"required_skills": ["Python", "SQL"], "nice_to_have_skills": ["Spark"],
+     "required_experience": {"description": "Data engineer building pipelines"},
+     "required_education": {"description": "Computer Science degree"}},
+    {"required_skills": ["JavaScript", "React"], "nice_to_have_skills": ["Node.js"],
+     "required_experience": {"description": "Frontend developer"},
+     "required_education": {"description": "Design or Software Engineering degree"}},
+    {"required_skills": ["Kubernetes", "Terraform", "AWS"], "nice_to_have_skills": ["Go"],
+     "required_experience": {"description": "Site reliability engineer running infrastructure"},
+     "required_education": {"description": "Engineering degree"}}
+]
+
+def _pool(size, seed=0):
+    rng = random.Random(seed)
+    resumes = []
+    for _ in range(size):
+        skills = rng.sample(SKILLS, rng.randint(2, 6))
+        role = rng.choice(ROLES)
+        resumes.append({
+            "skills": skills,
+            "experience": [{"text": f"{role}, {rng.randint(1, 12)} years with {', '.join(skills[:2])}"}],
+            "education": [{"text": rng.choice(DEGREES)}],
+            "raw_text": f"{role} {' '.join(skills)}"
+        })
+    return resumes
+
+@pytest.fixture(scope="module")
+def pool():
+    resumes = _pool(600)
+    retriever = AnnRetriever(ResumeMatcher(), n_lists=8, shortlist=50, min_candidates=0).build(resumes)
+    return resumes, retriever
+
+def _exact(retriever, job, top_k):
+    return retriever.matcher.rank_candidates(dict(job), retriever.resumes, top_k=top_k)
+
+def _recall(found, expected):
+    return len({c["index"] for c in found} & {c["index"] for c in expected}) / len(expected)
+
+def test_exhaustive_search_matches_exact_ranking(pool):
+    _, retriever = pool
+    for job in JOBS:
+        found = retriever.query(dict(job), top_k=10, nprobe=8, shortlist=len(retriever))
+        expected = _exact(retriever, job, 10)
+        assert [round(c["overall_match"], 6) for c in found] == [round(c["overall_match"], 6) for c in expected]
+
+def test_recall_against_exact_ranking(pool):
+    _, retriever = pool
+    recalls = []
+    for job in JOBS:
+        found = retriever.query(dict(job), top_k=10)
+        expected = _exact(retriever, job, 10)
+        # Shortlisted candidates are re-scored exactly
+        exact_scores = {c["index"]: c["overall_match"] for c in _exact(retriever, job, len(retriever))}
+        for candidate in found:
+            assert candidate["overall_match"] == pytest.approx(exact_scores[candidate["index"]], abs=1e-6)
+        recalls.append(_recall(found, expected))
+    # Ties in score make the exact top 10 ambiguous, so recall is averaged over the jobs
+    assert sum(recalls) / len(recalls) >= 0.7
+    # Probing every cluster leaves only the shortlist approximate
+    full = [_recall(retriever.query(dict(job), top_k=10, nprobe=8), _exact(retriever, job, 10)) for job in JOBS]
+    assert sum(full) / len(full) >= 0.9
+
+def test_small_pools_are_ranked_exactly():
+    resumes = _pool(40, seed=1)
+    retriever = AnnRetriever(ResumeMatcher(), n_lists=4, min_candidates=100).build(resumes)
+    for job in JOBS:
+        found = retriever.query(dict(job), top_k=5)
+        expected = _exact(retriever, job, 5)
+        assert [c["index"] for c in found] == [c["index"] for c in expected]
+    assert AnnRetriever(ResumeMatcher()).build([]).query(dict(JOBS[0])) == []
+
+def test_save_and_load(pool, tmp_path):
+    resumes, retriever = pool
+    path = str(tmp_path / "ann.joblib")
+    retriever.save(path)
+    loaded = AnnRetriever.load(resumes, path, retriever.matcher)
+    for job in JOBS:
+        assert loaded.query(dict(job), top_k=10) == retriever.query(dict(job), top_k=10)
+    with pytest.raises(ValueError):
+        AnnRetriever.load(resumes[:10], path, retriever.matcher)
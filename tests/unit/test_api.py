@@ -0,0 +1,112 @@
+from concurrent.futures import Future
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from api.server import Limiter, Overloaded, ScoringService, validate_job_requirements, validate_resume
+
+def _resolved(value):
+    future = Future()
+    future.set_result(value)
+    return future
+
+def _failing(exception):
+    future = Future()
+    future.set_exception(exception)
+    return future
+
+def test_limiter_runs_work_and_frees_the_slot():
+    async def scenario():
+        limiter = Limiter(max_concurrent=1, max_queue=0)
+        assert await limiter.run(lambda: _resolved(1), timeout=1) == 1
+        # The slot is free again for the next request
+        assert await limiter.run(lambda: _resolved(2), timeout=1) == 2
+
+    asyncio.run(scenario())
+
+def test_limiter_rejects_when_the_queue_is_full():
+    async def scenario():
+        limiter = Limiter(max_concurrent=1, max_queue=1)
+        pending = Future()
+        running = asyncio.ensure_future(limiter.run(lambda: pending, timeout=5))
+        await asyncio.sleep(0)
+        waiting = asyncio.ensure_future(limiter.run(lambda: _resolved("queued"), timeout=5))
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded):
+            await limiter.run(lambda: _resolved("rejected"), timeout=5)
+        pending.set_result("first")
+        assert await running == "first"
+        assert await waiting == "queued"
+
+    asyncio.run(scenario())
+
+def test_limiter_timeout_covers_the_queue_wait():
+    async def scenario():
+        limiter = Limiter(max_concurrent=1, max_queue=4)
+        pending = Future()
+        started = []
+        running = asyncio.ensure_future(limiter.run(lambda: pending, timeout=5))
+        await asyncio.sleep(0)
+        with pytest.raises(asyncio.TimeoutError):
+            await limiter.run(lambda: started.append(1) or _resolved(None), timeout=0.05)
+        # The request timed out waiting for a slot, so its work never started
+        assert started == []
+        pending.set_result(None)
+        await running
+
+    asyncio.run(scenario())
+
+def test_timed_out_work_keeps_its_slot_until_done():
+    async def scenario():
+        limiter = Limiter(max_concurrent=1, max_queue=0)
+        pending = Future()
+        with pytest.raises(asyncio.TimeoutError):
+            await limiter.run(lambda: pending, timeout=0.05)
+        # Abandoned work still counts against the limit
+        with pytest.raises(Overloaded):
+            await limiter.run(lambda: _resolved(None), timeout=1)
+        pending.set_result(None)
+        await asyncio.sleep(0.01)
+        assert await limiter.run(lambda: _resolved("next"), timeout=1) == "next"
+
+    asyncio.run(scenario())
+
+def test_limiter_errors_map_to_http_statuses():
+    # Only the limiter and timeout are needed, not the model or the worker pool
+    service = ScoringService.__new__(ScoringService)
+    service.timeout = 0.05
+
+    async def scenario():
+        limiter = Limiter(max_concurrent=1, max_queue=0)
+        pending = Future()
+        with pytest.raises(web.HTTPGatewayTimeout):
+            await service._limited(limiter, lambda: pending)
+        with pytest.raises(web.HTTPTooManyRequests) as rejected:
+            await service._limited(limiter, lambda: _resolved(None))
+        assert rejected.value.headers["Retry-After"]
+        pending.set_result(None)
+        await asyncio.sleep(0.01)
+        with pytest.raises(web.HTTPBadRequest):
+            await service._limited(limiter, lambda: _failing(ValueError("Job description is empty")))
+
+    asyncio.run(scenario())
+
+def test_validate_job_requirements():
+    job = {"required_skills": ["Python"], "required_experience": {"description": "5 years"}}
+    assert validate_job_requirements(job) is job
+    for bad in ([], {"required_skills": "Python"}, {"required_skills": ["Python", 3]},
+                {"required_education": "BSc"}, {"required_experience": {"description": 5}}):
+        with pytest.raises(ValueError):
+            validate_job_requirements(bad)
+
+def test_validate_resume():
+    resume = {"skills": ["Python"], "experience": ["Acme", {"text": "Initech"}], "raw_text": "Python"}
+    assert validate_resume(resume) is resume
+    assert validate_resume({}) == {}
+    with pytest.raises(ValueError, match=r"resumes\[2\]\.skills"):
+        validate_resume({"skills": "Python"}, "resumes[2]")
+    for bad in ("resume text", {"canonical_skills": [None]}, {"education": [{"text": 1}]},
+                {"experience": "Acme"}, {"raw_text": ["Python"]}):
+        with pytest.raises(ValueError):
+            validate_resume(bad)
@@ -0,0 +1,82 @@
+import threading
+
+import pytest
+
+from models.batching import MicroBatcher
+
+class Recorder:
+    """process_batch stand-in that records the batches it is given"""
+
+    def __init__(self, fail: bool = False):
+        self.batches = []
+        self.fail = fail
+        self.lock = threading.Lock()
+
+    def __call__(self, items):
+        with self.lock:
+            self.batches.append(list(items))
+        if self.fail:
+            raise RuntimeError("generation failed")
+        return [item * 10 for item in items]
+
+def test_requests_in_one_window_share_a_batch():
+    recorder = Recorder()
+    batcher = MicroBatcher(recorder, max_batch_size=8, max_wait=0.2)
+    futures = [batcher.submit(i) for i in range(5)]
+    assert [future.result(timeout=5) for future in futures] == [0, 10, 20, 30, 40]
+    assert recorder.batches == [[0, 1, 2, 3, 4]]
+    batcher.close()
+
+def test_batches_are_capped_at_max_batch_size():
+    recorder = Recorder()
+    batcher = MicroBatcher(recorder, max_batch_size=2, max_wait=0.5)
+    futures = [batcher.submit(i) for i in range(5)]
+    assert [future.result(timeout=5) for future in futures] == [0, 10, 20, 30, 40]
+    assert [len(batch) for batch in recorder.batches] == [2, 2, 1]
+    batcher.close()
+
+def test_submissions_from_many_threads():
+    recorder = Recorder()
+    batcher = MicroBatcher(recorder, max_batch_size=4, max_wait=0.05)
+    results = {}
+
+    def worker(i):
+        results[i] = batcher.submit(i).result(timeout=5)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == {i: i * 10 for i in range(16)}
+    assert all(len(batch) <= 4 for batch in recorder.batches)
+    assert sorted(item for batch in recorder.batches for item in batch) == list(range(16))
+    batcher.close()
+
+def test_a_failed_batch_fails_every_caller():
+    batcher = MicroBatcher(Recorder(fail=True), max_batch_size=8, max_wait=0.1)
+    futures = [batcher.submit(i) for i in range(3)]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="generation failed"):
+            future.result(timeout=5)
+    batcher.close()
+
+def test_cancelled_requests_are_skipped():
+    recorder = Recorder()
+    batcher = MicroBatcher(recorder, max_batch_size=8, max_wait=0.3)
+    cancelled = batcher.submit(1)
+    kept = batcher.submit(2)
+    assert cancelled.cancel()
+    assert kept.result(timeout=5) == 20
+    assert recorder.batches == [[2]]
+    batcher.close()
+
+def test_close_drains_the_queue_then_rejects():
+    recorder = Recorder()
+    batcher = MicroBatcher(recorder, max_batch_size=8, max_wait=5)
+    future = batcher.submit(7)
+    # close() must not wait out the batching window, and the queued request still runs
+    batcher.close()
+    assert future.result(timeout=0) == 70
+    with pytest.raises(RuntimeError):
+        batcher.submit(8)
@@ -0,0 +1,81 @@
+import sqlite3
+
+from utils import cache as cache_module
+from utils.cache import TieredCache, make_key
+
+class Clock:
+    """Stands in for the time module so expiry can be tested without sleeping"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self) -> float:
+        return self.now
+
+def test_make_key_is_stable_and_order_sensitive():
+    assert make_key("resume", 1, {"b": 2, "a": 1}) == make_key("resume", 1, {"a": 1, "b": 2})
+    assert make_key("a", "b") != make_key("b", "a")
+
+def test_memory_tier_lru_eviction():
+    cache = TieredCache(None, memory_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+def test_ttl_expires_both_tiers(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    cache = TieredCache(str(tmp_path / "cache.sqlite3"), ttl=60)
+    cache.set("key", {"skills": ["Python"]})
+    clock.now += 59
+    assert cache.get("key") == {"skills": ["Python"]}
+    clock.now += 2
+    assert cache.get("key") is None
+    # The expired row is gone from SQLite too, not just from memory
+    reopened = TieredCache(str(tmp_path / "cache.sqlite3"), memory_entries=0, ttl=60)
+    assert reopened.get("key") is None
+
+def test_disk_tier_bounded_by_entries_and_bytes(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    path = str(tmp_path / "cache.sqlite3")
+    cache = TieredCache(path, memory_entries=0, max_entries=3)
+    for i in range(5):
+        clock.now += 1
+        cache.set(f"k{i}", i)
+    # Least recently used entries go first
+    assert [cache.get(f"k{i}") for i in range(5)] == [None, None, 2, 3, 4]
+
+    cache = TieredCache(str(tmp_path / "sized.sqlite3"), memory_entries=0, max_bytes=250)
+    for i in range(5):
+        clock.now += 1
+        cache.set(f"k{i}", "x" * 100)
+    stored = [i for i in range(5) if cache.get(f"k{i}") is not None]
+    assert stored == [3, 4]
+
+def test_reopen_reads_the_wal_database(tmp_path):
+    path = str(tmp_path / "nested" / "cache.sqlite3")
+    writer = TieredCache(path)
+    writer.set("analysis", {"required_skills": ["Python", "SQL"]})
+
+    # A second instance (another process in production) sees the entry from disk
+    reader = TieredCache(path, memory_entries=4)
+    assert reader.get("analysis") == {"required_skills": ["Python", "SQL"]}
+    assert reader.stats()["disk_hits"] == 1
+    # ... and promotes it to its memory tier
+    assert reader.get("analysis") == {"required_skills": ["Python", "SQL"]}
+    assert reader.stats()["memory_hits"] == 1
+    assert sqlite3.connect(path).execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+def test_clear_and_hit_rate(tmp_path):
+    cache = TieredCache(str(tmp_path / "cache.sqlite3"))
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    cache.clear()
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["hit_rate"] == 0.5
@@ -0,0 +1,103 @@
+import json
+import os
+
+import pytest
+
+from indexing.candidate_index import MANIFEST_FILE, CandidateIndex
+from matching.matcher import ResumeMatcher
+
+RESUMES = {
+    "ana": {"skills": ["Python", "Django"], "experience": ["Backend engineer, 5 years of Python services"],
+            "education": ["BSc Computer Science"], "raw_text": "Python Django PostgreSQL"},
+    "ben": {"skills": ["Java", "Spring"], "experience": ["Java developer, 3 years"],
+            "education": ["BSc Software Engineering"], "raw_text": "Java Spring Kubernetes"},
+    "cai": {"skills": ["JS", "React"], "experience": ["Frontend developer, 4 years"],
+            "education": ["BA Design"], "raw_text": "JavaScript React CSS"},
+    "dee": {"skills": ["sklearn", "Python"], "experience": ["Data scientist, 6 years of machine learning"],
+            "education": ["MSc Statistics"], "raw_text": "Python scikit-learn pandas"}
+}
+
+JOB = {
+    "required_skills": ["Python", "PostgreSQL"],
+    "nice_to_have_skills": ["Django"],
+    "required_experience": {"description": "5 years of Python backend services"},
+    "required_education": {"description": "Computer Science degree"}
+}
+
+def _ranking(candidates):
+    return [(candidate["candidate_id"], round(candidate["overall_match"], 6)) for candidate in candidates]
+
+def _expected(ids):
+    ranked = ResumeMatcher().rank_candidates(dict(JOB), [RESUMES[i] for i in ids], top_k=len(ids))
+    return [(ids[candidate["index"]], round(candidate["overall_match"], 6)) for candidate in ranked]
+
+def _build(path, ids=tuple(RESUMES)):
+    index = CandidateIndex(str(path))
+    for candidate_id in ids:
+        index.add(candidate_id, RESUMES[candidate_id])
+    return index
+
+def test_query_scores_like_rank_candidates(tmp_path):
+    index = _build(tmp_path / "index")
+    ids = list(RESUMES)
+    # Buffered candidates, then the same candidates read from a segment
+    assert _ranking(index.query(dict(JOB), top_k=4)) == _expected(ids)
+    index.flush()
+    assert _ranking(index.query(dict(JOB), top_k=4)) == _expected(ids)
+
+def test_remove_and_replace(tmp_path):
+    index = _build(tmp_path / "index")
+    index.flush()
+    assert index.remove("ana")
+    assert not index.remove("ana")
+    assert "ana" not in index and len(index) == 3
+    assert "ana" not in [candidate["candidate_id"] for candidate in index.query(dict(JOB), top_k=4)]
+
+    # Re-adding replaces the stored candidate
+    index.add("ben", RESUMES["dee"])
+    assert index.get("ben")["skills"] == RESUMES["dee"]["skills"]
+    assert len(index) == 3
+
+def test_reopen_keeps_candidates_and_tombstones(tmp_path):
+    path = tmp_path / "index"
+    with _build(path) as index:
+        index.flush()
+        index.remove("cai")
+        index.add("eve", RESUMES["ana"])
+
+    reopened = CandidateIndex(str(path))
+    assert len(reopened) == 4
+    assert "cai" not in reopened and "eve" in reopened
+    assert reopened.get("dee")["education"] == RESUMES["dee"]["education"]
+    ranking = _ranking(reopened.query(dict(JOB), top_k=4))
+    assert "cai" not in [candidate_id for candidate_id, _ in ranking]
+    assert ranking[0][1] == _expected(["ana", "ben", "dee"])[0][1]
+
+def test_compact_drops_deleted_rows(tmp_path):
+    index = _build(tmp_path / "index")
+    index.flush()
+    index.add("eve", RESUMES["ana"])
+    index.flush()
+    index.remove("ben")
+    index.compact()
+    assert len(os.listdir(tmp_path / "index")) == 2  # manifest and one segment
+    assert sorted(candidate["candidate_id"] for candidate in index.query(dict(JOB), top_k=10)) == [
+        "ana", "cai", "dee", "eve"
+    ]
+
+def test_canonical_skills_keep_text_only_skills(tmp_path):
+    index = _build(tmp_path / "index", ["ana"])
+    index.flush()
+    # raw_text is not stored; the skills found in it are
+    assert "raw_text" not in index.get("ana")
+    assert "PostgreSQL" in index.get("ana")["canonical_skills"]
+
+def test_fingerprint_mismatch_is_rejected(tmp_path):
+    path = tmp_path / "index"
+    _build(path).flush()
+    manifest_path = path / MANIFEST_FILE
+    manifest = json.loads(manifest_path.read_text())
+    manifest["fingerprints"]["vectorizer"] = "another vectorizer"
+    manifest_path.write_text(json.dumps(manifest))
+    with pytest.raises(ValueError):
+        CandidateIndex(str(path))
@@ -0,0 +1,32 @@
+from models.preprocess import clean_text
+
+RESUME = """Jane Doe
+jane.doe@example.com
+Phone: (555) 123-4567
++44 20 7946 0958
+www.example.com/jane
+
+Experience
+Senior Engineer at Globex
+2018 - 2021
+Engineer at Initech
+2015-2018
+
+Education
+BSc Computer Science, National University
+2010 - 2014
+2009
+Page 2 of 3
+"""
+
+def test_clean_text_keeps_date_ranges():
+    cleaned = clean_text(RESUME).splitlines()
+    for line in ("2018 - 2021", "2015-2018", "2010 - 2014", "2009"):
+        assert line in cleaned
+
+def test_clean_text_drops_contact_and_page_lines():
+    cleaned = clean_text(RESUME)
+    for line in ("jane.doe@example.com", "Phone: (555) 123-4567", "+44 20 7946 0958",
+                 "www.example.com/jane", "Page 2 of 3"):
+        assert line not in cleaned
+    assert "Senior Engineer at Globex" in cleaned
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from storage.columnar import ColumnarStore, build_store
+from storage.records import JobRequirements, ParsedResume, ResumeAnalysis
+
+RESUME = {
+    "summary": "Backend engineer",
+    "skills": ["Python", "SQL"],
+    "canonical_skills": ["Python", "SQL", "Docker"],
+    "experience": [{"text": "Acme Corp, 2019-2024"}, {"text": "Initech — 2016"}],
+    "education": [{"text": "BSc Computer Science"}],
+    "certifications": [],
+    "projects": ["ETL pipeline"],
+    "raw_text": "Backend engineer, Python, SQL"
+}
+
+RESUMES = [
+    RESUME,
+    dict(RESUME, summary="", skills=["Go", "Python"], experience=[], raw_text="Go Python"),
+    {"skills": ["Java"]}
+]
+
+def test_record_reads_like_the_dict():
+    record = ParsedResume.from_dict(RESUME)
+    assert record == RESUME
+    assert dict(record) == RESUME
+    assert record.to_dict() == RESUME
+    assert json.loads(json.dumps(record.to_dict())) == RESUME
+    assert record["skills"] == ["Python", "SQL"] and record.get("missing") is None
+    # The stored form is compact; the dict view is built on access
+    assert record.skills == ("Python", "SQL")
+    assert record.experience == ("Acme Corp, 2019-2024", "Initech — 2016")
+    with pytest.raises(KeyError):
+        record["missing"]
+    with pytest.raises(AttributeError):
+        record.extra = 1
+
+def test_from_dict_fills_missing_and_drops_unknown_fields():
+    record = ParsedResume.from_dict({"skills": ["Java"], "unknown": 1})
+    assert record["summary"] == "" and record["experience"] == [] and "unknown" not in record
+    assert ParsedResume.from_dict(record) is record
+    assert ParsedResume.from_dict(None) == ParsedResume.from_dict({})
+
+def test_analysis_records():
+    job = JobRequirements.from_dict({
+        "required_skills": ["Python"],
+        "required_experience": {"description": "5 years"},
+        "required_education": "BSc",
+        "nice_to_have_skills": []
+    })
+    assert job["required_experience"] == {"description": "5 years"}
+    assert job["required_education"] == {"description": "BSc"}
+    analysis = ResumeAnalysis(skills=["Python"], experience=["5 years"])
+    assert analysis == {"skills": ["Python"], "experience": ["5 years"], "education": [],
+                        "certifications": [], "projects": []}
+
+def test_store_rows_match_records():
+    store = build_store(RESUMES, ["ana", "ben", "cai"], keep_raw_text=True)
+    assert len(store) == 3 and store.candidate_id(1) == "ben"
+    assert [record.to_dict() for record in store] == [ParsedResume.from_dict(r).to_dict() for r in RESUMES]
+    assert store[-1] == store[2]
+    with pytest.raises(IndexError):
+        store[3]
+
+def test_raw_text_is_dropped_by_default():
+    store = build_store(RESUMES)
+    assert store[0]["raw_text"] == ""
+    assert store[0]["skills"] == RESUME["skills"]
+    assert store.nbytes() < build_store(RESUMES, keep_raw_text=True).nbytes()
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_and_load_round_trip(tmp_path, mmap):
+    store = build_store(RESUMES, ["ana", "ben", "cai"], keep_raw_text=True)
+    store.save(str(tmp_path / "store"))
+    loaded = ColumnarStore.load(str(tmp_path / "store"), mmap=mmap)
+    assert loaded.record_type is ParsedResume
+    assert len(loaded) == 3
+    assert [loaded.candidate_id(row) for row in range(3)] == ["ana", "ben", "cai"]
+    assert [record.to_dict() for record in loaded] == [record.to_dict() for record in store]
+    # Loaded stores are read-only, but can be saved again
+    with pytest.raises(ValueError):
+        loaded.add("dee", RESUME)
+    loaded.save(str(tmp_path / "copy"))
+    assert ColumnarStore.load(str(tmp_path / "copy"))[0] == store[0]
+
+def test_load_rejects_other_format_versions(tmp_path):
+    path = tmp_path / "store"
+    build_store(RESUMES).save(str(path))
+    meta = json.loads((path / "meta.json").read_text())
+    meta["version"] += 1
+    (path / "meta.json").write_text(json.dumps(meta))
+    with pytest.raises(ValueError):
+        ColumnarStore.load(str(path))
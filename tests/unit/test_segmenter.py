@@ -0,0 +1,115 @@
+from parsers.segmenter import (
+    find_section, job_segmenter, resume_segmenter, sections_complete, split_items, split_lines
+)
+
+RESUME = """Jane Doe
+jane@example.com
+
+## Professional Summary
+Backend engineer.
+
+Second paragraph of the summary.
+
+1. **Skills:** Python, SQL; Docker
+Languages: Java, Go
+
+WORK EXPERIENCE
+- Acme Corp, 2019-2024
+- Initech, 2016-2019
+
+Education & Training:
+BSc Computer Science
+
+Skills
+Ignored repeat
+"""
+
+JOB = """Senior Data Engineer
+
+About the role
+Build pipelines.
+
+Key Responsibilities:
+* Own the warehouse
+* Mentor engineers
+
+What you bring:
+- 5+ years of Python
+- SQL
+
+Nice-to-have: Spark, Airflow
+
+Education
+BSc or equivalent
+
+Benefits
+Free lunch
+"""
+
+def test_resume_sections():
+    sections = resume_segmenter.segment(RESUME)
+    assert list(sections) == ["summary", "skills", "experience", "education"]
+    # Multi-paragraph sections are kept whole
+    assert sections["summary"] == "Backend engineer.\n\nSecond paragraph of the summary."
+    # "Languages:" inside Skills is a label, not a heading; the first "Skills" wins
+    assert sections["skills"] == "Python, SQL; Docker\nLanguages: Java, Go"
+    assert sections["experience"] == "- Acme Corp, 2019-2024\n- Initech, 2016-2019"
+    assert sections["education"] == "BSc Computer Science"
+
+def test_standalone_heading_on_its_own_line():
+    sections = resume_segmenter.segment("Skills: Python\n\nLanguages\nEnglish, French\n")
+    assert sections == {"skills": "Python", "languages": "English, French"}
+
+def test_spans_cover_each_body():
+    spans = resume_segmenter.spans(RESUME)
+    assert [key for key, _, _ in spans] == ["summary", "skills", "experience", "education", "skills"]
+    for (_, _, end), (_, next_start, _) in zip(spans, spans[1:]):
+        assert end < next_start
+    assert spans[-1][2] == len(RESUME)
+
+def test_long_lines_are_not_headings():
+    text = "I have professional experience with many things: Python, SQL\nSkills: Go\n"
+    assert resume_segmenter.segment(text) == {"skills": "Go"}
+
+def test_job_sections():
+    sections = job_segmenter.segment(JOB)
+    assert list(sections) == [
+        "overview", "responsibilities", "requirements", "nice_to_have", "education", "benefits"
+    ]
+    assert split_lines(sections["responsibilities"]) == ["Own the warehouse", "Mentor engineers"]
+    assert split_items(sections["nice_to_have"]) == ["Spark", "Airflow"]
+    assert sections["education"] == "BSc or equivalent"
+    # "Education" only counts on its own line, not as a label inside the requirements
+    assert "education" not in job_segmenter.segment("Requirements:\nEducation: BSc\n")
+
+def test_split_lines_and_items():
+    assert split_lines("- one\n\n  2) two\n• three, four\n") == ["one", "two", "three, four"]
+    assert split_items("- Python, SQL\n* Docker; Kubernetes | Go") == ["Python", "SQL", "Docker", "Kubernetes", "Go"]
+    # Hyphens inside an item are not bullets
+    assert split_items("scikit-learn, - pandas") == ["scikit-learn", "pandas"]
+
+ANALYSIS = """**Key Skills:** Python, SQL
+
+Experience Level:
+5 years
+
+Education:
+
+BSc Computer Science
+MSc Data Science
+
+Trailing: text"""
+
+def test_find_section():
+    # Sections end at the blank line the analysis prompts ask for
+    assert find_section(ANALYSIS, "Key Skills") == "Python, SQL"
+    assert find_section(ANALYSIS, "Experience Level") == "5 years"
+    # A blank line right after a bare heading does not end the section
+    assert find_section(ANALYSIS, "Education") == "BSc Computer Science\nMSc Data Science"
+    assert find_section(ANALYSIS, "Trailing") == "text"
+    assert find_section(ANALYSIS, "Certifications") == ""
+
+def test_sections_complete():
+    assert not sections_complete("Skills: Python\n", ["Skills", "Experience"])
+    assert not sections_complete("Skills: Python\nExperience:\n5 years", ["Skills", "Experience"])
+    assert sections_complete("Skills: Python\nExperience:\n5 years\n\n", ["Skills", "Experience"])
@@ -0,0 +1,57 @@
+import numpy as np
+
+from matching.skills import SkillTaxonomy, get_taxonomy, normalize_skill, skill_match
+
+def _names(taxonomy, ids):
+    return [taxonomy.names[skill_id] for skill_id in ids if skill_id < taxonomy.canonical_count]
+
+def test_normalize_skill():
+    assert normalize_skill("  Machine   Learning. ") == "machine learning"
+    assert normalize_skill("• Python,") == "python"
+    assert normalize_skill("C++") == "c++"
+
+def test_aliases_map_to_canonical_ids():
+    taxonomy = get_taxonomy()
+    assert taxonomy.skill_id("JS") == taxonomy.skill_id("javascript") == taxonomy.names.index("JavaScript")
+    assert taxonomy.skill_id("sklearn") == taxonomy.names.index("scikit-learn")
+    assert _names(taxonomy, taxonomy.ids(["Python and Django", "postgres"])) == ["Python", "PostgreSQL", "Django"]
+
+def test_extract_matches_whole_words_only():
+    taxonomy = get_taxonomy()
+    assert taxonomy.canonical_names("Built JavaScript apps") == ["JavaScript"]
+    assert taxonomy.canonical_names("Wrote C++ and C# services") == ["C++", "C#"]
+    # Ordinary words are not scanned for in running text
+    assert taxonomy.canonical_names("Go to the shell") == []
+    # Nested aliases count too: "node.js" also mentions "js"
+    assert set(taxonomy.canonical_names("Services in node.js")) == {"Node.js", "JavaScript"}
+
+def test_unknown_skills_are_hashed_into_buckets():
+    taxonomy = get_taxonomy()
+    first = taxonomy.skill_id("Quantum Basket Weaving")
+    assert first == taxonomy.skill_id("quantum  basket weaving.")
+    assert taxonomy.canonical_count <= first < len(taxonomy)
+    assert len(taxonomy) == taxonomy.canonical_count + SkillTaxonomy.UNKNOWN_SKILL_BUCKETS
+    assert taxonomy.skill_id("Quantum Basket Weaving", unknown=False) is None
+    # The same skill gets the same ID from another taxonomy instance (another process)
+    assert SkillTaxonomy().skill_id("Quantum Basket Weaving") == first
+    assert taxonomy.ids(["Quantum Basket Weaving"], unknown=False).size == 0
+
+def test_fingerprint_tracks_the_id_assignment():
+    assert SkillTaxonomy().fingerprint() == SkillTaxonomy().fingerprint()
+    assert SkillTaxonomy({"Python": []}).fingerprint() != SkillTaxonomy({"Python": ["py"]}).fingerprint()
+
+def test_resume_ids_fall_back_to_raw_text():
+    taxonomy = get_taxonomy()
+    resume = {"skills": ["Python"], "raw_text": "Python and Kubernetes"}
+    scanned = taxonomy.resume_ids(resume)
+    assert _names(taxonomy, scanned) == ["Python", "Kubernetes"]
+    # An empty canonical_skills list is not taken as "no skills in the text"
+    assert np.array_equal(taxonomy.resume_ids(dict(resume, canonical_skills=[])), scanned)
+    assert np.array_equal(taxonomy.resume_ids(dict(resume, canonical_skills=["Kubernetes"])), scanned)
+
+def test_skill_match_weights_required_and_nice_to_have():
+    taxonomy = get_taxonomy()
+    resume = taxonomy.ids(["Python", "Docker"])
+    assert skill_match(resume, taxonomy.ids(["Python"]), taxonomy.ids([])) == 1.0
+    assert skill_match(resume, taxonomy.ids([]), taxonomy.ids([])) == 1.0
+    assert 0.0 < skill_match(resume, taxonomy.ids(["Python", "Java"]), taxonomy.ids(["Docker"])) < 1.0